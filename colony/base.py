@@ -1,6 +1,7 @@
 from urllib.parse import urljoin
 
 from colony.client import ColonyClient
+from colony.services.singleflight import SingleFlight
 
 # TODO(ddovbii): Make classes abstract
 
@@ -9,9 +10,13 @@ from colony.client import ColonyClient
 
 class ResourceManager(object):
     resource_obj = None
+    # identical GETs in flight at the same time in any thread are sent once
+    singleflight = SingleFlight()
 
-    def __init__(self, client: ColonyClient):
+    def __init__(self, client: ColonyClient, response_ttl: float = 0):
+        """With response_ttl GETs of the manager also share responses received within that many seconds"""
         self.client = client
+        self.response_ttl = response_ttl
         self.endpoint = urljoin(self.client.base_url, f"spaces/{self.client.space}/")
 
     def _get_full_url(self, path: str):
@@ -24,13 +29,13 @@ class ResourceManager(object):
 
         url = urljoin(self.endpoint, path)
 
-        result = self.client.request(url, "GET", headers)
-        return result.json()
+        return self._get_json(url, headers=headers)
 
     def _delete(self, path: str):
         url = urljoin(self.endpoint, path)
 
         result = self.client.request(url, "DELETE")
+        self.singleflight.forget()
         return result
 
     def _list(self, path: str, filter_params: dict = None):
@@ -40,9 +45,7 @@ class ResourceManager(object):
         # if filter is not None:
         params = filter_params.copy() if filter_params else None
 
-        result = self.client.request(url, "GET", params=params)
-
-        return result.json()
+        return self._get_json(url, params=params)
 
     def _post(self, path: str, params: dict = None, headers: dict = None):
         if headers is None:
@@ -53,8 +56,21 @@ class ResourceManager(object):
 
         url = urljoin(self.endpoint, path)
         result = self.client.request(url, "POST", params, headers)
+        self.singleflight.forget()
         return result.json()
 
+    def _get_json(self, url: str, params: dict = None, headers: dict = None):
+        # requests of different users must never share a response
+        key = (
+            url,
+            tuple(sorted((params or {}).items())),
+            tuple(sorted((headers or {}).items())),
+            self.client.token,
+        )
+        return self.singleflight.do(
+            key, lambda: self.client.request(url, "GET", params=params, headers=headers).json(), self.response_ttl
+        )
+
 
 class Resource(object):
     def __init__(self, manager: ResourceManager):
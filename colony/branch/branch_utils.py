@@ -7,14 +7,16 @@ from colony.commands.base import BaseCommand
 from colony.constants import DONE_STATUS, UNCOMMITTED_BRANCH_NAME
 from colony.exceptions import BadBlueprintRepo
 from colony.sandboxes import Sandbox
+from colony.services.timings import timed
 from colony.utils import BlueprintRepo
 
 logging.getLogger("git").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
 
+@timed("examine repo state")
 def debug_output_about_repo_examination(repo: BlueprintRepo, blueprint_name: str):
-    if not repo.repo_has_blueprint(blueprint_name):
+    if blueprint_name and not repo.repo_has_blueprint(blueprint_name):
         logger.debug(f"Current repo does not contain a definition for the blueprint '{blueprint_name}'.")
     if repo.is_dirty():
         logger.debug("You have uncommitted changes")
@@ -71,7 +73,7 @@ def get_and_check_folder_based_repo(blueprint_name: str) -> BlueprintRepo:
     # Try to detect branch from current git-enabled folder
     logger.debug("Branch hasn't been specified. Trying to identify branch from current working directory")
     try:
-        repo = BlueprintRepo(os.getcwd())
+        repo = BlueprintRepo.open(os.getcwd())
         check_repo_for_errors(repo)
         debug_output_about_repo_examination(repo, blueprint_name)
     except Exception as e:
@@ -80,6 +82,7 @@ def get_and_check_folder_based_repo(blueprint_name: str) -> BlueprintRepo:
     return repo
 
 
+@timed("create temp branch")
 def switch_to_temp_branch(repo: BlueprintRepo, defined_branch_in_file: str):
     stashed_flag = False
     created_remote_flag = False
@@ -128,17 +131,20 @@ def remove_gitkeep_in_branch() -> None:
         os.remove(file)
 
 
+@timed("git push")
 def create_remote_branch(repo: BlueprintRepo, uncommitted_branch_name: str) -> None:
     logger.debug(f"[GIT] Push (origin) {uncommitted_branch_name}")
     repo.git.push("origin", uncommitted_branch_name)
 
 
+@timed("git checkout -b")
 def create_local_temp_branch(repo: BlueprintRepo, uncommitted_branch_name: str) -> bool:
     logger.debug(f"[GIT] Checkout (-b) {uncommitted_branch_name}")
     repo.git.checkout("-b", uncommitted_branch_name)
     return True
 
 
+@timed("git commit")
 def commit_to_local_temp_branch(repo: BlueprintRepo) -> None:
     logger.debug("[GIT] Add (.)")
     repo.git.add(".")
@@ -146,6 +152,7 @@ def commit_to_local_temp_branch(repo: BlueprintRepo) -> None:
     repo.git.commit("-m", "Uncommitted temp branch - temp commit for validation")
 
 
+@timed("git stash list")
 def count_stashed_items(repo: BlueprintRepo) -> int:
     if repo:
         logger.info("[GIT] Stash(list)")
@@ -155,11 +162,13 @@ def count_stashed_items(repo: BlueprintRepo) -> int:
         return 0
 
 
+@timed("git stash push")
 def stash_local_changes(repo: BlueprintRepo):
     logger.debug("[GIT] Stash(Push --include-untracked)")
     repo.git.stash("push", "--include-untracked")
 
 
+@timed("git stash apply")
 def preserve_uncommitted_code(repo: BlueprintRepo) -> None:
     logger.debug("[GIT] Stash(APPLY)")
     repo.git.stash("apply")
@@ -174,40 +183,34 @@ def revert_from_local_temp_branch(repo: BlueprintRepo, active_branch: str, stash
         raise e
 
 
+@timed("git stash pop")
 def revert_from_uncommitted_code(repo: BlueprintRepo) -> None:
     logger.debug("[GIT] Stash(POP)")
     repo.git.stash("pop", "--index")
     remove_gitkeep_in_branch()
 
 
+@timed("git branch -D")
 def delete_temp_local_branch(repo: BlueprintRepo, temp_branch: str) -> None:
     logger.debug(f"[GIT] Deleting local branch {temp_branch}")
     repo.delete_head("-D", temp_branch)
 
 
+@timed("git push --delete")
 def delete_temp_remote_branch(repo: BlueprintRepo, temp_branch: str) -> None:
     logger.debug(f"[GIT] Deleting remote branch {temp_branch}")
     repo.git.push("origin", "--delete", temp_branch)
 
 
 def is_k8s_blueprint(blueprint_name: str, repo: BlueprintRepo) -> bool:
-    k8s_sandbox_flag = False
-    yaml_obj = repo.get_blueprint_yaml(blueprint_name)
-    for cloud in yaml_obj["clouds"]:
-        if "/" in cloud:
-            k8s_sandbox_flag = True
-    return k8s_sandbox_flag
+    return repo.get_blueprint_metadata(blueprint_name)["is_k8s"]
 
 
 def is_tf_blueprint(blueprint_name: str, repo: BlueprintRepo) -> bool:
-    tf_sandbox_flag = False
-    yaml_obj = repo.get_blueprint_yaml(blueprint_name)
-    if "services" in yaml_obj.keys():
-        if len(yaml_obj["services"]):
-            tf_sandbox_flag = True
-    return tf_sandbox_flag
+    return repo.get_blueprint_metadata(blueprint_name)["is_tf"]
 
 
+@timed("git checkout")
 def checkout_remote_branch(repo: BlueprintRepo, active_branch: str) -> None:
     logger.debug(f"[GIT] Checking out {active_branch}")
     repo.git.checkout(active_branch)
@@ -1,16 +1,49 @@
 import logging
-from urllib.parse import urljoin
+import threading
+import time
+from urllib.parse import urljoin, urlparse
 
 from requests import Response, Session
 
+from . import session as sessions
 from .exceptions import Unauthorized
+from .services import metrics
+from .services.circuit_breaker import CircuitBreaker
+from .services.hedging import HedgePolicy
+from .services.metrics import MetricsRegistry
+from .services.rate_limiter import RateLimiter
+from .services.timings import HTTP, span
+from .services.token_cache import TokenCache, is_token_expiring
 from .session import ColonySession
 
+logger = logging.getLogger(__name__)
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 
+# path segments which are followed by an identifier in API endpoints
+PATH_PARAMETERS = {
+    "accounts": "{account}",
+    "spaces": "{space}",
+    "sandbox": "{sandbox_id}",
+    "sandboxes": "{sandbox_id}",
+    "catalog": "{blueprint}",
+}
+
 
 class ColonyClient(object):
-    """Base class for Colony API access"""
+    """Base class for Colony API access
+
+    A client is safe to share between threads once created: requests never change the state of the client or its
+    session, so all threads reuse the connection pool of one session. Headers passed to a request apply to that
+    request only, on top of the session headers.
+
+    A client created with email and password takes the token from the token cache or logs in and caches it. The
+    token is replaced by logging in again shortly before it expires or when the API refuses it, and the refused
+    request is sent once more. Only one thread of the client logs in at a time.
+
+    Clients which are not given a session use the pooled session of their host from the session registry, which
+    may be shared with other clients and is never closed by them. A session passed to the client is closed with the
+    client. Use the client as a context manager or call close() when done with it.
+    """
 
     API_URL = "api/"
 
@@ -23,7 +56,12 @@ class ColonyClient(object):
         account: str = None,
         email: str = None,
         password: str = None,
-        session: ColonySession = ColonySession(),
+        session: ColonySession = None,
+        metrics_registry: MetricsRegistry = None,
+        token_cache: TokenCache = None,
+        rate_limiter: RateLimiter = None,
+        hedging: HedgePolicy = None,
+        circuit_breaker: CircuitBreaker = None,
     ):
 
         if account:
@@ -31,36 +69,50 @@ class ColonyClient(object):
         else:
             self.base_url = urljoin(f"{colony_host_prefix}{colony_host}", self.API_URL)
 
-        self.session = session
+        # the token is sent with every request rather than set on the session, which can be shared between clients
+        self.token = token
+        self._owns_session = session is not None
+        self.session = session if session is not None else sessions.registry.get(self.base_url)
+        # requests of all clients are recorded into the shared registry unless a client gets its own
+        self.metrics = metrics_registry or metrics.registry
+        # requests wait for their turn when the limiter is shared by other clients and processes
+        self.rate_limiter = rate_limiter
+        # GETs which are slower than usual are sent once more when given a hedging policy
+        self.hedging = hedging
+        # requests fail fast with CircuitOpenError while the breaker finds the API down
+        self.circuit_breaker = circuit_breaker
         self.space = space
         self.account = account
 
-        if token:
-            self.token = token
+        self._credentials = (email, password) if not token and all([account, email, password]) else None
+        self._login_lock = threading.Lock()
+        self.token_cache = token_cache
+        if self._credentials:
+            self.token_cache = token_cache or TokenCache()
+            self.token = self.token_cache.get(account, email) or self._login()
 
-        elif all([account, email, password]):
-            self.token = ColonyClient.login(account, email, password, self.session, self.base_url)
+    def __enter__(self) -> "ColonyClient":
+        return self
 
-        self.session.init_bearer_auth(token)
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
 
-    def __del__(self):
-        if self.session:
-            try:
-                self.session.close()
-            except Exception:
-                raise
-            finally:
-                self.session = None
+    def close(self) -> None:
+        """Closes the session given to the client. A pooled session is left open for other clients of the host"""
+        session, self.session = self.session, None
+        if session is not None and self._owns_session:
+            session.close()
 
     @staticmethod
     def login(
         account: str,
         email: str,
         password: str,
-        session: Session = ColonySession(),
+        session: Session = None,
         endpoint: str = "https://cloudshellcolony.com/api",
     ):
         path = urljoin(endpoint, f"accounts/{account}/login")
+        session = session if session is not None else sessions.registry.get(endpoint)
         payload = {"email": email, "password": password}
         resp = session.post(url=path, json=payload)
         if resp.status_code != 200:
@@ -76,31 +128,136 @@ class ColonyClient(object):
         if method not in ("GET", "PUT", "POST", "DELETE"):
             raise ValueError("Method must be in [GET, POST, PUT, DELETE]")
 
-        if headers:
-            self.session.headers.update(headers)
-
-        if method in ("POST", "PUT", "DELETE"):
-            self.session.headers.update({"Content-Type": "application/json"})
+        if self.session is None:
+            raise ValueError("Client is closed")
 
         if params is None:
             params = {}
 
         url = urljoin(self.base_url, endpoint)
+        token = self._get_token()
+        response = self._send(method, url, token, params, headers)
+        if response.status_code == 401 and self._credentials:
+            logger.debug("Access token has been refused, logging in again")
+            response = self._send(method, url, self._refresh_token(token), params, headers)
+
+        if response.status_code >= 400:
+            # TODO(ddovbii): implement exceptions and error handler
+            message = ";".join([f"{err['name']}: {err['message']}" for err in response.json().get("errors", [])])
+            raise Exception(message)
+
+        return response
+
+    def _send(self, method: str, url: str, token: str, params: dict, headers: dict = None) -> Response:
+        # composed per request, since the session and its headers are shared by all threads using the client
+        request_headers = {"Authorization": f"Bearer {token}"} if token else {}
+        if method in ("POST", "PUT", "DELETE"):
+            request_headers["Content-Type"] = "application/json"
+        request_headers.update(headers or {})
+
+        if self.circuit_breaker:
+            self.circuit_breaker.before_request()
+        if self.rate_limiter:
+            self.rate_limiter.acquire()
 
         request_args = {
             "method": method,
             "url": url,
+            "headers": request_headers,
         }
         if method == "GET":
             request_args["params"] = params
         else:
             request_args["json"] = params
 
-        response = self.session.request(**request_args)
+        path_template = get_path_template(url)
+        with span(f"{method} {path_template}", HTTP, method=method, url=url) as request_span:
+            start = time.perf_counter()
+            hedged = False
+            try:
+                if self.hedging and method == "GET":
+                    endpoint_metrics = self.metrics.get(method, path_template)
+                    response, hedged = self.hedging.send(
+                        lambda: self.session.request(**request_args),
+                        endpoint_metrics.latency if endpoint_metrics else None,
+                        self.rate_limiter,
+                    )
+                else:
+                    response = self.session.request(**request_args)
+            except Exception:
+                self.metrics.record(method, path_template, metrics.NO_RESPONSE, time.perf_counter() - start)
+                if self.circuit_breaker:
+                    self.circuit_breaker.record_failure()
+                raise
+            duration = time.perf_counter() - start
+            if self.circuit_breaker:
+                if response.status_code >= 500:
+                    self.circuit_breaker.record_failure()
+                else:
+                    self.circuit_breaker.record_success()
 
-        if response.status_code >= 400:
-            # TODO(ddovbii): implement exceptions and error handler
-            message = ";".join([f"{err['name']}: {err['message']}" for err in response.json().get("errors", [])])
-            raise Exception(message)
+            response_bytes = len(response.content or b"")
+            self.metrics.record(
+                method,
+                path_template,
+                response.status_code,
+                duration,
+                request_bytes=_get_body_size(response.request),
+                response_bytes=response_bytes,
+                retries=_get_retries(response),
+            )
+            if request_span:
+                request_span.attributes.update(status=response.status_code, bytes=response_bytes)
+                if hedged:
+                    request_span.attributes["hedged"] = True
 
         return response
+
+    def _get_token(self) -> str:
+        token = self.token
+        if self._credentials and (not token or is_token_expiring(token)):
+            token = self._refresh_token(token)
+        return token
+
+    def _refresh_token(self, stale_token: str) -> str:
+        """Replaces the stale token with the cached or a new one, unless another thread has already done it"""
+        with self._login_lock:
+            if self.token and self.token != stale_token and not is_token_expiring(self.token):
+                return self.token
+
+            cached_token = self.token_cache.get(self.account, self._credentials[0])
+            if cached_token and cached_token != stale_token:
+                self.token = cached_token
+            else:
+                self._login()
+            return self.token
+
+    def _login(self) -> str:
+        email, password = self._credentials
+        self.token = ColonyClient.login(self.account, email, password, self.session, self.base_url)
+        self.token_cache.set(self.account, email, self.token)
+        return self.token
+
+
+def get_path_template(url: str) -> str:
+    """Returns API path of the url with identifiers replaced by placeholders: spaces/{space}/sandbox/{sandbox_id}"""
+    segments = urlparse(url).path.strip("/").split("/")
+    if segments and segments[0] + "/" == ColonyClient.API_URL:
+        segments = segments[1:]
+
+    for i in range(1, len(segments)):
+        placeholder = PATH_PARAMETERS.get(segments[i - 1])
+        if placeholder:
+            segments[i] = placeholder
+    return "/".join(segments)
+
+
+def _get_body_size(request) -> int:
+    body = getattr(request, "body", None)
+    return len(body) if isinstance(body, (bytes, str)) else 0
+
+
+def _get_retries(response: Response) -> int:
+    """Number of retries urllib3 made before getting the response, when the session adapter retries requests"""
+    history = getattr(getattr(response.raw, "retries", None), "history", None)
+    return len(history) if isinstance(history, tuple) else 0
@@ -0,0 +1,61 @@
+import logging
+
+from colony.commands.base import BaseCommand
+from colony.services import agent
+
+logger = logging.getLogger(__name__)
+
+
+class AgentCommand(BaseCommand):
+    """
+    usage:
+        colony agent start [--idle-timeout=<minutes>]
+        colony agent stop
+        colony agent status
+        colony agent [--help|-h]
+
+    options:
+        --idle-timeout=<minutes>    Stop the agent after it has not run any command for this number of minutes
+                                    [default: 30]
+        -h --help                   Show this message
+
+    The agent is a background process which runs colony commands sent to it over a Unix socket
+    (~/.colony/agent.sock or COLONY_AGENT_SOCKET). While it is running, colony forwards commands to it, so that
+    they reuse its loaded config, API connections and opened blueprint repos. When the agent is not running or is
+    busy with another command, colony runs commands itself.
+    """
+
+    def get_actions_table(self) -> dict:
+        return {"start": self.do_start, "stop": self.do_stop, "status": self.do_status}
+
+    def do_start(self) -> bool:
+        if not agent.is_supported():
+            return self.die("Colony agent is not supported on this platform")
+
+        client = agent.AgentClient()
+        status = client.ping()
+        if status:
+            return self.result(status, f"Colony agent is already running (pid {status['pid']})")
+
+        idle_timeout = self.input_parser.agent_start.idle_timeout
+        if not agent.start_agent_process(idle_timeout=idle_timeout * 60):
+            return self.die(f"Colony agent has not started listening on {client.socket_path}")
+
+        status = client.ping() or {}
+        return self.result(status, f"Colony agent is started (pid {status.get('pid')})")
+
+    def do_stop(self) -> bool:
+        if not agent.AgentClient().stop():
+            return self.die("Colony agent is not running")
+        return self.result({"stopped": True}, "Colony agent is stopped")
+
+    def do_status(self) -> bool:
+        status = agent.AgentClient().ping()
+        if not status:
+            return self.die("Colony agent is not running")
+
+        return self.result(
+            status,
+            f"Colony agent is running (pid {status['pid']}, uptime {status['uptime']} sec, "
+            f"{status['commands']} commands run)",
+        )
@@ -1,4 +1,5 @@
 import sys
+import threading
 
 from colorama import Fore, Style
 from docopt import DocoptExit, docopt
@@ -7,6 +8,12 @@ from colony.base import ResourceManager
 from colony.client import ColonyClient
 from colony.models.connection import ColonyConnection
 from colony.parsers.command_input_parsers import CommandInputParser
+from colony.utils import BlueprintRepo
+from colony.view.writers import get_writer
+
+# output mode of the command running in the current thread, so that commands run one after another or in parallel in
+# one process never see the output mode of another command
+_running_command = threading.local()
 
 
 class BaseCommand(object):
@@ -15,18 +22,34 @@ class BaseCommand(object):
     """
 
     RESOURCE_MANAGER = ResourceManager
-
-    def __init__(self, command_args: list, connection: ColonyConnection = None):
+    # when results are written in a machine readable format all human readable messages go to stderr unstyled.
+    # Applies outside of commands, a running command uses its own output format
+    machine_output = False
+
+    def __init__(
+        self,
+        command_args: list,
+        connection: ColonyConnection = None,
+        output_format: str = None,
+        client: ColonyClient = None,
+    ):
         if connection:
-            self.client = ColonyClient(space=connection.space, token=connection.token, account=connection.account)
+            # commands run in the interactive shell share its client
+            self.client = client or ColonyClient(
+                space=connection.space, token=connection.token, account=connection.account
+            )
             self.manager = self.RESOURCE_MANAGER(client=self.client)
         else:
             self.client = None
             self.manager = None
 
+        self.connection = connection
+        self.output_format = output_format
         self.args = docopt(self.__doc__, argv=command_args)
         self.input_parser = CommandInputParser(self.args)
 
+        self.output = get_writer(output_format)
+
     def execute(self) -> bool:
         """Finds a subcommand passed to with command in
         object actions table and executes mapped method"""
@@ -34,8 +57,16 @@ class BaseCommand(object):
         actions_table = self.get_actions_table()
         for action in actions_table:
             if self.args.get(action, False):
-                # call action
-                return actions_table[action]()
+                # restored afterwards, since a command can run other commands, e.g. in the interactive shell
+                previous = getattr(_running_command, "machine_output", None)
+                _running_command.machine_output = self.output.is_machine_readable
+                try:
+                    # call action
+                    return actions_table[action]()
+                finally:
+                    _running_command.machine_output = previous
+                    # written once per command, also when commands run one after another in a long lived process
+                    BlueprintRepo.save_command_caches()
 
         # if subcommand was specified without args (actions), just show usage
         raise DocoptExit
@@ -43,8 +74,27 @@ class BaseCommand(object):
     def get_actions_table(self) -> dict:
         return {}
 
+    def result(self, record: dict, message: str = "") -> bool:
+        """Outputs successful command result as a record in machine readable mode or as a message otherwise"""
+        if self.output.is_machine_readable:
+            self.output.write_record(record)
+            return True
+
+        return self.success(message)
+
+    @staticmethod
+    def is_machine_output() -> bool:
+        machine_output = getattr(_running_command, "machine_output", None)
+        return BaseCommand.machine_output if machine_output is None else machine_output
+
     @staticmethod
     def styled_text(style, message: str = "", newline=True):
+        if BaseCommand.is_machine_output():
+            sys.stderr.write(message)
+            if newline:
+                sys.stderr.write("\n")
+            return
+
         if message:
             sys.stdout.write(style + message)
             sys.stdout.write(Style.RESET_ALL)
@@ -92,8 +142,9 @@ class BaseCommand(object):
 
     @staticmethod
     def message(message: str = ""):
-        sys.stdout.write(message)
-        sys.stdout.write("\n")
+        stream = sys.stderr if BaseCommand.is_machine_output() else sys.stdout
+        stream.write(message)
+        stream.write("\n")
 
     @staticmethod
     def url(prefix_message, message: str = ""):
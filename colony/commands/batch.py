@@ -0,0 +1,65 @@
+import logging
+import sys
+
+from colony.commands.base import BaseCommand
+from colony.services.batch import BatchRunner, parse_batch
+from colony.view.writers import NdjsonWriter
+
+logger = logging.getLogger(__name__)
+
+
+class BatchCommand(BaseCommand):
+    """
+    usage:
+        colony batch [<file>] [--parallel=<N>] [--fail-fast]
+        colony batch [--help|-h]
+
+    options:
+        --parallel=<N>              Maximum number of commands running at the same time [default: 1]
+        --fail-fast                 Do not start more commands after one of them has failed
+        -h --help                   Show this message
+
+    Runs commands read from the file (or from stdin when the file is not given or is '-') in a single process,
+    sharing the connection to Colony. The file has one command per line, e.g. 'sb status <sandbox_id>', or is a
+    YAML/JSON plan: a list of commands, each either a command line or a mapping with 'command', optional 'id' and
+    'after' (ids of earlier commands it needs to succeed first). A result of each command is written as a JSON line
+    with its index, id, exit code, output records and messages as soon as the command finishes.
+    """
+
+    # commands which can't run in a batch: interactive ones and the ones running commands themselves
+    EXCLUDED_COMMANDS = ("batch", "shell", "agent", "configure")
+
+    def get_actions_table(self) -> dict:
+        return {"batch": self.do_batch}
+
+    def do_batch(self) -> bool:
+        # imported here since the commands table itself refers to this command
+        from colony.shell import commands_table
+
+        file_name = self.input_parser.batch.file
+        try:
+            if file_name:
+                with open(file_name) as batch_file:
+                    entries = parse_batch(batch_file.read())
+            else:
+                entries = parse_batch(sys.stdin.read())
+        except (OSError, ValueError) as e:
+            logger.exception(e, exc_info=False)
+            return self.die()
+
+        commands = {name: cmd for name, cmd in commands_table.items() if name not in self.EXCLUDED_COMMANDS}
+        runner = BatchRunner(
+            commands,
+            self.connection,
+            self.client,
+            parallel=self.input_parser.batch.parallel,
+            fail_fast=self.input_parser.batch.fail_fast,
+        )
+
+        # results are always written as JSON lines, so that scripts can match them with the commands
+        writer = NdjsonWriter()
+        succeeded = True
+        for record in runner.run(entries):
+            succeeded = succeeded and record["ok"]
+            writer.write_record(record)
+        return succeeded
@@ -1,13 +1,17 @@
 import logging
 from collections import OrderedDict
-
-import tabulate
+from typing import Dict, Iterable, List
 
 from colony.blueprints import BlueprintsManager
 from colony.branch.branch_context import ContextBranch
 from colony.branch.branch_utils import get_and_check_folder_based_repo
 from colony.commands.base import BaseCommand
 from colony.parsers.command_input_validators import CommandInputValidator
+from colony.services.impact import BlueprintImpactIndex
+from colony.services.linter import BlueprintLinter
+from colony.services.validation import ValidationResult, merge_results, validate_blueprints
+from colony.services.validation_cache import ValidationCache
+from colony.utils import BlueprintRepo
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +19,7 @@ logger = logging.getLogger(__name__)
 class BlueprintsCommand(BaseCommand):
     """
     usage:
-        colony (bp | blueprint) validate <name> [options]
+        colony (bp | blueprint) validate (<name> | --all | --changed [<base>]) [options]
         colony (bp | blueprint) [--help]
 
     options:
@@ -26,10 +30,31 @@ class BlueprintsCommand(BaseCommand):
        -c --commit <commitId>   Specify the commit ID. This can be used to validate a blueprint from an historic commit.
                                 This option can be used together with the branch parameter.
 
+       --all                    Validate all blueprints of the current git repo. A blueprint name can also be a glob
+                                pattern like "promotions-*" to validate only matching blueprints. All blueprints are
+                                validated against the same branch, so local changes are pushed to a temp branch once.
+
+       --changed                Validate only blueprints affected by changes made since the current branch forked
+                                from <base> (HEAD by default, so only uncommitted changes are considered). Changes
+                                include committed, uncommitted and untracked files. A blueprint is affected when its
+                                file or any file of the applications and services it uses has changed.
+
+       --parallel <N>           How many blueprints are validated at the same time when validating several
+                                blueprints (default is 4).
+
+       --no-cache               Always send blueprints to Colony for validation. By default a blueprint is not sent
+                                again if it has been successfully validated in the same space within the last day and
+                                neither the blueprint file nor the applications and services it uses have changed.
+
+       --no-lint                Don't check local blueprint files for obvious errors before sending them to Colony.
+                                These offline checks are made only when local changes are validated (no branch is
+                                specified).
+
        -h --help                Show this message
     """
 
     RESOURCE_MANAGER = BlueprintsManager
+    _cache = None
 
     def get_actions_table(self) -> dict:
         return {"validate": self.do_validate}
@@ -41,7 +66,27 @@ class BlueprintsCommand(BaseCommand):
 
         CommandInputValidator.validate_commit_and_branch_specified(branch, commit)
 
+        if self.input_parser.blueprint_validate.changed:
+            return self.do_validate_changed(self.input_parser.blueprint_validate.base, branch, commit)
+
+        if self.input_parser.blueprint_validate.all or is_glob_pattern(blueprint_name):
+            pattern = blueprint_name or "*"
+            repo = get_and_check_folder_based_repo(None)
+            blueprints = repo.find_blueprints(pattern)
+            if not blueprints:
+                return self.die(f"No blueprints matching '{pattern}' found in the repo")
+            return self.do_validate_many(repo, blueprints, branch, commit)
+
         repo = get_and_check_folder_based_repo(blueprint_name)
+        lint_errors = self._lint(repo, [blueprint_name], branch)
+        if lint_errors:
+            return self._report_validation_result(lint_errors[blueprint_name])
+
+        cache_key = self._get_cache_key(repo, blueprint_name, branch, commit)
+        if self._is_cached(cache_key):
+            logger.debug(f"Blueprint '{blueprint_name}' with the same content has already been validated")
+            return self._report_validation_result(ValidationResult(blueprint_name, cached=True))
+
         with ContextBranch(repo, branch) as context_branch:
             if not context_branch:
                 return self.error("Unable to Validate BP")
@@ -53,14 +98,143 @@ class BlueprintsCommand(BaseCommand):
                 logger.exception(e, exc_info=False)
                 return self.die()
 
-        errors = getattr(bp, "errors")
+        result = ValidationResult(blueprint_name, getattr(bp, "errors"))
+        if cache_key:
+            self.cache.update(cache_key, blueprint_name, result.valid)
+            self.cache.save()
+
+        return self._report_validation_result(result)
+
+    def do_validate_changed(self, base: str, branch: str, commit: str) -> bool:
+        repo = get_and_check_folder_based_repo(None)
+        try:
+            changed_files = repo.get_changed_files(base)
+        except Exception as e:
+            logger.exception(e, exc_info=False)
+            return self.die()
+
+        logger.debug(f"{len(changed_files)} files changed since '{base}'")
+        blueprints = BlueprintImpactIndex(repo).get_affected_blueprints(changed_files)
+        if not blueprints:
+            return self.success(f"No blueprints are affected by changes since '{base}'")
+
+        BaseCommand.fyi_info(f"Blueprints affected by changes: {', '.join(blueprints)}")
+        return self.do_validate_many(repo, blueprints, branch, commit)
+
+    def do_validate_many(self, repo: BlueprintRepo, blueprints: List[str], branch: str, commit: str) -> bool:
+        known = self._lint(repo, blueprints, branch)
+        cache_keys = {bp: self._get_cache_key(repo, bp, branch, commit) for bp in blueprints if bp not in known}
+        known.update((bp, ValidationResult(bp, cached=True)) for bp, key in cache_keys.items() if self._is_cached(key))
+        pending = [bp for bp in blueprints if bp not in known]
+
+        if not pending:
+            # nothing to send, so there is no need in a temp branch either
+            invalid = self._write_validation_results(merge_results(blueprints, known, iter([])))
+        else:
+            with ContextBranch(repo, branch) as context_branch:
+                if not context_branch:
+                    return self.error("Unable to Validate BP")
+
+                results = validate_blueprints(
+                    self.manager,
+                    pending,
+                    branch=context_branch.validation_branch,
+                    commit=commit,
+                    max_workers=self.input_parser.blueprint_validate.parallel,
+                    cache=self.cache,
+                    cache_keys=cache_keys,
+                )
+                invalid = self._write_validation_results(merge_results(blueprints, known, results))
+        self.cache.save()
+
+        if invalid:
+            return self.die(f"{invalid} of {len(blueprints)} blueprints are not valid")
+
+        return self.success(f"All {len(blueprints)} blueprints are valid")
+
+    @property
+    def cache(self) -> ValidationCache:
+        if self._cache is None:
+            self._cache = ValidationCache(self.client.space if self.client else "")
+        return self._cache
+
+    def _lint(self, repo: BlueprintRepo, blueprints: Iterable[str], branch: str) -> Dict[str, ValidationResult]:
+        """Returns results of blueprints which have failed offline checks"""
+        if branch or self.input_parser.blueprint_validate.no_lint:
+            return {}
+
+        linter = BlueprintLinter(repo)
+        results = {}
+        for bp in blueprints:
+            if not repo.repo_has_blueprint(bp):
+                continue
+            errors = linter.lint(bp)
+            if errors:
+                logger.debug(f"Blueprint '{bp}' has failed offline checks")
+                results[bp] = ValidationResult(bp, errors)
+        return results
+
+    def _get_cache_key(self, repo: BlueprintRepo, blueprint_name: str, branch: str, commit: str) -> str:
+        """Returns validation cache key or None if the validated content can't be identified locally"""
+        if commit:
+            content_hash = f"commit:{commit}"
+        elif branch:
+            # the latest commit of the remote branch is unknown
+            return None
+        elif not repo.repo_has_blueprint(blueprint_name):
+            return None
+        else:
+            try:
+                content_hash = repo.get_blueprint_content_hash(blueprint_name)
+            except Exception as e:
+                logger.debug(f"Unable to calculate content hash of blueprint '{blueprint_name}'. Details: {e}")
+                return None
+
+        return self.cache.make_key(blueprint_name, content_hash)
+
+    def _is_cached(self, cache_key: str) -> bool:
+        if not cache_key or self.input_parser.blueprint_validate.no_cache:
+            return False
+        return self.cache.is_valid(cache_key)
+
+    def _report_validation_result(self, result: ValidationResult) -> bool:
+        if self.output.is_machine_readable:
+            self.output.write_record(result.to_record())
+            return result.valid
+
+        if not result.valid:
+            import tabulate
 
-        if errors:
             # We don't need error code
-            err_table = [OrderedDict([("NAME", err["name"]), ("MESSAGE", err["message"])]) for err in errors]
+            err_table = [OrderedDict([("NAME", err["name"]), ("MESSAGE", err["message"])]) for err in result.errors]
 
             logger.error("Blueprint validation failed")
             return self.die(tabulate.tabulate(err_table, headers="keys"))
 
         else:
             return self.success("Blueprint is valid")
+
+    def _write_validation_results(self, results: Iterable[ValidationResult]) -> int:
+        invalid = 0
+
+        def records():
+            nonlocal invalid
+            for result in results:
+                invalid += not result.valid
+                if self.output.is_machine_readable:
+                    yield result.to_record()
+                    continue
+
+                if result.valid:
+                    yield OrderedDict([("BLUEPRINT", result.blueprint), ("NAME", ""), ("MESSAGE", "Valid")])
+                for err in result.errors:
+                    yield OrderedDict(
+                        [("BLUEPRINT", result.blueprint), ("NAME", err["name"]), ("MESSAGE", err["message"])]
+                    )
+
+        self.output.write_records(records())
+        return invalid
+
+
+def is_glob_pattern(name: str) -> bool:
+    return bool(name) and any(char in name for char in "*?[")
@@ -37,7 +37,12 @@ class ConfigureCommand(BaseCommand):
         try:
             config_file = GlobalInputParser.get_config_path()
             config = ColonyConfigProvider(config_file).load_all()
-            result_table = ConfigureListView(config).render()
+            view = ConfigureListView(config)
+            if self.output.is_machine_readable:
+                self.output.write_records(view.records())
+                return True
+
+            result_table = view.render()
 
         except ConfigFileMissingError:
             raise DocoptExit("Config file doesn't exist. Use 'colony configure set' to configure Colony CLI.")
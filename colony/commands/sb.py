@@ -1,12 +1,18 @@
-import tabulate
+import sys
+from collections import OrderedDict
 
 from colony.branch.branch_context import ContextBranch
 from colony.branch.branch_utils import get_and_check_folder_based_repo, logger
 from colony.commands.base import BaseCommand
+from colony.models.sandbox_table import SandboxTable
 from colony.parsers.command_input_validators import CommandInputValidator
 from colony.sandboxes import SandboxesManager
+from colony.services.linter import BlueprintLinter
 from colony.services.sb_naming import generate_sandbox_name
 from colony.services.waiter import Waiter
+from colony.services.watcher import SandboxWatcher
+from colony.view.sandbox_list_view import SandboxListView
+from colony.view.sandbox_watch_view import LiveSandboxWatchView, SandboxEventLogView, change_records
 
 
 class SandboxesCommand(BaseCommand):
@@ -15,7 +21,10 @@ class SandboxesCommand(BaseCommand):
         colony (sb | sandbox) start <blueprint_name> [options]
         colony (sb | sandbox) status <sandbox_id>
         colony (sb | sandbox) end <sandbox_id>
-        colony (sb | sandbox) list [--filter={all|my|auto}] [--show-ended] [--count=<N>]
+        colony (sb | sandbox) list [--filter={all|my|auto}] [--show-ended] [--count=<N>] [--sort=<column>]
+                                   [--group-by=<column>] [--where=<conditions>]
+        colony (sb | sandbox) watch [--filter={all|my|auto}] [--show-ended] [--count=<N>] [--where=<conditions>]
+                                    [--interval=<seconds>] [--timeout=<minutes>]
         colony (sb | sandbox) [--help]
 
     options:
@@ -57,60 +66,116 @@ class SandboxesCommand(BaseCommand):
                                         with an error) while the timeout is not reached. Default timeout is 30 minutes.
                                         The default timeout can be changed using the "timeout" flag.
 
+       --no-lint                        Don't check the local blueprint for obvious errors before starting a sandbox.
+                                        These offline checks are made only when no branch is specified.
+
+       --sort <column>                  Sort listed sandboxes by one of the columns: id, name, blueprint, status, owner,
+                                        progress. Prefix the column with "-" to sort in descending order.
+                                        Example: --sort=-status
+
+       --group-by <column>              Instead of listing sandboxes show how many sandboxes there are per each value
+                                        of the column (id, name, blueprint, status, owner, progress).
+
+       --where <conditions>             Show only sandboxes matching all conditions provided as a comma-separated list
+                                        of column=value pairs. Use "|" to match one of several values.
+                                        Example: --where="status=Active|Launching, blueprint=my-bp"
+
+       --interval <seconds>             How often "watch" polls for sandbox changes while they keep changing (default
+                                        is 5 seconds). When nothing changes the polling gradually slows down.
+                                        "watch" runs until interrupted with Ctrl+C or until "timeout" minutes passed.
 
     """
 
     RESOURCE_MANAGER = SandboxesManager
 
     def get_actions_table(self) -> dict:
-        return {"status": self.do_status, "start": self.do_start, "end": self.do_end, "list": self.do_list}
+        return {
+            "status": self.do_status,
+            "start": self.do_start,
+            "end": self.do_end,
+            "list": self.do_list,
+            "watch": self.do_watch,
+        }
 
     def do_list(self):
         list_filter = self.input_parser.sandbox_list.filter
         show_ended = self.input_parser.sandbox_list.show_ended
         count = self.input_parser.sandbox_list.count
+        sort = self.input_parser.sandbox_list.sort
+        group_by = self.input_parser.sandbox_list.group_by
+        where = self.input_parser.sandbox_list.where
 
         try:
-            sandbox_list = self.manager.list(filter_opt=list_filter, count=count)
+            table = self.manager.list_table(filter_opt=list_filter, count=count)
         except Exception as e:
             logger.exception(e, exc_info=False)
             return self.die()
 
-        result_table = []
-        for sb in sandbox_list:
+        if not show_ended:
+            table = table.filter(SandboxTable.STATUS, ["Ended"], exclude=True)
+        table = table.where(where)
+        if sort:
+            table = table.sort(sort.lstrip("-"), descending=sort.startswith("-"))
 
-            if sb.sandbox_status == "Ended" and not show_ended:
-                continue
+        if self.output.is_machine_readable:
+            if group_by:
+                records = ({group_by: value, "count": count} for value, count in table.count_by(group_by).items())
+            else:
+                records = (dict(zip(SandboxTable.COLUMNS, row)) for row in table.rows())
+            self.output.write_records(records)
+            return True
+
+        view = SandboxListView(table)
+        if group_by:
+            view.write_counts(sys.stdout, group_by)
+        else:
+            view.write(sys.stdout)
+
+        return True
+
+    def do_watch(self):
+        watcher = SandboxWatcher(
+            self.manager,
+            list_filter=self.input_parser.sandbox_list.filter,
+            count=self.input_parser.sandbox_list.count,
+            conditions=self.input_parser.sandbox_list.where,
+            show_ended=self.input_parser.sandbox_list.show_ended,
+            interval=self.input_parser.sandbox_watch.interval,
+            timeout=self.input_parser.sandbox_watch.timeout,
+        )
 
-            result_table.append(
-                {
-                    "Sandbox ID": sb.sandbox_id,
-                    "Sandbox Name": sb.name,
-                    "Blueprint Name": sb.blueprint_name,
-                    "Status": sb.sandbox_status,
-                }
-            )
+        try:
+            if self.output.is_machine_readable:
+                self.output.write_records(change_records(watcher.changes()))
+            elif sys.stdout.isatty():
+                LiveSandboxWatchView(sys.stdout).follow(watcher.changes())
+            else:
+                SandboxEventLogView(sys.stdout).follow(watcher.changes())
+        except KeyboardInterrupt:
+            pass
 
-        self.message(tabulate.tabulate(result_table, headers="keys"))
+        return True
 
     def do_status(self):
+        sandbox_id = self.input_parser.sandbox_status.sandbox_id
         try:
-            sandbox = self.manager.get(self.input_parser.sandbox_status.sandbox_id)
+            sandbox = self.manager.get(sandbox_id)
         except Exception as e:
             logger.exception(e, exc_info=False)
             return self.die()
 
         status = getattr(sandbox, "sandbox_status")
-        return self.success(status)
+        return self.result({"id": sandbox_id, "status": status}, status)
 
     def do_end(self):
+        sandbox_id = self.input_parser.sandbox_end.sandbox_id
         try:
-            self.manager.end(self.input_parser.sandbox_status.sandbox_id)
+            self.manager.end(sandbox_id)
         except Exception as e:
             logger.exception(e, exc_info=False)
             return self.die()
 
-        return self.success("End request has been sent")
+        return self.result({"id": sandbox_id, "end_requested": True}, "End request has been sent")
 
     def do_start(self):
         # get commands inputs
@@ -128,7 +193,18 @@ class SandboxesCommand(BaseCommand):
         artifacts = self.input_parser.sandbox_start.artifacts
 
         repo = get_and_check_folder_based_repo(blueprint_name)
-        self._update_missing_artifacts_and_inputs_with_default_values(artifacts, blueprint_name, inputs, repo)
+        if not (branch or self.input_parser.sandbox_start.no_lint) and repo.repo_has_blueprint(blueprint_name):
+            lint_errors = BlueprintLinter(repo).lint(blueprint_name)
+            if lint_errors:
+                import tabulate
+
+                err_table = [OrderedDict([("NAME", err["name"]), ("MESSAGE", err["message"])]) for err in lint_errors]
+                logger.error("Blueprint has errors, sandbox is not started")
+                return self.die(tabulate.tabulate(err_table, headers="keys"))
+
+        self._update_missing_artifacts_and_inputs_with_default_values(
+            artifacts, blueprint_name, inputs, repo, repo.get_remote_revision(branch, commit)
+        )
 
         with ContextBranch(repo, branch) as context_branch:
             # TODO move error handling to exception catch (investigate best practices of error handling)
@@ -150,9 +226,10 @@ class SandboxesCommand(BaseCommand):
                     artifacts,
                     inputs,
                 )
+                sandbox_url = self.manager.get_sandbox_ui_link(sandbox_id)
                 BaseCommand.action_announcement("Starting sandbox")
                 BaseCommand.important_value("Id: ", sandbox_id)
-                BaseCommand.url(prefix_message="URL: ", message=self.manager.get_sandbox_ui_link(sandbox_id))
+                BaseCommand.url(prefix_message="URL: ", message=sandbox_url)
 
             except Exception as e:
                 logger.exception(e, exc_info=False)
@@ -165,24 +242,25 @@ class SandboxesCommand(BaseCommand):
             if wait_timeout_reached:
                 return self.die()
             else:
-                return self.success(sandbox_id)
-
-    def _update_missing_artifacts_and_inputs_with_default_values(self, artifacts, blueprint_name, inputs, repo):
-        # TODO(ddovbii): This obtaining default values magic must be refactored
-        logger.debug("Trying to obtain default values for artifacts and inputs from local git blueprint repo")
+                return self.result({"id": sandbox_id, "name": sandbox_name_input, "url": sandbox_url}, sandbox_id)
+
+    def _update_missing_artifacts_and_inputs_with_default_values(
+        self, artifacts, blueprint_name, inputs, repo, revision=None
+    ):
+        # Without revision local blueprint is used, since local changes are pushed to a temp branch anyway
+        logger.debug(
+            f"Trying to obtain default values for artifacts and inputs from {revision or 'local'} blueprint definition"
+        )
         try:
-            if not repo.is_current_branch_synced():
-                logger.debug("Skipping obtaining values since local branch is not synced with remote")
-            else:
-                for art_name, art_path in repo.get_blueprint_artifacts(blueprint_name).items():
-                    if art_name not in artifacts and art_path is not None:
-                        logger.debug(f"Artifact `{art_name}` has been set with default path `{art_path}`")
-                        artifacts[art_name] = art_path
-
-                for input_name, input_value in repo.get_blueprint_default_inputs(blueprint_name).items():
-                    if input_name not in inputs and input_value is not None:
-                        logger.debug(f"Parameter `{input_name}` has been set with default value `{input_value}`")
-                        inputs[input_name] = input_value
+            for art_name, art_path in repo.get_blueprint_artifacts(blueprint_name, revision).items():
+                if art_name not in artifacts and art_path is not None:
+                    logger.debug(f"Artifact `{art_name}` has been set with default path `{art_path}`")
+                    artifacts[art_name] = art_path
+
+            for input_name, input_value in repo.get_blueprint_default_inputs(blueprint_name, revision).items():
+                if input_name not in inputs and input_value is not None:
+                    logger.debug(f"Parameter `{input_name}` has been set with default value `{input_value}`")
+                    inputs[input_name] = input_value
 
         except Exception as e:
             logger.debug(f"Unable to obtain default values. Details: {e}")
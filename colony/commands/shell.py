@@ -0,0 +1,29 @@
+from colony.commands.base import BaseCommand
+from colony.services.repl import ColonyRepl
+
+
+class ShellCommand(BaseCommand):
+    """
+    usage:
+        colony shell
+        colony shell [--help|-h]
+
+    options:
+        -h --help                   Show this message
+
+    Runs colony commands interactively in a single session: sb list, bp validate <name>, sb status <sandbox_id>.
+    The connection, the API session and the blueprint repo are reused by all commands. Use Tab to complete commands,
+    options, sandbox ids and blueprint names, 'help <command>' to see its usage and 'exit' or Ctrl-D to leave.
+    """
+
+    def get_actions_table(self) -> dict:
+        return {"shell": self.do_shell}
+
+    def do_shell(self) -> bool:
+        # imported here since the commands table itself refers to this command
+        from colony.shell import commands_table
+
+        commands = {name: command for name, command in commands_table.items() if command is not ShellCommand}
+        repl = ColonyRepl(commands, self.connection, self.client, self.output_format)
+        repl.cmdloop()
+        return True
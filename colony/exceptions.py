@@ -12,3 +12,15 @@ class ConfigFileMissingError(ConfigError):
 
 class BadBlueprintRepo(Exception):
     pass
+
+
+class CassetteError(Exception):
+    pass
+
+
+class CircuitOpenError(Exception):
+    """Request has not been sent since the API keeps failing. It may be tried again in retry_after seconds"""
+
+    def __init__(self, message: str, retry_after: float = 0):
+        super(CircuitOpenError, self).__init__(message)
+        self.retry_after = retry_after
@@ -0,0 +1,192 @@
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, Iterator, List, Set
+
+
+class SandboxTable(object):
+    """Column oriented container for sandbox list responses.
+
+    Values of low cardinality columns (status, blueprint, owner) are dictionary encoded: each row keeps only an
+    integer code, so filtering, sorting and grouping work on compact arrays and touch every distinct value once.
+    Operations return new tables which share columns with the original one and differ only by a selection of row
+    indexes.
+    """
+
+    ID = "id"
+    NAME = "name"
+    BLUEPRINT = "blueprint"
+    STATUS = "status"
+    OWNER = "owner"
+    PROGRESS = "progress"
+
+    COLUMNS = OrderedDict(
+        [
+            (ID, "Sandbox ID"),
+            (NAME, "Sandbox Name"),
+            (BLUEPRINT, "Blueprint Name"),
+            (STATUS, "Status"),
+            (OWNER, "Owner"),
+            (PROGRESS, "Progress"),
+        ]
+    )
+    CATEGORICAL_COLUMNS = (BLUEPRINT, STATUS, OWNER, PROGRESS)
+
+    def __init__(self, columns: Dict[str, list] = None, dictionaries: Dict[str, list] = None, selection: array = None):
+        self._columns = columns or {self.ID: [], self.NAME: []}
+        self._dictionaries = dictionaries or {}
+        for col in self.CATEGORICAL_COLUMNS:
+            self._columns.setdefault(col, array("l"))
+            self._dictionaries.setdefault(col, [])
+
+        if selection is None:
+            selection = array("l", range(len(self._columns[self.ID])))
+        self._selection = selection
+
+    @classmethod
+    def from_json(cls, list_json: Iterable[dict]) -> "SandboxTable":
+        ids = []
+        names = []
+        codes = {col: array("l") for col in cls.CATEGORICAL_COLUMNS}
+        dictionaries = {col: [] for col in cls.CATEGORICAL_COLUMNS}
+        lookups = {col: {} for col in cls.CATEGORICAL_COLUMNS}
+
+        for obj in list_json:
+            try:
+                ids.append(obj["id"])
+                names.append(obj["name"] or "")
+                values = {
+                    cls.BLUEPRINT: obj["blueprint_name"] or "",
+                    cls.STATUS: obj.get("sandbox_status") or "",
+                    cls.OWNER: cls._get_owner(obj.get("owner")),
+                    cls.PROGRESS: cls._get_progress(obj.get("launching_progress")),
+                }
+            except KeyError as e:
+                raise NotImplementedError(f"unable to create object. Missing keys in Json. Details: {e}")
+
+            for col, value in values.items():
+                lookup = lookups[col]
+                code = lookup.get(value)
+                if code is None:
+                    code = lookup[value] = len(dictionaries[col])
+                    dictionaries[col].append(value)
+                codes[col].append(code)
+
+        columns = {cls.ID: ids, cls.NAME: names}
+        columns.update(codes)
+        return cls(columns, dictionaries)
+
+    @staticmethod
+    def _get_owner(owner) -> str:
+        if not owner:
+            return ""
+        if isinstance(owner, dict):
+            return owner.get("email") or " ".join(
+                filter(None, [owner.get("first_name", ""), owner.get("last_name", "")])
+            )
+        return str(owner)
+
+    @staticmethod
+    def _get_progress(progress) -> str:
+        """Summarizes launching progress as 'infrastructure 1/1, artifacts Done, applications 0/2'"""
+        if not progress or not isinstance(progress, dict):
+            return ""
+
+        stages = []
+        for stage, details in progress.items():
+            name = stage.split("_")[-1]
+            details = details or {}
+            if details.get("total"):
+                stages.append(f"{name} {details.get('succeeded', 0)}/{details['total']}")
+            else:
+                stages.append(f"{name} {details.get('status', '')}".rstrip())
+        return ", ".join(stages)
+
+    def __len__(self) -> int:
+        return len(self._selection)
+
+    def _view(self, selection: array) -> "SandboxTable":
+        return SandboxTable(self._columns, self._dictionaries, selection)
+
+    def _value(self, column: str, row: int) -> str:
+        if column in self._dictionaries:
+            return self._dictionaries[column][self._columns[column][row]]
+        return self._columns[column][row]
+
+    def _validate_column(self, column: str) -> None:
+        if column not in self.COLUMNS:
+            raise ValueError(f"Unknown column '{column}'. Must be one of [{', '.join(self.COLUMNS)}]")
+
+    def column(self, column: str) -> List[str]:
+        self._validate_column(column)
+        return [self._value(column, row) for row in self._selection]
+
+    def rows(self, columns: List[str] = None) -> Iterator[tuple]:
+        columns = columns or list(self.COLUMNS)
+        for col in columns:
+            self._validate_column(col)
+
+        for row in self._selection:
+            yield tuple(self._value(col, row) for col in columns)
+
+    def filter(self, column: str, values: Iterable[str], exclude: bool = False) -> "SandboxTable":
+        """Keeps (or drops if exclude is set) rows which value in column is one of values"""
+        self._validate_column(column)
+        wanted = set(values)
+        data = self._columns[column]
+
+        if column in self._dictionaries:
+            # resolve values to codes once and scan the integer column
+            wanted = {code for code, value in enumerate(self._dictionaries[column]) if value in wanted}
+
+        if exclude:
+            selection = array("l", (row for row in self._selection if data[row] not in wanted))
+        else:
+            selection = array("l", (row for row in self._selection if data[row] in wanted))
+        return self._view(selection)
+
+    def where(self, conditions: Dict[str, Set[str]]) -> "SandboxTable":
+        table = self
+        for column, values in conditions.items():
+            table = table.filter(column, values)
+        return table
+
+    def sort(self, column: str, descending: bool = False) -> "SandboxTable":
+        self._validate_column(column)
+        data = self._columns[column]
+
+        if column in self._dictionaries:
+            # rank distinct values once so rows are ordered by a plain integer key
+            dictionary = self._dictionaries[column]
+            ranks = array("l", [0] * len(dictionary))
+            for rank, code in enumerate(sorted(range(len(dictionary)), key=dictionary.__getitem__)):
+                ranks[code] = rank
+            key = lambda row: ranks[data[row]]  # noqa: E731
+        else:
+            key = data.__getitem__
+
+        return self._view(array("l", sorted(self._selection, key=key, reverse=descending)))
+
+    def count_by(self, column: str) -> Dict[str, int]:
+        self._validate_column(column)
+        if column not in self._dictionaries:
+            counts = OrderedDict()
+            for value in self.column(column):
+                counts[value] = counts.get(value, 0) + 1
+            return counts
+
+        data = self._columns[column]
+        code_counts = array("l", [0] * len(self._dictionaries[column]))
+        for row in self._selection:
+            code_counts[data[row]] += 1
+
+        return OrderedDict(
+            (value, code_counts[code]) for code, value in enumerate(self._dictionaries[column]) if code_counts[code]
+        )
+
+    def group_by(self, column: str) -> Dict[str, "SandboxTable"]:
+        self._validate_column(column)
+        groups = OrderedDict()
+        for row in self._selection:
+            groups.setdefault(self._value(column, row), array("l")).append(row)
+
+        return OrderedDict((value, self._view(selection)) for value, selection in groups.items())
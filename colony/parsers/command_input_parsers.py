@@ -1,8 +1,18 @@
 from abc import ABC
 from typing import Dict
 
-from colony.parsers.command_input_validators import SandboxListValidator, SandboxStartInputValidator
-from colony.utils import parse_comma_separated_string
+from docopt import DocoptExit
+
+from colony.parsers.command_input_validators import (
+    AgentStartInputValidator,
+    BatchInputValidator,
+    BlueprintValidateInputValidator,
+    SandboxListValidator,
+    SandboxStartInputValidator,
+    SandboxWatchInputValidator,
+)
+from colony.services.validation import DEFAULT_PARALLEL_VALIDATIONS
+from colony.utils import parse_comma_separated_string, parse_where_conditions
 
 
 class CommandInputParser:
@@ -13,10 +23,13 @@ class CommandInputParser:
         """
         self.sandbox_start = SandboxStartInputParser(command_args)
         self.sandbox_list = SandboxListInputParser(command_args)
+        self.sandbox_watch = SandboxWatchInputParser(command_args)
         self.sandbox_end = SandboxEndInputParser(command_args)
         self.sandbox_status = SandboxStatusInputParser(command_args)
         self.blueprint_validate = BlueprintValidateInputParser(command_args)
         self.configure_remove = ConfigureRemoveInputParser(command_args)
+        self.agent_start = AgentStartInputParser(command_args)
+        self.batch = BatchInputParser(command_args)
 
 
 class InputParserBase(ABC):
@@ -30,6 +43,33 @@ class ConfigureRemoveInputParser(InputParserBase):
         return self._args["<profile>"]
 
 
+class AgentStartInputParser(InputParserBase):
+    @property
+    def idle_timeout(self) -> int:
+        """Minutes the agent stays alive without commands"""
+        idle_timeout = self._args.get("--idle-timeout")
+        AgentStartInputValidator.validate_idle_timeout(idle_timeout)
+        return int(idle_timeout or 30)
+
+
+class BatchInputParser(InputParserBase):
+    @property
+    def file(self) -> str:
+        """Batch file name. None when commands are read from stdin"""
+        file_name = self._args.get("<file>")
+        return None if file_name == "-" else file_name
+
+    @property
+    def parallel(self) -> int:
+        parallel = self._args.get("--parallel")
+        BatchInputValidator.validate_parallel(parallel)
+        return int(parallel or 1)
+
+    @property
+    def fail_fast(self) -> bool:
+        return self._args.get("--fail-fast", False)
+
+
 class BlueprintValidateInputParser(InputParserBase):
     @property
     def blueprint_name(self) -> str:
@@ -43,6 +83,32 @@ class BlueprintValidateInputParser(InputParserBase):
     def commit(self) -> str:
         return self._args.get("--commit")
 
+    @property
+    def all(self) -> bool:
+        return self._args.get("--all", False)
+
+    @property
+    def no_cache(self) -> bool:
+        return self._args.get("--no-cache", False)
+
+    @property
+    def no_lint(self) -> bool:
+        return self._args.get("--no-lint", False)
+
+    @property
+    def changed(self) -> bool:
+        return self._args.get("--changed", False)
+
+    @property
+    def base(self) -> str:
+        return self._args.get("<base>") or "HEAD"
+
+    @property
+    def parallel(self) -> int:
+        parallel = self._args.get("--parallel")
+        BlueprintValidateInputValidator.validate_parallel(parallel)
+        return int(parallel or DEFAULT_PARALLEL_VALIDATIONS)
+
 
 class SandboxEndInputParser(InputParserBase):
     @property
@@ -73,11 +139,49 @@ class SandboxListInputParser(InputParserBase):
     def count(self) -> int:
         return self._args.get("--count", 25)
 
+    @property
+    def sort(self) -> str:
+        sort = self._args.get("--sort")
+        if sort:
+            SandboxListValidator.validate_column(sort.lstrip("-"))
+        return sort
+
+    @property
+    def group_by(self) -> str:
+        group_by = self._args.get("--group-by")
+        if group_by:
+            SandboxListValidator.validate_column(group_by)
+        return group_by
+
+    @property
+    def where(self) -> dict:
+        try:
+            conditions = parse_where_conditions(self._args.get("--where"))
+        except ValueError as e:
+            raise DocoptExit(str(e))
+        for column in conditions:
+            SandboxListValidator.validate_column(column)
+        return conditions
+
     # @property
     # def sandbox_id(self) -> str:
     #     return self._args["<sandbox_id>"]
 
 
+class SandboxWatchInputParser(InputParserBase):
+    @property
+    def interval(self) -> int:
+        interval = self._args.get("--interval")
+        SandboxWatchInputValidator.validate_interval(interval)
+        return int(interval or 5)
+
+    @property
+    def timeout(self) -> int:
+        timeout = self._args.get("--timeout")
+        SandboxStartInputValidator.validate_timeout(timeout)
+        return int(timeout) if timeout is not None else timeout
+
+
 class SandboxStartInputParser(InputParserBase):
     @property
     def blueprint_name(self) -> str:
@@ -118,3 +222,7 @@ class SandboxStartInputParser(InputParserBase):
     @property
     def artifacts(self) -> dict:
         return parse_comma_separated_string(self._args["--artifacts"])
+
+    @property
+    def no_lint(self) -> bool:
+        return self._args.get("--no-lint", False)
@@ -1,5 +1,7 @@
 from docopt import DocoptExit
 
+from colony.models.sandbox_table import SandboxTable
+
 
 # generic/shared validations
 class CommandInputValidator:
@@ -9,12 +11,30 @@ class CommandInputValidator:
             raise DocoptExit("Since commit is specified, branch is required")
 
 
+class BlueprintValidateInputValidator:
+    @staticmethod
+    def validate_parallel(parallel: str):
+        if parallel is not None:
+            try:
+                parallel = int(parallel)
+            except ValueError:
+                raise DocoptExit("Parallel must be a number")
+
+            if parallel <= 0:
+                raise DocoptExit("Parallel must be positive")
+
+
 class SandboxListValidator:
     @staticmethod
     def validate_filter(value: str):
         if value not in ["my", "all", "auto"]:
             raise DocoptExit("--filter value must be in [my, all, auto]")
 
+    @staticmethod
+    def validate_column(value: str):
+        if value not in SandboxTable.COLUMNS:
+            raise DocoptExit(f"Column must be in [{', '.join(SandboxTable.COLUMNS)}]")
+
 
 class SandboxStartInputValidator:
     @staticmethod
@@ -37,3 +57,42 @@ class SandboxStartInputValidator:
                     raise DocoptExit("Duration must be positive")
             except ValueError:
                 raise DocoptExit("Duration must be a number")
+
+
+class SandboxWatchInputValidator:
+    @staticmethod
+    def validate_interval(interval: str):
+        if interval is not None:
+            try:
+                interval = int(interval)
+            except ValueError:
+                raise DocoptExit("Interval must be a number")
+
+            if interval <= 0:
+                raise DocoptExit("Interval must be positive")
+
+
+class AgentStartInputValidator:
+    @staticmethod
+    def validate_idle_timeout(idle_timeout: str):
+        if idle_timeout is not None:
+            try:
+                idle_timeout = int(idle_timeout)
+            except ValueError:
+                raise DocoptExit("Idle timeout must be a number")
+
+            if idle_timeout <= 0:
+                raise DocoptExit("Idle timeout must be positive")
+
+
+class BatchInputValidator:
+    @staticmethod
+    def validate_parallel(parallel: str):
+        if parallel is not None:
+            try:
+                parallel = int(parallel)
+            except ValueError:
+                raise DocoptExit("Parallel must be a number")
+
+            if parallel <= 0:
+                raise DocoptExit("Parallel must be positive")
@@ -1,6 +1,12 @@
 import os
 from typing import Dict, List
 
+from docopt import DocoptExit
+
+from colony.services.cassette import CASSETTE_MODES, REPLAY_MODE
+from colony.services.profiler import PROFILERS
+from colony.view.writers import OUTPUT_WRITERS, TABLE_OUTPUT
+
 
 class GlobalInputParser:
     def __init__(self, command_args: Dict):
@@ -30,6 +36,24 @@ class GlobalInputParser:
     def debug(self) -> str:
         return self._args.get("--debug", None)
 
+    @property
+    def output(self) -> str:
+        output = self._args.get("--output", None) or os.environ.get("COLONY_OUTPUT", None) or TABLE_OUTPUT
+        if output not in OUTPUT_WRITERS:
+            raise DocoptExit(f"--output value must be in [{', '.join(OUTPUT_WRITERS)}]")
+        return output
+
+    @property
+    def profiler(self) -> str:
+        profiler = self._args.get("--profiler", None)
+        if profiler is not None and profiler not in PROFILERS:
+            raise DocoptExit(f"--profiler value must be in [{', '.join(PROFILERS)}]")
+        return profiler
+
+    @property
+    def timings(self) -> bool:
+        return self._args.get("--timings", False)
+
     @property
     def command(self) -> str:
         return self._args.get("<command>", None)
@@ -41,3 +65,51 @@ class GlobalInputParser:
     @staticmethod
     def get_config_path() -> str:
         return os.environ.get("COLONY_CONFIG_PATH", None)
+
+    @staticmethod
+    def get_trace_file_path() -> str:
+        return os.environ.get("COLONY_TRACE_FILE", None)
+
+    @staticmethod
+    def get_metrics_file_path() -> str:
+        return os.environ.get("COLONY_METRICS_FILE", None)
+
+    @staticmethod
+    def get_circuit_file_path() -> str:
+        return os.environ.get("COLONY_CIRCUIT_FILE", None)
+
+    @staticmethod
+    def get_rate_limit() -> float:
+        rate = os.environ.get("COLONY_RATE_LIMIT", None)
+        if not rate:
+            return None
+        try:
+            rate = float(rate)
+        except ValueError:
+            rate = 0
+        if rate <= 0:
+            raise DocoptExit("COLONY_RATE_LIMIT value must be a positive number of requests per second")
+        return rate
+
+    @staticmethod
+    def is_hedging_enabled() -> bool:
+        return (os.environ.get("COLONY_HEDGE_REQUESTS", None) or "").lower() in ("1", "true", "yes")
+
+    @staticmethod
+    def get_cassette_path() -> str:
+        return os.environ.get("COLONY_CASSETTE", None)
+
+    @staticmethod
+    def get_cassette_mode() -> str:
+        mode = os.environ.get("COLONY_CASSETTE_MODE", None) or REPLAY_MODE
+        if mode not in CASSETTE_MODES:
+            raise DocoptExit(f"COLONY_CASSETTE_MODE value must be in [{', '.join(CASSETTE_MODES)}]")
+        return mode
+
+    @staticmethod
+    def get_cassette_latency_scale() -> float:
+        scale = os.environ.get("COLONY_CASSETTE_LATENCY", None) or "1"
+        try:
+            return max(float(scale), 0.0)
+        except ValueError:
+            raise DocoptExit("COLONY_CASSETTE_LATENCY value must be a number")
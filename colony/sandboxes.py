@@ -1,6 +1,7 @@
 from urllib.parse import urlparse
 
 from .base import Resource, ResourceManager
+from .models.sandbox_table import SandboxTable
 
 
 class Sandbox(Resource):
@@ -60,6 +61,12 @@ class SandboxesManager(ResourceManager):
 
         return [self.resource_obj.json_deserialize(self, obj) for obj in list_json]
 
+    def list_table(self, count: int = 25, filter_opt: str = "my") -> SandboxTable:
+        filter_params = {"count": count, "filter": filter_opt}
+        list_json = self._list(path=self.SANDBOXES_PATH, filter_params=filter_params)
+
+        return SandboxTable.from_json(list_json)
+
     def start(
         self,
         sandbox_name: str,
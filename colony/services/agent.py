@@ -0,0 +1,345 @@
+"""
+Runs the colony agent in the foreground: python -m colony.services.agent [options]
+Use 'colony agent start' to start it in the background.
+
+Usage: agent [--socket=<path>] [--idle-timeout=<seconds>]
+"""
+
+import json
+import logging
+import os
+import select
+import socket
+import socketserver
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable
+
+from docopt import docopt
+
+from colony.services import cancellation
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = "~/.colony/agent.sock"
+DEFAULT_IDLE_TIMEOUT = 30 * 60
+# how long the CLI waits for the agent to accept a connection before running the command itself
+CONNECT_TIMEOUT = 0.5
+START_TIMEOUT = 10
+# how often the agent checks whether it has been idle for too long or has been asked to stop
+POLL_INTERVAL = 1
+# environment variables of the CLI process which are applied while its command runs in the agent
+FORWARDED_ENV_PREFIX = "COLONY_"
+
+
+def is_supported() -> bool:
+    return hasattr(socket, "AF_UNIX")
+
+
+def get_socket_path(path: str = None) -> str:
+    return os.path.expanduser(path or os.environ.get("COLONY_AGENT_SOCKET", None) or DEFAULT_SOCKET_PATH)
+
+
+class AgentClient(object):
+    """Sends requests to the agent listening on the Unix socket"""
+
+    def __init__(self, socket_path: str = None):
+        self.socket_path = get_socket_path(socket_path)
+
+    def run(self, argv: list, stdout=None, stderr=None):
+        """Runs the CLI command in the agent and writes its output to the streams as it comes.
+
+        Returns the exit code of the command or None when the agent is not running or busy with another command, and
+        the command should be run in the current process.
+        """
+        stdout = stdout or sys.stdout
+        stderr = stderr or sys.stderr
+        request = {
+            "type": "run",
+            "argv": argv,
+            "cwd": os.getcwd(),
+            "env": {name: value for name, value in os.environ.items() if name.startswith(FORWARDED_ENV_PREFIX)},
+        }
+        try:
+            conn = self._connect()
+        except OSError:
+            return None
+
+        output_started = False
+        try:
+            with conn, conn.makefile("r", encoding="utf-8") as replies:
+                conn.settimeout(None)
+                conn.sendall(_encode(request))
+                for line in replies:
+                    message = json.loads(line)
+                    if message.get("busy"):
+                        return None
+                    if "exit" in message:
+                        return message["exit"]
+                    output_started = True
+                    stream = stdout if message.get("stream") == "stdout" else stderr
+                    stream.write(message.get("data", ""))
+                    stream.flush()
+        except (OSError, ValueError) as e:
+            logger.debug(f"Connection to colony agent failed. Details: {e}")
+
+        # the agent has gone away. Run the command locally unless it has already produced some output
+        return 1 if output_started else None
+
+    def ping(self) -> dict:
+        """Returns the agent status or None when it is not running"""
+        return self._send({"type": "ping"})
+
+    def stop(self) -> bool:
+        return self._send({"type": "stop"}) is not None
+
+    def _send(self, request: dict) -> dict:
+        try:
+            with self._connect() as conn, conn.makefile("r", encoding="utf-8") as replies:
+                conn.sendall(_encode(request))
+                return json.loads(replies.readline())
+        except (OSError, ValueError):
+            return None
+
+    def _connect(self) -> socket.socket:
+        if not is_supported() or not os.path.exists(self.socket_path):
+            raise FileNotFoundError(self.socket_path)
+
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.settimeout(CONNECT_TIMEOUT)
+        try:
+            conn.connect(self.socket_path)
+        except OSError:
+            conn.close()
+            raise
+        return conn
+
+
+class _SocketStream(object):
+    """File-like object which sends everything written to it to the CLI as output of the stream"""
+
+    encoding = "utf-8"
+
+    def __init__(self, conn: socket.socket, name: str, disconnected: threading.Event = None):
+        self.conn = conn
+        self.name = name
+        self.disconnected = disconnected or threading.Event()
+
+    def write(self, data: str) -> int:
+        if self.disconnected.is_set():
+            raise BrokenPipeError("CLI has disconnected")
+        if data:
+            self.conn.sendall(_encode({"stream": self.name, "data": data}))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def isatty(self) -> bool:
+        # spinners and live views are not rendered through the agent
+        return False
+
+
+class _DisconnectWatcher(object):
+    """Cancels the running command as soon as the CLI closes its connection.
+
+    The CLI sends nothing after its request, so the connection becomes readable only when it is closed. Commands
+    which poll without writing any output would otherwise only notice it once they write. Waits check the
+    cancellation between polls, and output written after the disconnect fails with an OSError.
+    """
+
+    def __init__(self, conn: socket.socket):
+        self.conn = conn
+        self.disconnected = threading.Event()
+        self._finished = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._watch, name="colony-agent-disconnect-watcher", daemon=True)
+
+    def __enter__(self) -> "_DisconnectWatcher":
+        cancellation.reset()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        # the next command is never cancelled by the watcher of this one
+        with self._lock:
+            self._finished = True
+
+    def _watch(self) -> None:
+        while not self._finished:
+            try:
+                readable, _, _ = select.select([self.conn], [], [], POLL_INTERVAL)
+                if not readable or self.conn.recv(1, socket.MSG_PEEK):
+                    continue
+            except (OSError, ValueError):
+                pass
+
+            with self._lock:
+                if not self._finished:
+                    logger.debug("CLI has disconnected, cancelling its command")
+                    self.disconnected.set()
+                    cancellation.cancel()
+            return
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+
+        request_type = request.get("type")
+        if request_type == "ping":
+            self._reply(self.server.get_status())
+        elif request_type == "stop":
+            self._reply({"stopping": True})
+            self.server.stopping = True
+        elif request_type == "run":
+            if not self.server.command_lock.acquire(blocking=False):
+                self._reply({"busy": True})
+                return
+            try:
+                exit_code = self.server.run_command(request, self.connection)
+            finally:
+                # released before the reply, so that the next command of the CLI never finds the agent busy
+                self.server.command_lock.release()
+            self._reply({"exit": exit_code})
+
+    def _reply(self, message: dict) -> None:
+        self.wfile.write(_encode(message))
+
+
+class AgentServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Runs CLI commands sent over the Unix socket in this long lived process.
+
+    Commands run one at a time, since they change the working directory and environment of the process. A command
+    sent while another one runs is refused and the CLI runs it itself. A command is aborted when the CLI disconnects,
+    and the agent exits after idle_timeout seconds without commands.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, handler: Callable[[list], bool], idle_timeout: int = DEFAULT_IDLE_TIMEOUT):
+        self.socket_path = socket_path
+        self.handler = handler
+        self.idle_timeout = idle_timeout
+        self.timeout = POLL_INTERVAL
+        self.command_lock = threading.Lock()
+        self.stopping = False
+        self.started = self.last_command_time = time.time()
+        self.commands_count = 0
+
+        os.makedirs(os.path.dirname(socket_path), mode=0o700, exist_ok=True)
+        if os.path.exists(socket_path):
+            # left by an agent which did not exit cleanly
+            os.remove(socket_path)
+        socketserver.UnixStreamServer.__init__(self, socket_path, _RequestHandler)
+        os.chmod(socket_path, 0o600)
+
+    def serve_until_idle(self) -> None:
+        try:
+            while not self.stopping:
+                self.handle_request()
+        finally:
+            self.server_close()
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+    def handle_timeout(self) -> None:
+        if not self.command_lock.locked() and time.time() - self.last_command_time > self.idle_timeout:
+            logger.debug("Colony agent has been idle, exiting")
+            self.stopping = True
+
+    def get_status(self) -> dict:
+        return {
+            "pid": os.getpid(),
+            "uptime": int(time.time() - self.started),
+            "commands": self.commands_count,
+            "busy": self.command_lock.locked(),
+        }
+
+    def run_command(self, request: dict, conn: socket.socket) -> int:
+        self.commands_count += 1
+        stdout, stderr = sys.stdout, sys.stderr
+        cwd = os.getcwd()
+        environ = os.environ.copy()
+        watcher = _DisconnectWatcher(conn)
+        log_handler = logging.StreamHandler(_SocketStream(conn, "stderr", watcher.disconnected))
+        log_handler.setFormatter(logging.Formatter("%(levelname)s - %(message)s"))
+        root_logger = logging.getLogger()
+        root_logger.addHandler(log_handler)
+
+        sys.stdout = _SocketStream(conn, "stdout", watcher.disconnected)
+        sys.stderr = _SocketStream(conn, "stderr", watcher.disconnected)
+        try:
+            os.chdir(request.get("cwd") or cwd)
+            for name in [name for name in os.environ if name.startswith(FORWARDED_ENV_PREFIX)]:
+                del os.environ[name]
+            os.environ.update(request.get("env", {}))
+            with watcher:
+                return 0 if self.handler(request.get("argv", [])) else 1
+        except SystemExit as e:
+            if isinstance(e.code, str):
+                _write_error(f"{e.code}\n")
+                return 1
+            return e.code or 0
+        except OSError as e:
+            # the CLI has disconnected
+            logger.debug(f"Colony agent command failed. Details: {e}")
+            return 1
+        except Exception as e:
+            _write_error(f"{e}\n")
+            return 1
+        finally:
+            self.last_command_time = time.time()
+            sys.stdout, sys.stderr = stdout, stderr
+            root_logger.removeHandler(log_handler)
+            os.environ.clear()
+            os.environ.update(environ)
+            os.chdir(cwd)
+
+
+def start_agent_process(socket_path: str = None, idle_timeout: int = DEFAULT_IDLE_TIMEOUT) -> bool:
+    """Starts the agent in a detached process and waits until it accepts connections"""
+    socket_path = get_socket_path(socket_path)
+    args = [sys.executable, "-m", "colony.services.agent", f"--socket={socket_path}", f"--idle-timeout={idle_timeout}"]
+    with open(os.devnull, "r+") as devnull:
+        subprocess.Popen(args, stdin=devnull, stdout=devnull, stderr=devnull, close_fds=True, start_new_session=True)
+
+    client = AgentClient(socket_path)
+    deadline = time.time() + START_TIMEOUT
+    while time.time() < deadline:
+        if client.ping():
+            return True
+        time.sleep(0.1)
+    return False
+
+
+def _write_error(message: str) -> None:
+    try:
+        sys.stderr.write(message)
+    except OSError:
+        # the CLI has disconnected
+        pass
+
+
+def _encode(message: dict) -> bytes:
+    return (json.dumps(message) + "\n").encode("utf-8")
+
+
+def main() -> None:
+    args = docopt(__doc__)
+    idle_timeout = int(args["--idle-timeout"] or DEFAULT_IDLE_TIMEOUT)
+
+    # imported here since the shell itself imports this module to forward commands
+    from colony.shell import run_agent_command
+
+    server = AgentServer(get_socket_path(args["--socket"]), run_agent_command, idle_timeout)
+    server.serve_until_idle()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+import io
+import logging
+import shlex
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Iterable, Iterator, List
+
+import yaml
+from docopt import DocoptExit
+
+from colony.client import ColonyClient
+from colony.models.connection import ColonyConnection
+from colony.services.blueprint_index import load_yaml
+from colony.view.writers import JSON_OUTPUT, OutputWriter
+
+logger = logging.getLogger(__name__)
+
+# commands which stash local changes of the blueprint repo into a temp branch and restore them afterwards, so that
+# two of them never run at the same time on the same working tree
+REPO_COMMANDS = {("bp", "validate"), ("blueprint", "validate"), ("sb", "start"), ("sandbox", "start")}
+
+
+class BatchEntry(object):
+    def __init__(self, index: int, argv: List[str], entry_id: str = None, after: List[str] = None):
+        self.index = index
+        self.argv = argv
+        self.id = entry_id or str(index)
+        self.after = after or []
+
+    @property
+    def command_line(self) -> str:
+        return " ".join(shlex.quote(arg) for arg in self.argv)
+
+    @property
+    def uses_repo(self) -> bool:
+        return tuple(self.argv[:2]) in REPO_COMMANDS
+
+
+def parse_batch(text: str) -> List[BatchEntry]:
+    """Parses a batch of commands: one command per line or a YAML/JSON plan.
+
+    A plan is a list of commands (or a mapping with such list under 'commands'). Each of them is either a command
+    line or a mapping with 'command' (a command line or a list of arguments) and optional 'id' and 'after' (ids of
+    earlier commands which have to succeed before the command starts). Raises ValueError if the batch is invalid.
+    """
+    try:
+        plan = load_yaml(text)
+    except yaml.YAMLError:
+        plan = None
+
+    # anything else parsed as YAML, e.g. a command line with a colon in its arguments, is a list of lines
+    if isinstance(plan, dict) and "commands" in plan:
+        plan = plan["commands"]
+        if not isinstance(plan, list):
+            raise ValueError("Batch plan must contain a list of commands under 'commands'")
+    elif not isinstance(plan, list):
+        lines = (line.strip() for line in text.splitlines())
+        plan = [line for line in lines if line and not line.startswith("#")]
+
+    entries = []
+    for index, item in enumerate(plan, 1):
+        if not isinstance(item, dict):
+            item = {"command": item}
+
+        command = item.get("command")
+        argv = shlex.split(command) if isinstance(command, str) else [str(arg) for arg in command or []]
+        if argv and argv[0] == "colony":
+            argv = argv[1:]
+        if not argv:
+            raise ValueError(f"Command #{index} is empty")
+
+        after = item.get("after") or []
+        after = [str(entry_id) for entry_id in (after if isinstance(after, list) else [after])]
+        entry_id = str(item["id"]) if item.get("id") is not None else None
+        entries.append(BatchEntry(index, argv, entry_id, after))
+
+    known_ids = set()
+    for entry in entries:
+        unknown = [entry_id for entry_id in entry.after if entry_id not in known_ids]
+        if unknown:
+            raise ValueError(f"Command '{entry.id}' must come after commands {', '.join(unknown)} it depends on")
+        if entry.id in known_ids:
+            raise ValueError(f"Command id '{entry.id}' is used more than once")
+        known_ids.add(entry.id)
+
+    return entries
+
+
+class RecordsCollector(OutputWriter):
+    """Machine readable writer which keeps the records of a command instead of writing them"""
+
+    def __init__(self):
+        super(RecordsCollector, self).__init__()
+        self.records = []
+
+    def write_records(self, records) -> None:
+        self.records.extend(records)
+
+
+class _ThreadOutput(object):
+    """Stream which writes to the buffer of the current thread, or to the original stream outside of commands"""
+
+    def __init__(self, stream):
+        self.original = stream
+        self._local = threading.local()
+
+    def set_buffer(self, buffer) -> None:
+        self._local.buffer = buffer
+
+    def write(self, data: str) -> int:
+        return (getattr(self._local, "buffer", None) or self.original).write(data)
+
+    def flush(self) -> None:
+        (getattr(self._local, "buffer", None) or self.original).flush()
+
+    def isatty(self) -> bool:
+        return False
+
+    def __getattr__(self, name):
+        return getattr(self.original, name)
+
+
+class BatchRunner(object):
+    """Runs batch commands in this process with a shared connection and client.
+
+    Up to `parallel` commands run at the same time in worker threads, except for commands using the blueprint repo
+    which run one at a time. A command starts once the commands it depends on have succeeded and is skipped if one of
+    them has failed. Output of every command is captured and returned
+    in its result record, so results of concurrent commands never interleave.
+    """
+
+    def __init__(
+        self,
+        commands: dict,
+        connection: ColonyConnection,
+        client: ColonyClient,
+        parallel: int = 1,
+        fail_fast: bool = False,
+    ):
+        self.commands = commands
+        self.connection = connection
+        self.client = client
+        self.parallel = parallel
+        self.fail_fast = fail_fast
+
+    def run(self, entries: List[BatchEntry]) -> Iterator[dict]:
+        """Yields result records of the commands in the order they complete"""
+        stdout, stderr = _ThreadOutput(sys.stdout), _ThreadOutput(sys.stderr)
+        handlers = [
+            handler
+            for handler in logging.getLogger().handlers
+            if isinstance(handler, logging.StreamHandler) and handler.stream in (sys.stdout, sys.stderr)
+        ]
+        handler_streams = [handler.stream for handler in handlers]
+
+        sys.stdout, sys.stderr = stdout, stderr
+        for handler in handlers:
+            handler.stream = stderr if handler.stream is stderr.original else stdout
+        try:
+            yield from self._schedule(entries, stdout, stderr)
+        finally:
+            sys.stdout, sys.stderr = stdout.original, stderr.original
+            for handler, stream in zip(handlers, handler_streams):
+                handler.stream = stream
+
+    def _schedule(self, entries: List[BatchEntry], stdout: _ThreadOutput, stderr: _ThreadOutput) -> Iterator[dict]:
+        pending = list(entries)
+        succeeded = set()
+        failed = set()
+        running = {}
+        stopped = False
+
+        with ThreadPoolExecutor(max_workers=self.parallel) as executor:
+            while pending or running:
+                for entry in list(pending):
+                    if stopped or any(entry_id in failed for entry_id in entry.after):
+                        pending.remove(entry)
+                        failed.add(entry.id)
+                        yield self._get_skipped_record(entry, stopped)
+                    elif self._can_start(entry, running.values(), succeeded):
+                        pending.remove(entry)
+                        running[executor.submit(self._run_entry, entry, stdout, stderr)] = entry
+
+                if not running:
+                    continue
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=lambda item: running[item].index):
+                    entry = running.pop(future)
+                    record = future.result()
+                    (succeeded if record["ok"] else failed).add(entry.id)
+                    stopped = stopped or (self.fail_fast and not record["ok"])
+                    yield record
+
+    def _can_start(self, entry: BatchEntry, running: Iterable[BatchEntry], succeeded: set) -> bool:
+        running = list(running)
+        if len(running) >= self.parallel or not all(entry_id in succeeded for entry_id in entry.after):
+            return False
+        return not entry.uses_repo or not any(other.uses_repo for other in running)
+
+    def _run_entry(self, entry: BatchEntry, stdout: _ThreadOutput, stderr: _ThreadOutput) -> dict:
+        output = RecordsCollector()
+        messages = io.StringIO()
+        stdout.set_buffer(messages)
+        stderr.set_buffer(messages)
+        start = time.perf_counter()
+        try:
+            exit_code = self._execute(entry.argv, output)
+        finally:
+            stdout.set_buffer(None)
+            stderr.set_buffer(None)
+
+        return self._get_record(
+            entry,
+            exit_code,
+            duration=round(time.perf_counter() - start, 3),
+            records=output.records,
+            messages=messages.getvalue().strip(),
+        )
+
+    def _execute(self, argv: List[str], output: OutputWriter) -> int:
+        command_class = self.commands.get(argv[0])
+        if command_class is None:
+            sys.stderr.write(f"Unknown command '{argv[0]}'\n")
+            return 1
+
+        try:
+            command = command_class(argv, self.connection, JSON_OUTPUT, client=self.client)
+            command.output = output
+            return 0 if command.execute() else 1
+        except DocoptExit as e:
+            sys.stderr.write(f"{e}\n")
+            return 1
+        except SystemExit as e:
+            return e.code if isinstance(e.code, int) else 1
+        except Exception as e:
+            logger.exception(e, exc_info=False)
+            return 1
+
+    @staticmethod
+    def _get_record(entry: BatchEntry, exit_code: int, **details) -> dict:
+        record = OrderedDict(
+            [
+                ("index", entry.index),
+                ("id", entry.id),
+                ("command", entry.command_line),
+                ("ok", exit_code == 0),
+                ("exit_code", exit_code),
+            ]
+        )
+        record.update(details)
+        return record
+
+    def _get_skipped_record(self, entry: BatchEntry, stopped: bool) -> dict:
+        reason = "a previous command has failed" if stopped else "a command it depends on has failed"
+        return self._get_record(entry, 1, skipped=True, messages=f"Skipped, since {reason}")
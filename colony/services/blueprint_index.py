@@ -0,0 +1,304 @@
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable
+
+import yaml
+
+try:
+    from yaml import CFullLoader as YamlLoader
+except ImportError:
+    # PyYAML is built without libyaml
+    from yaml import FullLoader as YamlLoader
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+# below this number of blueprints starting worker processes costs more than parsing them in place
+PARALLEL_PARSE_THRESHOLD = 32
+# directories modified less than this number of seconds before the scan are not trusted, since they can be changed
+# again within the same timestamp granularity
+RACY_INTERVAL = 2
+
+
+class BlueprintIndex(object):
+    """Persistent index of repo blueprints and their metadata.
+
+    The list of blueprints is rescanned only when the modification time of one of the blueprints directories
+    changes. Metadata of a blueprint is parsed from its YAML file once and reused while the file modification time,
+    size and the HEAD commit stay the same. Metadata parsed one blueprint at a time is saved by save(), so that the
+    index file is written once however many blueprints are parsed.
+    """
+
+    def __init__(self, index_path: str, work_dir: str, bp_dir: str, extensions: list, head: str = None):
+        self.index_path = index_path
+        self.work_dir = work_dir
+        self.bp_dir = bp_dir
+        self.extensions = extensions
+        self.head = head
+        self._dirs = {}
+        self._entries = {}
+        self._dirty = False
+
+    def load(self) -> dict:
+        """Returns absolute paths of blueprint files by blueprint names"""
+        index = self._read_file()
+        self._dirs = index.get("dirs", {})
+        self._entries = index.get("blueprints", {})
+        return self._refresh(index.get("head"))
+
+    def reload(self, head: str = None) -> dict:
+        """Returns blueprint paths again after the repo may have changed, keeping metadata parsed since load()"""
+        indexed_head, self.head = self.head, head
+        return self._refresh(indexed_head)
+
+    def _refresh(self, indexed_head: str) -> dict:
+        if indexed_head != self.head:
+            for entry in self._entries.values():
+                entry.pop("meta", None)
+            self._dirty = True
+
+        if not self._dirs or not self._are_dirs_unchanged():
+            self._scan()
+
+        self.save()
+        return {name: os.path.join(self.work_dir, entry["path"]) for name, entry in self._entries.items()}
+
+    def get_metadata(self, blueprint_name: str) -> dict:
+        """Returns metadata of the blueprint. Raises yaml.YAMLError if the blueprint is not a valid YAML"""
+        entry = self._entries[blueprint_name]
+        path = os.path.join(self.work_dir, entry["path"])
+        stat = _get_file_stat(path)
+
+        if "meta" not in entry or entry.get("stat") != stat:
+            with open(path) as bp_file:
+                yaml_obj = load_yaml(bp_file)
+            entry["meta"] = extract_metadata(yaml_obj)
+            entry["stat"] = stat
+            self._dirty = True
+
+        return entry["meta"]
+
+    def load_metadata(self, blueprint_names: Iterable[str] = None, max_workers: int = None) -> Dict[str, dict]:
+        """Returns metadata of many blueprints at once.
+
+        Blueprints which have changed since they were indexed are parsed in a pool of max_workers processes (one per
+        CPU by default). Workers send back only the metadata instead of whole documents. Blueprints which can't be
+        parsed are left out of the result.
+        """
+        names = list(self._entries) if blueprint_names is None else list(blueprint_names)
+        stale = []
+        for name in names:
+            entry = self._entries[name]
+            path = os.path.join(self.work_dir, entry["path"])
+            if "meta" not in entry or entry.get("stat") != _get_file_stat(path):
+                stale.append(name)
+
+        if stale:
+            logger.debug(f"Parsing {len(stale)} blueprints")
+            paths = [os.path.join(self.work_dir, self._entries[name]["path"]) for name in stale]
+            for name, (stat, metadata, error) in zip(stale, _parse_blueprint_files(paths, max_workers)):
+                if error:
+                    logger.debug(f"Unable to parse blueprint '{name}'. Details: {error}")
+                    continue
+                self._entries[name].update(meta=metadata, stat=stat)
+            self._dirty = True
+            self.save()
+
+        return {name: self._entries[name]["meta"] for name in names if "meta" in self._entries[name]}
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+
+        index = {"version": INDEX_VERSION, "head": self.head, "dirs": self._dirs, "blueprints": self._entries}
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as index_file:
+                json.dump(index, index_file, default=str)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.debug(f"Unable to save blueprint index to {self.index_path}. Details: {e}")
+            return
+
+        self._dirty = False
+
+    def _are_dirs_unchanged(self) -> bool:
+        for rel_path, mtime in self._dirs.items():
+            if mtime is None:
+                return False
+            try:
+                if os.stat(os.path.join(self.work_dir, rel_path)).st_mtime_ns != mtime:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def _scan(self) -> None:
+        logger.debug(f"Scanning '{self.bp_dir}' directory for blueprints")
+        scan_time = time.time_ns()
+        dirs = {}
+        entries = {}
+
+        for current_path, sub_dirs, file_names in os.walk(os.path.join(self.work_dir, self.bp_dir)):
+            sub_dirs.sort()
+            mtime = os.stat(current_path).st_mtime_ns
+            dirs[_relpath(current_path, self.work_dir)] = mtime if scan_time - mtime > RACY_INTERVAL * 10**9 else None
+
+            for file_name in sorted(file_names):
+                blueprint, extension = os.path.splitext(file_name)
+                if extension not in self.extensions:
+                    continue
+
+                path = _relpath(os.path.join(current_path, file_name), self.work_dir)
+                if blueprint in entries:
+                    logger.debug(f"Blueprint '{blueprint}' is defined more than once, '{path}' is ignored")
+                    continue
+
+                entry = self._entries.get(blueprint)
+                entries[blueprint] = entry if entry and entry["path"] == path else {"path": path}
+
+        self._dirs = dirs
+        self._entries = entries
+        self._dirty = True
+
+    def _read_file(self) -> dict:
+        try:
+            with open(self.index_path) as index_file:
+                index = json.load(index_file)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(index, dict) or index.get("version") != INDEX_VERSION:
+            return {}
+        return index
+
+
+class BlobMetadataCache(object):
+    """Metadata of blueprint files stored in git objects keyed by blob SHA.
+
+    Content of a blob never changes, so entries never get stale. The oldest ones are dropped when there are more
+    than MAX_ENTRIES of them.
+    """
+
+    MAX_ENTRIES = 1000
+
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        self._entries = None
+        self._dirty = False
+
+    def get(self, blob_sha: str) -> dict:
+        return self._get_entries().get(blob_sha)
+
+    def set(self, blob_sha: str, metadata: dict) -> None:
+        entries = self._get_entries()
+        entries[blob_sha] = metadata
+        while len(entries) > self.MAX_ENTRIES:
+            entries.pop(next(iter(entries)))
+        self._dirty = True
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as cache_file:
+                json.dump(self._get_entries(), cache_file, default=str)
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.debug(f"Unable to save blueprint metadata cache to {self.cache_path}. Details: {e}")
+            return
+
+        self._dirty = False
+
+    def _get_entries(self) -> dict:
+        if self._entries is None:
+            try:
+                with open(self.cache_path) as cache_file:
+                    entries = json.load(cache_file)
+            except (OSError, ValueError):
+                entries = {}
+            self._entries = entries if isinstance(entries, dict) else {}
+        return self._entries
+
+
+def load_yaml(stream):
+    """Parses YAML like yaml.full_load does, but with the libyaml based loader when it is available"""
+    return yaml.load(stream, Loader=YamlLoader)
+
+
+def parse_blueprint_file(path: str) -> tuple:
+    """Returns (stat, metadata, error) of the blueprint file. It is run in worker processes, so it never raises"""
+    try:
+        stat = _get_file_stat(path)
+        with open(path) as bp_file:
+            return stat, extract_metadata(load_yaml(bp_file)), None
+    except Exception as e:
+        return None, None, str(e)
+
+
+def _parse_blueprint_files(paths: list, max_workers: int = None) -> list:
+    if len(paths) < PARALLEL_PARSE_THRESHOLD or max_workers == 1:
+        return [parse_blueprint_file(path) for path in paths]
+
+    workers = max_workers or os.cpu_count() or 1
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(parse_blueprint_file, paths, chunksize=max(1, len(paths) // (workers * 4))))
+    except (OSError, BrokenProcessPool) as e:
+        logger.debug(f"Unable to parse blueprints in worker processes, parsing them in place. Details: {e}")
+        return [parse_blueprint_file(path) for path in paths]
+
+
+def extract_metadata(yaml_obj) -> dict:
+    """Metadata of a blueprint which the CLI needs without parsing its YAML"""
+    yaml_obj = yaml_obj if isinstance(yaml_obj, dict) else {}
+    clouds = _get_entries(yaml_obj.get("clouds"))
+    services = _get_entries(yaml_obj.get("services"))
+    inputs = _get_entries(yaml_obj.get("inputs"))
+    artifacts = _get_entries(yaml_obj.get("artifacts"))
+
+    return {
+        "clouds": list(clouds),
+        "applications": list(_get_entries(yaml_obj.get("applications"))),
+        "services": list(services),
+        "is_k8s": any("/" in cloud for cloud in clouds),
+        "is_tf": bool(services),
+        "inputs": list(inputs),
+        "default_inputs": {
+            name: specs.get("default_value") if isinstance(specs, dict) else specs
+            for name, specs in inputs.items()
+            if specs is not None
+        },
+        "artifacts": {name: path for name, path in artifacts.items() if path},
+    }
+
+
+def _get_entries(entries) -> dict:
+    """Flattens a blueprint section which is a list of plain names or single key mappings into a dict"""
+    result = {}
+    if not isinstance(entries, list):
+        return result
+
+    for entry in entries:
+        if isinstance(entry, dict):
+            result.update((str(name), value) for name, value in entry.items())
+        elif isinstance(entry, str):
+            result[entry] = None
+    return result
+
+
+def _get_file_stat(path: str) -> list:
+    stat = os.stat(path)
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _relpath(path: str, start: str) -> str:
+    return os.path.relpath(path, start).replace(os.sep, "/")
@@ -0,0 +1,17 @@
+import threading
+
+# set when the running command has to stop, e.g. when the CLI which sent it to the agent has gone away
+_cancelled = threading.Event()
+
+
+def cancel() -> None:
+    """Asks the running command to stop. Long waits check it between polls and stop where it is safe to stop"""
+    _cancelled.set()
+
+
+def reset() -> None:
+    _cancelled.clear()
+
+
+def is_cancelled() -> bool:
+    return _cancelled.is_set()
@@ -0,0 +1,197 @@
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import timedelta
+from urllib.parse import urlparse
+
+from requests import PreparedRequest, Response
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from colony.exceptions import CassetteError
+
+RECORD_MODE = "record"
+REPLAY_MODE = "replay"
+CASSETTE_MODES = (RECORD_MODE, REPLAY_MODE)
+
+CASSETTE_VERSION = 1
+SCRUBBED_VALUE = "***"
+# values of these JSON keys (credentials and tokens) are never written to a cassette
+SCRUBBED_KEYS = {"password", "token", "access_token", "refresh_token"}
+# request headers are not recorded at all, these response headers are dropped
+SCRUBBED_HEADERS = {"set-cookie", "authorization"}
+
+
+class Cassette(object):
+    """Recorded API interactions stored in a JSON file.
+
+    Each interaction holds the request method, path and body, the response status, headers and body, and how long
+    the request took. Requests are matched by method and path (with query) only, since hosts differ between accounts.
+    Repeated requests to the same path (e.g. polling a sandbox status) are served in the recorded order, and the last
+    recorded response is served once they run out.
+
+    Recorded interactions are kept in memory and written to the file by save(), which the recording adapter calls
+    when its session is closed or the process exits.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.interactions = []
+        self._served = {}
+        self._unsaved = False
+        self._lock = threading.Lock()
+
+    def load(self) -> "Cassette":
+        try:
+            with open(self.path) as cassette_file:
+                data = json.load(cassette_file)
+        except (OSError, ValueError) as e:
+            raise CassetteError(f"Unable to read cassette {self.path}. Details: {e}")
+
+        if not isinstance(data, dict) or data.get("version") != CASSETTE_VERSION:
+            raise CassetteError(f"Unsupported cassette format in {self.path}")
+        self.interactions = data.get("interactions", [])
+        return self
+
+    def save(self) -> None:
+        """Writes the interactions to the file unless they have not changed since the last save"""
+        with self._lock:
+            if not self._unsaved:
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as cassette_file:
+                json.dump({"version": CASSETTE_VERSION, "interactions": self.interactions}, cassette_file, indent=2)
+            os.replace(tmp_path, self.path)
+            self._unsaved = False
+
+    def append(self, request: PreparedRequest, response: Response, duration: float) -> None:
+        interaction = {
+            "request": {
+                "method": request.method,
+                "path": _get_path(request.url),
+                "body": _scrub_body(request.body),
+            },
+            "response": {
+                "status": response.status_code,
+                "reason": response.reason,
+                "headers": {
+                    name: value for name, value in response.headers.items() if name.lower() not in SCRUBBED_HEADERS
+                },
+                "body": _scrub_body(response.content),
+            },
+            "duration": round(duration, 6),
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+            self._unsaved = True
+
+    def find(self, request: PreparedRequest) -> dict:
+        """Returns the next interaction recorded for the request"""
+        key = (request.method, _get_path(request.url))
+        with self._lock:
+            matches = [
+                interaction
+                for interaction in self.interactions
+                if (interaction["request"]["method"], interaction["request"]["path"]) == key
+            ]
+            if not matches:
+                raise CassetteError(f"No recorded response for {key[0]} {key[1]} in cassette {self.path}")
+
+            index = self._served.get(key, 0)
+            self._served[key] = index + 1
+            return matches[min(index, len(matches) - 1)]
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Sends requests to the network and records them with their responses into the cassette"""
+
+    def __init__(self, cassette: Cassette, **kwargs):
+        super(RecordingAdapter, self).__init__(**kwargs)
+        self.cassette = cassette
+        # sessions which are never closed still get their interactions written
+        atexit.register(cassette.save)
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        start = time.perf_counter()
+        response = super(RecordingAdapter, self).send(request, **kwargs)
+        self.cassette.append(request, response, time.perf_counter() - start)
+        return response
+
+    def close(self) -> None:
+        super(RecordingAdapter, self).close()
+        self.cassette.save()
+
+
+class ReplayAdapter(BaseAdapter):
+    """Serves responses from the cassette without network access.
+
+    Every response is delayed by its recorded duration multiplied by latency_scale (0 replays without delays).
+    """
+
+    def __init__(self, cassette: Cassette, latency_scale: float = 1.0):
+        super(ReplayAdapter, self).__init__()
+        self.cassette = cassette
+        self.latency_scale = latency_scale
+
+    def send(self, request: PreparedRequest, **kwargs) -> Response:
+        interaction = self.cassette.find(request)
+        delay = interaction.get("duration", 0) * self.latency_scale
+        if delay > 0:
+            time.sleep(delay)
+
+        recorded = interaction["response"]
+        response = Response()
+        response.status_code = recorded["status"]
+        response.reason = recorded.get("reason")
+        response.headers = CaseInsensitiveDict(recorded.get("headers", {}))
+        response._content = _encode_body(recorded.get("body"))
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.elapsed = timedelta(seconds=delay)
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+def _get_path(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.path}?{parsed.query}" if parsed.query else parsed.path
+
+
+def _scrub_body(body):
+    """Returns the body as a JSON value (or text) with credentials replaced"""
+    if not body:
+        return None
+    if isinstance(body, bytes):
+        try:
+            body = body.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+    try:
+        return {"json": _scrub_json(json.loads(body))}
+    except ValueError:
+        return {"text": body}
+
+
+def _scrub_json(value):
+    if isinstance(value, dict):
+        return {
+            key: SCRUBBED_VALUE if key.lower() in SCRUBBED_KEYS else _scrub_json(item) for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [_scrub_json(item) for item in value]
+    return value
+
+
+def _encode_body(body) -> bytes:
+    if not body:
+        return b""
+    if "json" in body:
+        return json.dumps(body["json"]).encode("utf-8")
+    return body.get("text", "").encode("utf-8")
@@ -0,0 +1,156 @@
+import json
+import logging
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+from colony.exceptions import CircuitOpenError
+from colony.services.file_lock import locked_file, overwrite
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+DEFAULT_FAILURE_THRESHOLD = 5
+# seconds the circuit stays open before a single request probes whether the API is back
+DEFAULT_RESET_TIMEOUT = 30
+# seconds over which the share of requests let through grows back to all of them once the probe has succeeded
+DEFAULT_RECOVERY_PERIOD = 60
+MIN_RECOVERY_SHARE = 0.1
+# how long requests held back during recovery are asked to wait before trying again
+RECOVERY_RETRY_AFTER = 1
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker(object):
+    """Stops sending requests to an API which keeps failing.
+
+    After failure_threshold consecutive failed requests (no response or a 5xx status) the circuit opens and requests
+    fail fast with CircuitOpenError for reset_timeout seconds. Then one request is let through as a probe while the
+    others keep failing fast. When the probe succeeds the circuit closes, and the share of requests let through grows
+    from MIN_RECOVERY_SHARE to all of them over recovery_period seconds, so that waiting clients do not all come back
+    at once. A failure during recovery or of the probe opens the circuit again.
+
+    With a path the state is kept in that file and shared by all processes using it, otherwise by the threads of the
+    process only.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        path: str = None,
+        failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+        reset_timeout: float = DEFAULT_RESET_TIMEOUT,
+        recovery_period: float = DEFAULT_RECOVERY_PERIOD,
+    ):
+        self.name = name
+        self.path = os.path.expanduser(path) if path else None
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.recovery_period = recovery_period
+        self._lock = threading.Lock()
+        self._circuit = {}
+
+    @property
+    def state(self) -> str:
+        with self._get_circuit() as circuit:
+            return circuit.get("state", CLOSED)
+
+    def before_request(self) -> None:
+        """Raises CircuitOpenError unless the request may be sent"""
+        now = time.time()
+        with self._get_circuit() as circuit:
+            state = circuit.get("state", CLOSED)
+            if state == OPEN:
+                retry_after = circuit["opened_at"] + self.reset_timeout - now
+                if retry_after > 0:
+                    raise CircuitOpenError(
+                        f"Colony API is unavailable after {circuit['failures']} failed requests, "
+                        f"requests are paused for {int(retry_after) + 1} seconds",
+                        retry_after,
+                    )
+                circuit.update(state=HALF_OPEN, probe_started=now)
+                logger.debug(f"Probing whether {self.name} is available again")
+            elif state == HALF_OPEN:
+                # the probe is given as much time as the circuit has been open before another request may probe
+                retry_after = circuit["probe_started"] + self.reset_timeout - now
+                if retry_after > 0:
+                    raise CircuitOpenError("Colony API is unavailable, waiting for a probe request", retry_after)
+                circuit["probe_started"] = now
+            elif self._get_recovery_share(circuit, now) < random.random():
+                raise CircuitOpenError("Colony API is recovering from an outage, try again", RECOVERY_RETRY_AFTER)
+
+    def record_success(self) -> None:
+        with self._get_circuit() as circuit:
+            state = circuit.get("state", CLOSED)
+            if state == HALF_OPEN:
+                logger.debug(f"{self.name} is available again")
+                circuit.clear()
+                circuit.update(state=CLOSED, recovery_started=time.time())
+            elif state == CLOSED:
+                circuit["failures"] = 0
+
+    def record_failure(self) -> None:
+        now = time.time()
+        with self._get_circuit() as circuit:
+            state = circuit.get("state", CLOSED)
+            if state == OPEN:
+                return
+
+            failures = circuit.get("failures", 0) + 1
+            recovering = self._get_recovery_share(circuit, now) < 1
+            if state == HALF_OPEN or recovering or failures >= self.failure_threshold:
+                logger.debug(f"Requests to {self.name} are paused after {failures} failures")
+                circuit.clear()
+                circuit.update(state=OPEN, opened_at=now)
+            circuit["failures"] = failures
+
+    def _get_recovery_share(self, circuit: dict, now: float) -> float:
+        recovery_started = circuit.get("recovery_started")
+        if not recovery_started or not self.recovery_period:
+            return 1
+        share = (now - recovery_started) / self.recovery_period
+        return 1 if share >= 1 else max(share, MIN_RECOVERY_SHARE)
+
+    @contextmanager
+    def _get_circuit(self):
+        """Yields the state of the circuit, which is saved when the context exits"""
+        with self._lock:
+            if not self.path:
+                yield self._circuit
+                return
+
+            yielded = False
+            try:
+                with locked_file(self.path) as state_file:
+                    try:
+                        circuits = json.loads(state_file.read() or "{}")
+                    except ValueError:
+                        circuits = {}
+                    circuit = dict(circuits.get(self.name) or {})
+                    yielded = True
+                    yield circuit
+                    if circuit != circuits.get(self.name):
+                        circuits[self.name] = circuit
+                        overwrite(state_file, json.dumps(circuits))
+            except OSError as e:
+                # fall back to the state of this process rather than failing requests
+                logger.debug(f"Unable to use circuit breaker state file {self.path}. Details: {e}")
+                if not yielded:
+                    yield self._circuit
+
+
+# circuit breakers by API host and state file, shared by all clients of the process
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(host: str, path: str = None) -> CircuitBreaker:
+    with _breakers_lock:
+        breaker = _breakers.get((host, path))
+        if breaker is None:
+            breaker = _breakers[(host, path)] = CircuitBreaker(host, path)
+        return breaker
@@ -7,6 +7,7 @@ from colony.exceptions import ConfigError
 from colony.models.connection import ColonyConnection
 from colony.parsers.global_input_parser import GlobalInputParser
 from colony.services.config import ColonyConfigProvider
+from colony.services.timings import span
 
 logger = logging.getLogger(__name__)
 
@@ -28,7 +29,8 @@ class ColonyConnectionProvider:
             config_file = self._args_parser.get_config_path()
             logger.debug("Trying to obtain unset values from configuration file")
             try:
-                colony_conn = ColonyConfigProvider(config_file).load_connection(profile)
+                with span("load config"):
+                    colony_conn = ColonyConfigProvider(config_file).load_connection(profile)
                 token = token or colony_conn[ColonyConfigKeys.TOKEN]
                 space = space or colony_conn[ColonyConfigKeys.SPACE]
                 if ColonyConfigKeys.ACCOUNT in colony_conn:
@@ -0,0 +1,49 @@
+import os
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:
+    # not available on Windows, where files are locked with msvcrt
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def locked_file(path: str):
+    """Opens the file for reading and writing, creating it readable only by the user, and locks it exclusively.
+
+    Other processes opening the file with locked_file wait until the lock is released on exit from the context.
+    """
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+    with os.fdopen(fd, "r+") as state_file:
+        _lock(state_file)
+        try:
+            yield state_file
+        finally:
+            _unlock(state_file)
+
+
+def overwrite(state_file, content: str) -> None:
+    state_file.seek(0)
+    state_file.truncate()
+    state_file.write(content)
+    state_file.flush()
+
+
+def _lock(state_file) -> None:
+    if fcntl:
+        fcntl.flock(state_file.fileno(), fcntl.LOCK_EX)
+    else:
+        state_file.seek(0)
+        msvcrt.locking(state_file.fileno(), msvcrt.LK_LOCK, 1)
+        state_file.seek(0)
+
+
+def _unlock(state_file) -> None:
+    if fcntl:
+        fcntl.flock(state_file.fileno(), fcntl.LOCK_UN)
+    else:
+        state_file.seek(0)
+        msvcrt.locking(state_file.fileno(), msvcrt.LK_UNLCK, 1)
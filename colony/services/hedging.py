@@ -0,0 +1,127 @@
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures import wait
+from typing import Callable, Tuple
+
+from requests import Response
+
+from colony.services.metrics import Histogram
+from colony.services.rate_limiter import RateLimiter
+
+# delay before the hedged request while too few requests of the endpoint have been seen to know its latency
+DEFAULT_DELAY = 1.0
+MIN_DELAY = 0.05
+MIN_SAMPLES = 20
+# hedged requests may add at most this share of requests on top of a few allowed at any time
+DEFAULT_BUDGET_RATIO = 0.1
+DEFAULT_BUDGET_BURST = 3
+
+
+class HedgeBudget(object):
+    """Caps the extra load of hedged requests to a share of all requests which could be hedged"""
+
+    def __init__(self, ratio: float = DEFAULT_BUDGET_RATIO, burst: int = DEFAULT_BUDGET_BURST):
+        self.ratio = ratio
+        self.burst = burst
+        self.requests = 0
+        self.hedges = 0
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self.hedges >= self.burst + self.ratio * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    def refund(self) -> None:
+        """Gives back a hedge which has been spent but not sent"""
+        with self._lock:
+            self.hedges -= 1
+
+
+# shared by all clients of the process, so the cap holds however many clients hedge
+budget = HedgeBudget()
+
+
+class HedgePolicy(object):
+    """Sends a duplicate of a slow request and takes whichever response comes first.
+
+    The duplicate is sent when the request has not completed within the given quantile of latency observed for its
+    endpoint, and only while the hedge budget allows it. The pooled session sends it over another connection. A
+    request in progress cannot be interrupted, so the response which comes second is closed as soon as it arrives.
+    With a rate limiter the duplicate takes a token too, and is not sent when no token is available right away.
+    Only idempotent requests must be hedged.
+    """
+
+    def __init__(
+        self,
+        quantile: float = 0.95,
+        default_delay: float = DEFAULT_DELAY,
+        min_delay: float = MIN_DELAY,
+        hedge_budget: HedgeBudget = None,
+    ):
+        self.quantile = quantile
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.budget = hedge_budget or budget
+
+    def get_delay(self, latency: Histogram = None) -> float:
+        if latency is None or latency.count < MIN_SAMPLES:
+            return self.default_delay
+        return max(latency.quantile(self.quantile), self.min_delay)
+
+    def send(
+        self, send_request: Callable[[], Response], latency: Histogram = None, rate_limiter: RateLimiter = None
+    ) -> Tuple[Response, bool]:
+        """Returns the first response and whether the request has been hedged"""
+        self.budget.record_request()
+        primary = _start(send_request)
+        try:
+            return primary.result(timeout=self.get_delay(latency)), False
+        except FutureTimeoutError:
+            pass
+
+        if not self.budget.try_spend():
+            return primary.result(), False
+        if rate_limiter and not rate_limiter.try_acquire():
+            # the budget is taken first, since a rate limit token taken for nothing would delay other requests
+            self.budget.refund()
+            return primary.result(), False
+
+        attempts = [primary, _start(send_request)]
+        done, _ = wait(attempts, return_when=FIRST_COMPLETED)
+        winner = next(attempt for attempt in attempts if attempt in done)
+        if winner.exception() is not None:
+            # the other attempt may still succeed
+            winner = next(attempt for attempt in attempts if attempt is not winner)
+            wait([winner])
+
+        for attempt in attempts:
+            if attempt is not winner:
+                attempt.add_done_callback(_discard)
+        return winner.result(), True
+
+
+def _start(send_request: Callable[[], Response]) -> Future:
+    """Sends the request in a daemon thread, so that a request which never completes does not hold up the exit"""
+    future = Future()
+
+    def run() -> None:
+        try:
+            future.set_result(send_request())
+        except Exception as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="colony-hedged-request", daemon=True).start()
+    return future
+
+
+def _discard(attempt: Future) -> None:
+    if attempt.exception() is None:
+        attempt.result().close()
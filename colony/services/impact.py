@@ -0,0 +1,62 @@
+import logging
+import os
+from collections import defaultdict
+from typing import Iterable, List
+
+from colony.utils import BlueprintRepo
+
+logger = logging.getLogger(__name__)
+
+
+class BlueprintImpactIndex(object):
+    """Maps repo files to blueprints which depend on them.
+
+    Every blueprint depends on its own file and on folders of applications and services it uses. Artifacts are kept
+    in the index for reference only, since they live in the artifact repository rather than in the blueprint repo.
+    """
+
+    def __init__(self, repo: BlueprintRepo):
+        self.repo = repo
+        self.references = {}
+        # repo relative path of a blueprint file or of an application/service folder -> blueprints depending on it
+        self._dependents = defaultdict(set)
+        self._build()
+
+    def _build(self) -> None:
+        # parse all changed blueprints at once, so references below are taken from the index
+        self.repo.load_blueprints_metadata()
+        for blueprint in sorted(self.repo.blueprints):
+            bp_file = _to_posix(os.path.relpath(self.repo.blueprints[blueprint], self.repo.working_dir))
+            references = {"file": bp_file, "applications": [], "services": [], "artifacts": {}}
+            try:
+                references.update(self.repo.get_blueprint_references(blueprint))
+                references["artifacts"] = self.repo.get_blueprint_artifacts(blueprint)
+            except Exception as e:
+                # broken blueprint still depends on its own file, so that changing it is noticed
+                logger.debug(f"Unable to get references of blueprint {blueprint}. Details: {e}")
+
+            self.references[blueprint] = references
+            self._dependents[bp_file].add(blueprint)
+            for folder in (self.repo.apps_dir, self.repo.services_dir):
+                for name in references[folder]:
+                    self._dependents[f"{folder}/{name}"].add(blueprint)
+
+    def get_dependent_blueprints(self, path: str) -> set:
+        """Returns blueprints affected by a change of the file (repo relative path)"""
+        path = _to_posix(path)
+        dependents = set(self._dependents.get(path, ()))
+        parts = path.split("/")
+        if len(parts) > 2:
+            dependents.update(self._dependents.get("/".join(parts[:2]), ()))
+        return dependents
+
+    def get_affected_blueprints(self, paths: Iterable[str]) -> List[str]:
+        """Returns sorted names of blueprints affected by changes of the files"""
+        affected = set()
+        for path in paths:
+            affected.update(self.get_dependent_blueprints(path))
+        return sorted(affected)
+
+
+def _to_posix(path: str) -> str:
+    return path.replace(os.sep, "/")
@@ -0,0 +1,112 @@
+import os
+from typing import List
+
+import yaml
+
+from colony.utils import BlueprintRepo
+
+
+class BlueprintLinter(object):
+    """Offline checks of blueprint definitions.
+
+    Checks are made against the working tree of the repo without any network calls, so they only catch obvious
+    mistakes: malformed YAML and sections, and references to applications and services which don't exist in the
+    repo. Errors have the same shape as errors returned by Colony validation.
+    """
+
+    LIST_SECTIONS = ("clouds", "inputs", "artifacts", "applications", "services")
+
+    def __init__(self, repo: BlueprintRepo):
+        self.repo = repo
+
+    def lint(self, blueprint_name: str) -> List[dict]:
+        try:
+            yaml_obj = self.repo.get_blueprint_yaml(blueprint_name)
+        except yaml.YAMLError as e:
+            return [_error("Invalid YAML", f"Blueprint file is not a valid YAML document. Details: {e}")]
+
+        if not isinstance(yaml_obj, dict):
+            return [_error("Invalid blueprint structure", "Blueprint must be a mapping of sections")]
+
+        errors = []
+        for section in self.LIST_SECTIONS:
+            entries = yaml_obj.get(section)
+            if entries is not None and not isinstance(entries, list):
+                errors.append(_error("Invalid blueprint structure", f"'{section}' must be a list"))
+
+        if errors:
+            return errors
+
+        errors.extend(self._check_clouds(yaml_obj.get("clouds")))
+        errors.extend(self._check_inputs(yaml_obj.get("inputs") or []))
+        applications = self._get_names("applications", yaml_obj.get("applications") or [], errors)
+        services = self._get_names("services", yaml_obj.get("services") or [], errors)
+        errors.extend(self._check_artifacts(yaml_obj.get("artifacts") or [], applications))
+        errors.extend(self._check_folders_exist(self.repo.apps_dir, "application", applications))
+        errors.extend(self._check_folders_exist(self.repo.services_dir, "service", services))
+
+        return errors
+
+    def _check_clouds(self, clouds) -> List[dict]:
+        if not clouds:
+            return [_error("Missing clouds", "Blueprint must have at least one cloud in 'clouds' section")]
+
+        errors = []
+        for cloud in clouds:
+            if isinstance(cloud, str) and cloud:
+                continue
+            if isinstance(cloud, dict) and len(cloud) == 1 and all(isinstance(k, str) for k in cloud):
+                continue
+            errors.append(_error("Invalid cloud", f"Cloud entry '{cloud}' must be a name or a 'name: region' pair"))
+        return errors
+
+    def _check_inputs(self, inputs) -> List[dict]:
+        errors = []
+        names = self._get_names("inputs", inputs, errors)
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        for name in duplicates:
+            errors.append(_error("Duplicate input", f"Input '{name}' is declared more than once"))
+        return errors
+
+    def _check_artifacts(self, artifacts, applications: List[str]) -> List[dict]:
+        errors = []
+        for name in self._get_names("artifacts", artifacts, errors):
+            if name not in applications:
+                errors.append(
+                    _error("Unknown artifact", f"Artifact '{name}' doesn't match any application of the blueprint")
+                )
+
+        for artifact in artifacts:
+            if isinstance(artifact, dict):
+                for name, path in artifact.items():
+                    if path is not None and not isinstance(path, str):
+                        errors.append(_error("Invalid artifact", f"Path of artifact '{name}' must be a string"))
+        return errors
+
+    def _check_folders_exist(self, folder: str, kind: str, names: List[str]) -> List[dict]:
+        errors = []
+        for name in names:
+            if not os.path.isdir(os.path.join(self.repo.working_dir, folder, name)):
+                errors.append(
+                    _error(f"Unknown {kind}", f"The {kind} '{name}' is not found in '{folder}' folder of the repo")
+                )
+        return errors
+
+    @staticmethod
+    def _get_names(section: str, entries: list, errors: List[dict]) -> List[str]:
+        """Returns names of single key mapping (or plain string) entries of the section reporting wrong ones"""
+        names = []
+        for entry in entries:
+            if isinstance(entry, str):
+                names.append(entry)
+            elif isinstance(entry, dict) and len(entry) == 1:
+                names.append(str(next(iter(entry))))
+            else:
+                errors.append(
+                    _error("Invalid blueprint structure", f"Each of '{section}' entries must be a name or a mapping")
+                )
+        return names
+
+
+def _error(name: str, message: str) -> dict:
+    return {"name": name, "message": message}
@@ -0,0 +1,218 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, TextIO, Tuple
+
+# upper bounds (in seconds) of request latency histogram buckets
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# status recorded for requests which failed without a response (connection errors, timeouts)
+NO_RESPONSE = "error"
+
+
+class Histogram(object):
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        # the last counter is for values greater than all bucket bounds
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def cumulative_counts(self) -> list:
+        counts = []
+        total = 0
+        for count in self.counts:
+            total += count
+            counts.append(total)
+        return counts
+
+    def quantile(self, q: float) -> float:
+        """Estimates the quantile as the upper bound of the bucket it falls into"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bound, total in zip(self.buckets, self.cumulative_counts()):
+            if total >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class EndpointMetrics(object):
+    def __init__(self):
+        self.latency = Histogram()
+        self.statuses = {}
+        self.retries = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+
+    @property
+    def requests(self) -> int:
+        return self.latency.count
+
+    @property
+    def errors(self) -> int:
+        return sum(count for status, count in self.statuses.items() if status == NO_RESPONSE or int(status) >= 400)
+
+    def to_dict(self) -> dict:
+        return OrderedDict(
+            [
+                ("requests", self.requests),
+                ("errors", self.errors),
+                ("statuses", dict(self.statuses)),
+                ("retries", self.retries),
+                ("request_bytes", self.request_bytes),
+                ("response_bytes", self.response_bytes),
+                ("latency_sum_seconds", round(self.latency.sum, 6)),
+                ("latency_max_seconds", round(self.latency.max, 6)),
+                ("latency_p50_seconds", self.latency.quantile(0.5)),
+                ("latency_p95_seconds", self.latency.quantile(0.95)),
+                (
+                    "latency_buckets",
+                    OrderedDict(
+                        (str(bound), total)
+                        for bound, total in zip(self.latency.buckets + ("+Inf",), self.latency.cumulative_counts())
+                    ),
+                ),
+            ]
+        )
+
+
+class MetricsRegistry(object):
+    """Metrics of API requests per method and endpoint path template.
+
+    ColonyClient records every request into the registry it is created with (the module level `registry` by
+    default), so library users can inspect it with snapshot() after making calls.
+    """
+
+    def __init__(self):
+        self._endpoints = OrderedDict()
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        method: str,
+        endpoint: str,
+        status,
+        duration: float,
+        request_bytes: int = 0,
+        response_bytes: int = 0,
+        retries: int = 0,
+    ) -> None:
+        with self._lock:
+            metrics = self._endpoints.get((method, endpoint))
+            if metrics is None:
+                metrics = self._endpoints[(method, endpoint)] = EndpointMetrics()
+
+            metrics.latency.observe(duration)
+            status = str(status)
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+            metrics.retries += retries
+            metrics.request_bytes += request_bytes
+            metrics.response_bytes += response_bytes
+
+    def get(self, method: str, endpoint: str) -> EndpointMetrics:
+        return self._endpoints.get((method, endpoint))
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Returns metrics of every endpoint keyed by "<METHOD> <endpoint>" """
+        with self._lock:
+            return OrderedDict(
+                (f"{method} {endpoint}", metrics.to_dict()) for (method, endpoint), metrics in self._endpoints.items()
+            )
+
+    def write_summary(self, stream: TextIO) -> None:
+        with self._lock:
+            rows = [
+                (
+                    f"{method} {endpoint}",
+                    str(metrics.requests),
+                    str(metrics.errors),
+                    f"{metrics.latency.sum / metrics.requests:.3f}s",
+                    f"{metrics.latency.max:.3f}s",
+                    _format_bytes(metrics.response_bytes),
+                )
+                for (method, endpoint), metrics in self._endpoints.items()
+            ]
+        if not rows:
+            return
+
+        headers = ("Requests:", "Count", "Errors", "Avg", "Max", "Received")
+        widths = [max(len(row[i]) for row in rows + [headers]) for i in range(len(headers))]
+        for row in [headers] + rows:
+            cells = [row[0].ljust(widths[0])] + [cell.rjust(width) for cell, width in zip(row[1:], widths[1:])]
+            stream.write("  " + "  ".join(cells) + "\n")
+        stream.flush()
+
+    def write_prometheus(self, stream: TextIO) -> None:
+        """Writes metrics in Prometheus text exposition format"""
+        with self._lock:
+            endpoints = list(self._endpoints.items())
+
+        lines = [
+            "# HELP colony_http_requests_total Colony API requests by response status.",
+            "# TYPE colony_http_requests_total counter",
+        ]
+        for (method, endpoint), metrics in endpoints:
+            for status, count in metrics.statuses.items():
+                lines.append(f"colony_http_requests_total{_labels(method, endpoint, status=status)} {count}")
+
+        lines += [
+            "# HELP colony_http_request_duration_seconds Colony API request latency.",
+            "# TYPE colony_http_request_duration_seconds histogram",
+        ]
+        for (method, endpoint), metrics in endpoints:
+            histogram = metrics.latency
+            for bound, total in zip(histogram.buckets + ("+Inf",), histogram.cumulative_counts()):
+                lines.append(
+                    f"colony_http_request_duration_seconds_bucket{_labels(method, endpoint, le=bound)} {total}"
+                )
+            lines.append(f"colony_http_request_duration_seconds_sum{_labels(method, endpoint)} {histogram.sum}")
+            lines.append(f"colony_http_request_duration_seconds_count{_labels(method, endpoint)} {histogram.count}")
+
+        counters = [
+            ("colony_http_retries_total", "Colony API request retries.", "retries"),
+            ("colony_http_request_bytes_total", "Bytes sent in Colony API request bodies.", "request_bytes"),
+            ("colony_http_response_bytes_total", "Bytes received in Colony API response bodies.", "response_bytes"),
+        ]
+        for name, description, attribute in counters:
+            lines += [f"# HELP {name} {description}", f"# TYPE {name} counter"]
+            for (method, endpoint), metrics in endpoints:
+                lines.append(f"{name}{_labels(method, endpoint)} {getattr(metrics, attribute)}")
+
+        stream.write("\n".join(lines) + "\n")
+
+    def save_prometheus_textfile(self, path: str) -> None:
+        """Writes metrics to the file atomically, so that node exporter never reads a partially written file"""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w") as textfile:
+            self.write_prometheus(textfile)
+        os.replace(tmp_path, path)
+
+
+registry = MetricsRegistry()
+
+
+def _labels(method: str, endpoint: str, **extra) -> str:
+    labels = OrderedDict([("method", method), ("endpoint", endpoint)])
+    labels.update((key, str(value)) for key, value in extra.items())
+    escaped = (value.replace("\\", "\\\\").replace('"', '\\"') for value in labels.values())
+    return "{" + ",".join(f'{key}="{value}"' for key, value in zip(labels, escaped)) + "}"
+
+
+def _format_bytes(size: int) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}GiB"
@@ -0,0 +1,149 @@
+import cProfile
+import io
+import os
+import pstats
+import time
+import tracemalloc
+from typing import Dict, List, TextIO, Tuple
+
+CPU_PROFILER = "cpu"
+MEMORY_PROFILER = "mem"
+PROFILERS = (CPU_PROFILER, MEMORY_PROFILER)
+
+DEFAULT_TOP = 10
+# how many frames of a stack are kept by tracemalloc
+MEMORY_TRACEBACK_LIMIT = 25
+MAX_STACK_DEPTH = 64
+# stacks which took less time (in seconds) are not walked into, so that wide call graphs stay cheap to collapse
+MIN_STACK_TIME = 1e-6
+
+
+class CommandProfiler(object):
+    """Profiles command execution with cProfile (cpu) or tracemalloc (mem).
+
+    Reports are written to files in output_dir named after the start time of the run:
+        cpu: <name>.pstats (for pstats/snakeviz) and <name>.folded (collapsed stacks for flamegraph tools)
+        mem: <name>.txt with top allocation sites and their tracebacks
+    """
+
+    def __init__(self, mode: str, output_dir: str = "", top: int = DEFAULT_TOP):
+        if mode not in PROFILERS:
+            raise ValueError(f"Profiler must be in [{', '.join(PROFILERS)}]")
+        self.mode = mode
+        self.output_dir = output_dir or os.getcwd()
+        self.top = top
+        self.name = time.strftime("colony-profile-%Y%m%d-%H%M%S") + f"-{mode}"
+        self._profile = None
+        self._snapshot = None
+
+    def __enter__(self) -> "CommandProfiler":
+        if self.mode == CPU_PROFILER:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        else:
+            tracemalloc.start(MEMORY_TRACEBACK_LIMIT)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.mode == CPU_PROFILER:
+            self._profile.disable()
+        else:
+            self._snapshot = tracemalloc.take_snapshot().filter_traces(
+                [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+            )
+            tracemalloc.stop()
+        return False
+
+    def write_reports(self, stream: TextIO) -> List[str]:
+        """Writes report files and prints top hotspots to the stream. Returns paths of written files"""
+        if self.mode == CPU_PROFILER:
+            return self._write_cpu_reports(stream)
+        return self._write_memory_reports(stream)
+
+    def _get_path(self, extension: str) -> str:
+        return os.path.join(self.output_dir, f"{self.name}.{extension}")
+
+    def _write_cpu_reports(self, stream: TextIO) -> List[str]:
+        stats = pstats.Stats(self._profile, stream=io.StringIO())
+        pstats_path = self._get_path("pstats")
+        stats.dump_stats(pstats_path)
+
+        folded_path = self._get_path("folded")
+        with open(folded_path, "w") as folded_file:
+            for stack, microseconds in sorted(collapse_stacks(stats.stats).items()):
+                folded_file.write(f"{stack} {microseconds}\n")
+
+        report = io.StringIO()
+        stats.stream = report
+        stats.sort_stats("cumulative").print_stats(self.top)
+        stream.write(f"Top {self.top} functions by cumulative time:\n")
+        stream.write(_strip_header(report.getvalue()))
+        return [pstats_path, folded_path]
+
+    def _write_memory_reports(self, stream: TextIO) -> List[str]:
+        path = self._get_path("txt")
+        with open(path, "w") as report_file:
+            for index, stat in enumerate(self._snapshot.statistics("traceback")[: self.top], 1):
+                report_file.write(f"#{index}: {stat.size / 1024:.1f} KiB in {stat.count} blocks\n")
+                for line in stat.traceback.format(most_recent_first=True):
+                    report_file.write(f"{line}\n")
+                report_file.write("\n")
+
+        stream.write(f"Top {self.top} allocation sites:\n")
+        for stat in self._snapshot.statistics("lineno")[: self.top]:
+            frame = stat.traceback[0]
+            stream.write(f"  {stat.size / 1024:10.1f} KiB  {stat.count:8} blocks  {frame.filename}:{frame.lineno}\n")
+        return [path]
+
+
+def collapse_stacks(stats: Dict[tuple, tuple]) -> Dict[str, int]:
+    """Builds collapsed stacks ("outer;inner microseconds") from pstats call graph.
+
+    cProfile records only caller-callee pairs, so the time of a function called from several places is split between
+    the stacks in proportion to the time spent in each call site.
+    """
+    callees = {}
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, cumulative) in callers.items():
+            callees.setdefault(caller, []).append((func, cumulative))
+
+    stacks = {}
+
+    def walk(func: tuple, budget: float, stack: Tuple[str, ...]) -> None:
+        _, _, own_time, cumulative, _ = stats[func]
+        stack = stack + (_format_function(func),)
+        share = budget / cumulative if cumulative else 0
+        self_time = own_time * share
+        if self_time:
+            key = ";".join(stack)
+            stacks[key] = stacks.get(key, 0) + self_time
+
+        if len(stack) >= MAX_STACK_DEPTH:
+            return
+        for callee, callee_time in callees.get(func, []):
+            # recursive calls are already accounted for in the cumulative time of the outer call
+            if callee in stats and callee_time * share >= MIN_STACK_TIME and _format_function(callee) not in stack:
+                walk(callee, callee_time * share, stack)
+
+    for func, (_, _, _, cumulative, callers) in stats.items():
+        if not callers:
+            walk(func, cumulative, ())
+
+    return {stack: int(seconds * 1e6) for stack, seconds in stacks.items() if int(seconds * 1e6)}
+
+
+def _format_function(func: tuple) -> str:
+    filename, line, name = func
+    if filename == "~":
+        # built-in function
+        return name
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def _strip_header(report: str) -> str:
+    """Leaves only the table of pstats report"""
+    lines = report.splitlines(keepends=True)
+    for index, line in enumerate(lines):
+        if line.lstrip().startswith("ncalls"):
+            return "".join(lines[index:])
+    return report
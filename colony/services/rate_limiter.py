@@ -0,0 +1,81 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from colony.services.file_lock import locked_file, overwrite
+from colony.services.timings import SLEEP, span
+
+DEFAULT_BUCKETS_PATH = "~/.colony/ratelimit"
+# requests can be sent in a burst of this many seconds worth of the rate after a period without requests
+DEFAULT_BURST_SECONDS = 2
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter(object):
+    """Token bucket of API requests shared by all processes of the host using the same account and space.
+
+    The bucket is kept in a file which is locked while a request takes its token, so that concurrent CLI invocations
+    share one budget of `rate` requests per second. When the bucket is empty a request is not rejected: it reserves
+    the next token and waits until the token is due, so requests are sent in the order they came.
+    """
+
+    def __init__(self, rate: float, account: str = None, space: str = None, burst: float = None, path: str = ""):
+        if rate <= 0:
+            raise ValueError("Rate limit must be a positive number of requests per second")
+
+        self.rate = rate
+        self.burst = max(burst or rate * DEFAULT_BURST_SECONDS, 1)
+        buckets_path = os.path.expanduser(os.path.expandvars(path or DEFAULT_BUCKETS_PATH))
+        key = hashlib.sha256(f"{account or ''}\n{space or ''}".encode()).hexdigest()[:16]
+        self.bucket_path = os.path.join(buckets_path, f"{key}.json")
+        # the file lock is held by the process, so threads of the process take it one at a time
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Takes a token, waiting for it if the bucket is empty. Returns the number of seconds waited"""
+        delay = self.reserve()
+        if delay > 0:
+            with span("rate limit wait", SLEEP, seconds=round(delay, 3)):
+                time.sleep(delay)
+        return delay
+
+    def reserve(self) -> float:
+        """Takes a token from the bucket and returns in how many seconds the request may be sent"""
+        return self._reserve(queue=True)
+
+    def try_acquire(self) -> bool:
+        """Takes a token only if one is available right away. Optional requests use it rather than wait in turn"""
+        return self._reserve(queue=False) == 0
+
+    def _reserve(self, queue: bool) -> float:
+        try:
+            with self._lock:
+                return self._take_token(queue)
+        except OSError as e:
+            # never fail a request because of the limiter
+            logger.debug(f"Unable to use rate limit bucket {self.bucket_path}. Details: {e}")
+            return 0
+
+    def _take_token(self, queue: bool) -> float:
+        with locked_file(self.bucket_path) as bucket_file:
+            now = time.time()
+            tokens, updated = self._read_state(bucket_file, now)
+            # tokens go below zero when requests are waiting for them
+            tokens = min(self.burst, tokens + (now - updated) * self.rate) - 1
+            if tokens < 0 and not queue:
+                return -tokens / self.rate
+            overwrite(bucket_file, json.dumps({"tokens": tokens, "updated": now}))
+
+        return max(-tokens / self.rate, 0)
+
+    def _read_state(self, bucket_file, now: float) -> tuple:
+        try:
+            state = json.loads(bucket_file.read() or "{}")
+            return float(state["tokens"]), min(float(state["updated"]), now)
+        except (KeyError, TypeError, ValueError):
+            # a new or damaged bucket starts full
+            return self.burst, now
@@ -0,0 +1,171 @@
+import cmd
+import logging
+import os
+import re
+import shlex
+
+from docopt import DocoptExit
+
+from colony.client import ColonyClient
+from colony.models.connection import ColonyConnection
+from colony.utils import BlueprintRepo
+
+try:
+    import readline
+except ImportError:
+    # not available on Windows, the shell works without history and completion then
+    readline = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_PATH = "~/.colony/history"
+HISTORY_LENGTH = 1000
+EXIT_COMMANDS = ("exit", "quit")
+
+
+class ColonyRepl(cmd.Cmd):
+    """Runs colony commands one after another in a single process.
+
+    The connection, the API client with its HTTP session and the opened blueprint repo are shared by all commands
+    run in the shell. Sandbox ids and blueprint names seen in API responses and in the repo are offered as
+    completions of command arguments.
+    """
+
+    def __init__(
+        self,
+        commands: dict,
+        connection: ColonyConnection,
+        client: ColonyClient,
+        output_format: str = None,
+        history_path: str = DEFAULT_HISTORY_PATH,
+    ):
+        super(ColonyRepl, self).__init__()
+        self.commands = commands
+        self.connection = connection
+        self.output_format = output_format
+        self.history_path = os.path.expanduser(history_path) if history_path else None
+        self.prompt = f"colony ({connection.space})> "
+        self.sandbox_ids = set()
+        self.blueprint_names = set()
+
+        self.client = client
+        self.client.session.hooks["response"].append(self._collect_completions)
+        BlueprintRepo.keep_open()
+
+    def preloop(self) -> None:
+        if readline and self.history_path:
+            readline.set_history_length(HISTORY_LENGTH)
+            try:
+                readline.read_history_file(self.history_path)
+            except OSError:
+                pass
+
+    def postloop(self) -> None:
+        if readline and self.history_path:
+            try:
+                os.makedirs(os.path.dirname(self.history_path), exist_ok=True)
+                readline.write_history_file(self.history_path)
+            except OSError as e:
+                logger.debug(f"Unable to save shell history to {self.history_path}. Details: {e}")
+
+    def emptyline(self) -> bool:
+        # do not repeat the last command
+        return False
+
+    def default(self, line: str) -> bool:
+        try:
+            argv = shlex.split(line)
+        except ValueError as e:
+            logger.error(f"Unable to parse command: {e}")
+            return False
+
+        if argv[0] in EXIT_COMMANDS:
+            return True
+        if argv[0] == "EOF":
+            self.stdout.write("\n")
+            return True
+
+        self.run_command(argv)
+        return False
+
+    def do_help(self, arg: str) -> None:
+        command_class = self.commands.get(arg.strip())
+        if command_class:
+            self.stdout.write(command_class.__doc__)
+            return
+
+        self.stdout.write(f"Commands: {', '.join(sorted(self.commands))}\n")
+        self.stdout.write("Type 'help <command>' to see its usage, 'exit' or Ctrl-D to leave the shell.\n")
+
+    def run_command(self, argv: list) -> bool:
+        command_class = self.commands.get(argv[0])
+        if command_class is None:
+            logger.error(f"Unknown command '{argv[0]}'. Type 'help' to see available commands")
+            return False
+
+        try:
+            command = command_class(argv, self.connection, self.output_format, client=self.client)
+            return command.execute()
+        except DocoptExit as e:
+            # wrong usage, show it and stay in the shell
+            self.stdout.write(f"{e}\n")
+        except SystemExit:
+            pass
+        except KeyboardInterrupt:
+            self.stdout.write("\n")
+        except Exception as e:
+            logger.exception(e, exc_info=False)
+        return False
+
+    def completenames(self, text: str, *ignored) -> list:
+        return sorted(name for name in list(self.commands) + list(EXIT_COMMANDS) + ["help"] if name.startswith(text))
+
+    def completedefault(self, text: str, line: str, begidx: int, endidx: int) -> list:
+        words = line[:begidx].split()
+        command_class = self.commands.get(words[0]) if words else None
+        if command_class is None:
+            return []
+
+        if len(words) == 1:
+            candidates = get_subcommands(command_class)
+        elif text.startswith("-"):
+            candidates = get_options(command_class)
+        else:
+            candidates = self.sandbox_ids | self.blueprint_names | self._get_repo_blueprints()
+        return sorted(candidate for candidate in candidates if candidate.startswith(text))
+
+    def complete_help(self, text: str, *ignored) -> list:
+        return sorted(name for name in self.commands if name.startswith(text))
+
+    def _get_repo_blueprints(self) -> set:
+        repo = BlueprintRepo.get_open_repo(os.getcwd())
+        return set(repo.blueprints) if repo else set()
+
+    def _collect_completions(self, response, *args, **kwargs) -> None:
+        """Response hook which remembers sandbox ids and blueprint names of API responses"""
+        if "json" not in response.headers.get("Content-Type", ""):
+            return
+        try:
+            collect_identifiers(response.json(), self.sandbox_ids, self.blueprint_names)
+        except ValueError:
+            pass
+
+
+def collect_identifiers(data, sandbox_ids: set, blueprint_names: set) -> None:
+    if isinstance(data, list):
+        for item in data:
+            collect_identifiers(item, sandbox_ids, blueprint_names)
+    elif isinstance(data, dict):
+        if isinstance(data.get("blueprint_name"), str):
+            blueprint_names.add(data["blueprint_name"])
+        if "sandbox_status" in data and isinstance(data.get("id"), str):
+            sandbox_ids.add(data["id"])
+
+
+def get_subcommands(command_class) -> set:
+    """Subcommands from the usage lines of the command, e.g. 'start' of 'colony sb start <blueprint_name>'"""
+    return set(re.findall(r"^\s*colony\s+(?:\([^)]*\)|\S+)\s+([a-z][\w-]*)", command_class.__doc__ or "", re.MULTILINE))
+
+
+def get_options(command_class) -> set:
+    return set(re.findall(r"(--[a-z][\w-]*)", command_class.__doc__ or ""))
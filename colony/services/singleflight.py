@@ -0,0 +1,73 @@
+import copy
+import threading
+import time
+from typing import Callable, Hashable
+
+
+class _Call(object):
+    __slots__ = ("done", "result", "error", "finished", "ttl")
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.finished = None
+
+
+class SingleFlight(object):
+    """Collapses identical concurrent calls into one.
+
+    A call made while another call with the same key is in flight does not run its function, it waits for the
+    running call and gets the same result or exception. With ttl the result of a successful call is also given to
+    calls made within ttl seconds after it has finished, so that pollers which come in bursts share one response.
+    The ttl can also be given per call: a finished call is reused only within the ttl of the new call.
+    Every caller gets its own copy of the result, so callers may change it.
+    """
+
+    def __init__(self, ttl: float = 0):
+        self.ttl = ttl
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, func: Callable, ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None and call.finished is not None and time.monotonic() - call.finished >= ttl:
+                call = None
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call(ttl)
+
+        if leader:
+            self._run(key, call, func)
+        else:
+            call.done.wait()
+
+        if call.error is not None:
+            raise call.error
+        return copy.deepcopy(call.result)
+
+    def forget(self) -> None:
+        """Drops results kept for ttl, e.g. after a change which makes them stale"""
+        with self._lock:
+            self._calls = {key: call for key, call in self._calls.items() if call.finished is None}
+
+    def _run(self, key: Hashable, call: _Call, func: Callable) -> None:
+        try:
+            call.result = func()
+        except Exception as e:
+            call.error = e
+
+        with self._lock:
+            call.finished = now = time.monotonic()
+            # failed calls are never reused, results of others are kept for ttl
+            if call.error is not None and self._calls.get(key) is call:
+                del self._calls[key]
+            self._calls = {
+                other_key: other
+                for other_key, other in self._calls.items()
+                if other.finished is None or other.finished + other.ttl > now
+            }
+        call.done.set()
@@ -0,0 +1,202 @@
+import functools
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import List, TextIO
+
+# span categories
+PHASE = "phase"
+GIT = "git"
+HTTP = "http"
+SLEEP = "sleep"
+
+
+class Span(object):
+    """Wall clock interval of a named phase of the CLI run with its nested phases"""
+
+    __slots__ = ("name", "category", "attributes", "start", "end", "children", "thread_id")
+
+    def __init__(self, name: str, category: str = PHASE, attributes: dict = None):
+        self.name = name
+        self.category = category
+        self.attributes = attributes or {}
+        self.start = time.perf_counter()
+        self.end = None
+        self.children = []
+        self.thread_id = threading.get_ident()
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+
+class _NullSpan(object):
+    """Context manager returned for spans while timings are disabled"""
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _SpanContext(object):
+    def __init__(self, timings: "Timings", span: Span):
+        self.timings = timings
+        self.span = span
+
+    def __enter__(self) -> Span:
+        self.timings._push(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.span.end = time.perf_counter()
+        if exc_type is not None and not issubclass(exc_type, SystemExit):
+            self.span.attributes.setdefault("error", exc_type.__name__)
+        self.timings._pop(self.span)
+        return False
+
+
+class Timings(object):
+    """Collects spans of the CLI run.
+
+    Timings are disabled by default and then opening a span costs a single attribute check. Spans opened in other
+    threads with no open span of their own are nested into the innermost open span of the main thread.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.roots = []
+        self._main_stack = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def span(self, name: str, category: str = PHASE, **attributes):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _SpanContext(self, Span(name, category, attributes))
+
+    def _get_stack(self) -> list:
+        if threading.current_thread() is threading.main_thread():
+            return self._main_stack
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _push(self, span: Span) -> None:
+        stack = self._get_stack()
+        parent = stack[-1] if stack else (self._main_stack[-1] if self._main_stack else None)
+        with self._lock:
+            (parent.children if parent else self.roots).append(span)
+        stack.append(span)
+
+    def _pop(self, span: Span) -> None:
+        stack = self._get_stack()
+        if stack and stack[-1] is span:
+            stack.pop()
+
+    def to_records(self) -> List[dict]:
+        """Returns spans as nested dicts with start offsets and durations in milliseconds"""
+        origin = self.roots[0].start if self.roots else 0
+
+        def to_record(span: Span) -> dict:
+            record = OrderedDict(
+                [
+                    ("name", span.name),
+                    ("start_ms", round((span.start - origin) * 1000, 3)),
+                    ("duration_ms", round(span.duration * 1000, 3)),
+                ]
+            )
+            if span.attributes:
+                record["attributes"] = span.attributes
+            if span.children:
+                record["children"] = [to_record(child) for child in span.children]
+            return record
+
+        return [to_record(span) for span in self.roots]
+
+    def write_json(self, stream: TextIO, extra: dict = None) -> None:
+        """Writes {"timings": [...]} along with extra top level keys"""
+        json.dump(dict({"timings": self.to_records()}, **(extra or {})), stream, default=str)
+        stream.write("\n")
+
+    def write_chrome_trace(self, stream: TextIO) -> None:
+        """Writes spans as complete events of Chrome trace event format, which Perfetto and speedscope can open"""
+        origin = self.roots[0].start if self.roots else 0
+        pid = os.getpid()
+        events = []
+
+        def add_events(spans: List[Span]) -> None:
+            for span in spans:
+                events.append(
+                    {
+                        "name": span.name,
+                        "cat": span.category,
+                        "ph": "X",
+                        "ts": round((span.start - origin) * 1e6, 1),
+                        "dur": round(span.duration * 1e6, 1),
+                        "pid": pid,
+                        "tid": span.thread_id,
+                        "args": span.attributes,
+                    }
+                )
+                add_events(span.children)
+
+        add_events(self.roots)
+        events.append({"name": "process_name", "ph": "M", "pid": pid, "args": {"name": "colony"}})
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, stream, default=str)
+
+    def write_summary(self, stream: TextIO) -> None:
+        """Writes a tree of phases. Sibling spans with the same name are summed up into a single line"""
+        lines = []
+
+        def add_lines(spans: List[Span], depth: int) -> None:
+            groups = OrderedDict()
+            for span in spans:
+                groups.setdefault(span.name, []).append(span)
+            for name, group in groups.items():
+                label = "  " * depth + name + (f" (x{len(group)})" if len(group) > 1 else "")
+                lines.append((label, sum(span.duration for span in group)))
+                add_lines([child for span in group for child in span.children], depth + 1)
+
+        add_lines(self.roots, 0)
+        if not lines:
+            return
+
+        width = max(len(label) for label, _ in lines)
+        stream.write("Timings:\n")
+        for label, duration in lines:
+            stream.write(f"  {label.ljust(width)}  {duration:8.3f}s\n")
+        stream.flush()
+
+
+timings = Timings()
+
+
+def span(name: str, category: str = PHASE, **attributes):
+    """Opens a span of the CLI run timings: with span("push temp branch"): ..."""
+    return timings.span(name, category, **attributes)
+
+
+def timed(name: str, category: str = PHASE):
+    """Decorator which puts every call of the function into a span"""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not timings.enabled:
+                return func(*args, **kwargs)
+            with timings.span(name, category):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
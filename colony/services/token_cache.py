@@ -0,0 +1,91 @@
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+DEFAULT_CACHE_PATH = "~/.colony/tokens.json"
+# tokens are refreshed this many seconds before they expire, so that a request never goes out with an expired one
+REFRESH_MARGIN = 5 * 60
+
+logger = logging.getLogger(__name__)
+
+
+def get_token_expiry(token: str) -> float:
+    """Returns the expiration time of a JWT access token from its 'exp' claim or None if it is unknown"""
+    try:
+        payload = token.split(".")[1]
+        claims = json.loads(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+        return float(claims["exp"])
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def is_token_expiring(token: str, margin: int = REFRESH_MARGIN) -> bool:
+    """Token is about to expire within margin seconds. Tokens without known expiration are used until refused"""
+    expiry = get_token_expiry(token)
+    return expiry is not None and expiry - margin <= time.time()
+
+
+class TokenCache(object):
+    """Local cache of access tokens received on login with email and password.
+
+    Tokens are keyed by account and email and stored in a file readable only by the user. Tokens which are about to
+    expire are not returned, so that clients log in again ahead of the expiration.
+    """
+
+    def __init__(self, filename: str = "", margin: int = REFRESH_MARGIN):
+        path = os.path.expandvars(filename or DEFAULT_CACHE_PATH)
+        self.cache_path = os.path.expanduser(path)
+        self.margin = margin
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(account: str, email: str) -> str:
+        return hashlib.sha256(f"{account}\n{email.lower()}".encode()).hexdigest()
+
+    def get(self, account: str, email: str) -> str:
+        with self._lock:
+            token = self._read_file().get(self.make_key(account, email))
+        if not isinstance(token, str) or is_token_expiring(token, self.margin):
+            return None
+        return token
+
+    def set(self, account: str, email: str, token: str) -> None:
+        self._update(self.make_key(account, email), token)
+
+    def remove(self, account: str, email: str) -> None:
+        self._update(self.make_key(account, email), None)
+
+    def _update(self, key: str, token: str) -> None:
+        with self._lock:
+            # re-read the file so tokens saved by other processes in the meantime are kept
+            tokens = self._read_file()
+            if token:
+                tokens[key] = token
+            else:
+                tokens.pop(key, None)
+            tokens = {key: token for key, token in tokens.items() if not is_token_expiring(token, margin=0)}
+
+            try:
+                os.makedirs(os.path.dirname(self.cache_path), mode=0o700, exist_ok=True)
+                tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+                fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, "w") as cache_file:
+                    json.dump(tokens, cache_file)
+                # the temp file may have been left by another run with different permissions
+                os.chmod(tmp_path, 0o600)
+                os.replace(tmp_path, self.cache_path)
+            except OSError as e:
+                logger.debug(f"Unable to save token cache to {self.cache_path}. Details: {e}")
+
+    def _read_file(self) -> dict:
+        try:
+            with open(self.cache_path) as cache_file:
+                tokens = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+        return tokens if isinstance(tokens, dict) else {}
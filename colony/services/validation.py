@@ -0,0 +1,81 @@
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List
+
+from colony.blueprints import BlueprintsManager
+from colony.services.validation_cache import ValidationCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PARALLEL_VALIDATIONS = 4
+
+
+class ValidationResult(object):
+    def __init__(self, blueprint: str, errors: List[dict] = None, cached: bool = False):
+        self.blueprint = blueprint
+        self.errors = [{"name": err["name"], "message": err["message"]} for err in errors or []]
+        self.cached = cached
+
+    @property
+    def valid(self) -> bool:
+        return not self.errors
+
+    def to_record(self) -> dict:
+        return OrderedDict(
+            [("blueprint", self.blueprint), ("valid", self.valid), ("errors", self.errors), ("cached", self.cached)]
+        )
+
+
+def validate_blueprint(
+    manager: BlueprintsManager,
+    blueprint: str,
+    branch: str = None,
+    commit: str = None,
+    cache: ValidationCache = None,
+    cache_key: str = None,
+) -> ValidationResult:
+    """Validates blueprint reporting request failures as validation errors.
+
+    If cache and cache_key are provided, the cache entry is updated with the result of the validation
+    """
+    try:
+        bp = manager.validate(blueprint=blueprint, branch=branch, commit=commit)
+    except Exception as e:
+        logger.debug(f"Validation request for blueprint '{blueprint}' failed: {e}")
+        return ValidationResult(blueprint, [{"name": "Validation request failed", "message": str(e)}])
+
+    result = ValidationResult(blueprint, getattr(bp, "errors"))
+    if cache is not None and cache_key:
+        cache.update(cache_key, blueprint, result.valid)
+    return result
+
+
+def validate_blueprints(
+    manager: BlueprintsManager,
+    blueprints: Iterable[str],
+    branch: str = None,
+    commit: str = None,
+    max_workers: int = DEFAULT_PARALLEL_VALIDATIONS,
+    cache: ValidationCache = None,
+    cache_keys: Dict[str, str] = None,
+) -> Iterator[ValidationResult]:
+    """Validates blueprints running at most max_workers requests at once.
+
+    Results are yielded in the order of provided blueprints as soon as they are available
+    """
+    cache_keys = cache_keys or {}
+
+    def validate(bp: str) -> ValidationResult:
+        return validate_blueprint(manager, bp, branch, commit, cache, cache_keys.get(bp))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        yield from executor.map(validate, blueprints)
+
+
+def merge_results(
+    blueprints: Iterable[str], known: Dict[str, ValidationResult], results: Iterator[ValidationResult]
+) -> Iterator[ValidationResult]:
+    """Yields results for all blueprints in their order taking ones missing in known results from results"""
+    for bp in blueprints:
+        yield known[bp] if bp in known else next(results)
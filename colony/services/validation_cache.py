@@ -0,0 +1,90 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+DEFAULT_CACHE_PATH = "~/.colony/cache/validations.json"
+DEFAULT_TTL = 24 * 60 * 60
+
+logger = logging.getLogger(__name__)
+
+
+class ValidationCache(object):
+    """Local cache of successful blueprint validations of a space.
+
+    Entries are keyed by space, blueprint name and a hash of the validated content (blueprint file together with
+    files it references, or a commit id) and expire after ttl seconds.
+    """
+
+    def __init__(self, space: str, filename: str = "", ttl: int = DEFAULT_TTL):
+        path = os.path.expandvars(filename or DEFAULT_CACHE_PATH)
+        self.cache_path = os.path.expanduser(path)
+        self.space = space
+        self.ttl = ttl
+        self._entries = None
+        # changes which are applied on top of the file content on save (None value means removed entry)
+        self._changes = {}
+        self._lock = threading.Lock()
+
+    def make_key(self, blueprint: str, content_hash: str) -> str:
+        return hashlib.sha256(f"{self.space}\n{blueprint}\n{content_hash}".encode()).hexdigest()
+
+    def is_valid(self, key: str) -> bool:
+        with self._lock:
+            entry = self._get_entries().get(key)
+            return bool(entry) and entry.get("space") == self.space and not self._is_expired(entry)
+
+    def update(self, key: str, blueprint: str, valid: bool) -> None:
+        with self._lock:
+            entries = self._get_entries()
+            if valid:
+                entries[key] = {"space": self.space, "blueprint": blueprint, "timestamp": time.time()}
+            else:
+                entries.pop(key, None)
+            self._changes[key] = entries.get(key)
+
+    def save(self) -> None:
+        with self._lock:
+            if not self._changes:
+                return
+
+            # re-read the file so entries saved by other processes in the meantime are kept
+            entries = self._read_file()
+            for key, entry in self._changes.items():
+                if entry is None:
+                    entries.pop(key, None)
+                else:
+                    entries[key] = entry
+            entries = {key: entry for key, entry in entries.items() if not self._is_expired(entry)}
+
+            try:
+                os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+                tmp_path = f"{self.cache_path}.{os.getpid()}.tmp"
+                with open(tmp_path, "w") as cache_file:
+                    json.dump(entries, cache_file)
+                os.replace(tmp_path, self.cache_path)
+            except OSError as e:
+                logger.debug(f"Unable to save validation cache to {self.cache_path}. Details: {e}")
+                return
+
+            self._entries = entries
+            self._changes.clear()
+
+    def _is_expired(self, entry: dict) -> bool:
+        return time.time() - entry.get("timestamp", 0) > self.ttl
+
+    def _get_entries(self) -> dict:
+        if self._entries is None:
+            self._entries = self._read_file()
+        return self._entries
+
+    def _read_file(self) -> dict:
+        try:
+            with open(self.cache_path) as cache_file:
+                entries = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+        return entries if isinstance(entries, dict) else {}
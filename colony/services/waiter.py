@@ -7,10 +7,16 @@ from colony.branch.branch_context import ContextBranch
 from colony.branch.branch_utils import can_temp_branch_be_deleted, logger
 from colony.commands.base import BaseCommand
 from colony.constants import DEFAULT_TIMEOUT, FINAL_SB_STATUSES
+from colony.exceptions import CircuitOpenError
 from colony.sandboxes import SandboxesManager
+from colony.services import cancellation
+from colony.services.timings import SLEEP, span
 
 
 class Waiter(object):
+    # seconds between sandbox status checks
+    poll_interval = 5
+
     @staticmethod
     def wait_for_sandbox_to_launch(
         sb_manager: SandboxesManager,
@@ -35,7 +41,7 @@ class Waiter(object):
 
             sandbox_start_wait_output(sandbox_id, context_branch.temp_branch_exists)
 
-            with yaspin(text="Starting...", color="yellow") as spinner:
+            with get_spinner() as spinner, span("wait for sandbox"):
                 while (datetime.datetime.now() - start_time).seconds < timeout * 60:
                     if status in FINAL_SB_STATUSES:
                         spinner.green.ok("✔")
@@ -46,9 +52,20 @@ class Waiter(object):
                             spinner.green.ok("✔")
                             break
 
-                    time.sleep(5)
+                    with span("sleep", SLEEP):
+                        time.sleep(Waiter.poll_interval)
+                    if cancellation.is_cancelled():
+                        logger.debug(f"Waiting for sandbox {sandbox_id} has been cancelled")
+                        return False
                     spinner.text = f"[{int((datetime.datetime.now() - start_time).total_seconds())} sec]"
-                    sandbox = sb_manager.get(sandbox_id)
+                    try:
+                        sandbox = sb_manager.get(sandbox_id)
+                    except CircuitOpenError as e:
+                        # the API is down, check again once requests to it are resumed
+                        logger.debug(str(e))
+                        with span("sleep", SLEEP):
+                            time.sleep(max(e.retry_after - Waiter.poll_interval, 0))
+                        continue
                     status = getattr(sandbox, "sandbox_status")
                 else:
                     logger.error(f"Timeout Reached - Sandbox {sandbox_id} was not active after {timeout} minutes")
@@ -59,6 +76,31 @@ class Waiter(object):
             logger.error(f"There was an issue with waiting for sandbox deployment -> {str(e)}")
 
 
+class SilentSpinner(object):
+    """Spinner stub used when stdout is reserved for machine readable results"""
+
+    text = ""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        pass
+
+    @property
+    def green(self):
+        return self
+
+    def ok(self, text: str = "") -> None:
+        pass
+
+
+def get_spinner():
+    if BaseCommand.is_machine_output():
+        return SilentSpinner()
+    return yaspin(text="Starting...", color="yellow")
+
+
 def sandbox_start_wait_output(sandbox_id, temp_branch_exists):
     if temp_branch_exists:
         logger.debug(f"Waiting before deleting temp branch that was created for this sandbox (id={sandbox_id})")
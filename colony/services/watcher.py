@@ -0,0 +1,108 @@
+import logging
+import time
+from collections import OrderedDict, namedtuple
+from typing import Dict, Iterator, List
+
+from colony.models.sandbox_table import SandboxTable
+from colony.sandboxes import SandboxesManager
+from colony.services import cancellation
+
+logger = logging.getLogger(__name__)
+
+WATCH_COLUMNS = [
+    SandboxTable.ID,
+    SandboxTable.NAME,
+    SandboxTable.BLUEPRINT,
+    SandboxTable.STATUS,
+    SandboxTable.PROGRESS,
+]
+# a row is reported as changed only when one of these columns differs from the previous snapshot
+TRACKED_COLUMNS = (SandboxTable.STATUS, SandboxTable.PROGRESS)
+
+ADDED = "added"
+CHANGED = "changed"
+REMOVED = "removed"
+
+SandboxChange = namedtuple("SandboxChange", ["kind", "sandbox_id", "row", "previous"])
+
+
+def diff_snapshots(previous: Dict[str, dict], current: Dict[str, dict]) -> List[SandboxChange]:
+    changes = []
+    for sandbox_id, row in current.items():
+        old_row = previous.get(sandbox_id)
+        if old_row is None:
+            changes.append(SandboxChange(ADDED, sandbox_id, row, None))
+        elif any(row[col] != old_row[col] for col in TRACKED_COLUMNS):
+            changes.append(SandboxChange(CHANGED, sandbox_id, row, old_row))
+
+    for sandbox_id, old_row in previous.items():
+        if sandbox_id not in current:
+            changes.append(SandboxChange(REMOVED, sandbox_id, old_row, old_row))
+
+    return changes
+
+
+class SandboxWatcher(object):
+    """Polls sandbox list and yields differences between consecutive snapshots.
+
+    Polling is adaptive: the interval is reset to the base one as soon as something changes and grows while the
+    listing stays the same, up to MAX_INTERVAL seconds.
+    """
+
+    MAX_INTERVAL = 60
+    BACKOFF_FACTOR = 1.5
+
+    def __init__(
+        self,
+        sb_manager: SandboxesManager,
+        list_filter: str = "my",
+        count: int = 25,
+        conditions: dict = None,
+        show_ended: bool = False,
+        interval: int = 5,
+        timeout: int = None,
+    ):
+        self.sb_manager = sb_manager
+        self.list_filter = list_filter
+        self.count = count
+        self.conditions = conditions or {}
+        self.show_ended = show_ended
+        self.interval = interval
+        self.timeout = timeout
+
+    def fetch_snapshot(self) -> Dict[str, dict]:
+        table = self.sb_manager.list_table(count=self.count, filter_opt=self.list_filter)
+        if not self.show_ended:
+            table = table.filter(SandboxTable.STATUS, ["Ended"], exclude=True)
+        table = table.where(self.conditions)
+
+        return OrderedDict((row[0], dict(zip(WATCH_COLUMNS, row))) for row in table.rows(WATCH_COLUMNS))
+
+    def next_interval(self, interval: float, changed: bool) -> float:
+        if changed:
+            return self.interval
+        return min(interval * self.BACKOFF_FACTOR, max(self.MAX_INTERVAL, self.interval))
+
+    def changes(self) -> Iterator[List[SandboxChange]]:
+        """Yields a list of changes per every poll. The first list contains all listed sandboxes as added"""
+        start_time = time.time()
+        interval = self.interval
+        snapshot = OrderedDict()
+
+        while True:
+            try:
+                current = self.fetch_snapshot()
+            except Exception as e:
+                logger.error(f"Unable to get sandbox list: {str(e)}")
+                current = snapshot
+
+            changes = diff_snapshots(snapshot, current)
+            snapshot = current
+            yield changes
+
+            interval = self.next_interval(interval, bool(changes))
+            if self.timeout and time.time() - start_time + interval > self.timeout * 60:
+                return
+            time.sleep(interval)
+            if cancellation.is_cancelled():
+                return
@@ -1,5 +1,13 @@
+import logging
+import threading
+from urllib.parse import urlparse
+
 from requests import Session
 
+from .services.cassette import CASSETTE_MODES, RECORD_MODE, REPLAY_MODE, Cassette, RecordingAdapter, ReplayAdapter
+
+logger = logging.getLogger(__name__)
+
 
 class ColonySession(Session):
     def __init__(self):
@@ -14,3 +22,56 @@ class ColonySession(Session):
         :rtype: object
         """
         self.headers.update({"Authorization": "Bearer {}".format(token)})
+
+    def use_cassette(self, path: str, mode: str = REPLAY_MODE, latency_scale: float = 1.0) -> Cassette:
+        """Records all requests of the session into the cassette file or replays them from it without network.
+
+        Replayed responses are delayed by their recorded duration multiplied by latency_scale.
+        """
+        if mode not in CASSETTE_MODES:
+            raise ValueError(f"Cassette mode must be in [{', '.join(CASSETTE_MODES)}]")
+
+        if mode == RECORD_MODE:
+            cassette = Cassette(path)
+            adapter = RecordingAdapter(cassette)
+        else:
+            cassette = Cassette(path).load()
+            adapter = ReplayAdapter(cassette, latency_scale)
+
+        logger.debug(f"Using cassette {path} in {mode} mode")
+        self.mount("https://", adapter)
+        self.mount("http://", adapter)
+        return cassette
+
+
+class SessionRegistry(object):
+    """Hands out one pooled session per Colony host, so that all clients of the host reuse its connections.
+
+    Sessions stay open until the registry is closed, which is done once when the process shuts down. Clients never
+    close sessions of the registry, since other clients of the host may still use them.
+    """
+
+    def __init__(self):
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> ColonySession:
+        """Returns the session for the host of the url, creating it on first use"""
+        parsed = urlparse(url)
+        host = f"{parsed.scheme}://{parsed.netloc}"
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = self._sessions[host] = ColonySession()
+            return session
+
+    def close(self) -> None:
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
+# sessions of all clients which are not given their own
+registry = SessionRegistry()
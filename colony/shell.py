@@ -1,6 +1,6 @@
 """
 Usage: colony [--space=<space>] [--token=<token>] [--account=<account>] [--profile=<profile>] [--help] [--debug]
-              <command> [<args>...]
+              [--output=<format>] [--timings] [--profiler=<type>] <command> [<args>...]
 
 Options:
   -h --help             Show this screen.
@@ -12,24 +12,54 @@ Options:
                         the Colony URL. e.g. https://YOURACCOUNT.cloudshellcolony.com/
   --profile=<profile>   Use a specific Profile section in the config file
                         You still can override config with --token/--space options.
+  --output=<format>     Output format of command results: table (default), json, ndjson or csv.
+                        In machine readable formats (json, ndjson, csv) informational messages are written
+                        to stderr without colors.
+  --timings             Print how long each phase of the command (reading config, git operations, API requests,
+                        waiting) took and per endpoint API request statistics to stderr on exit. In machine
+                        readable output formats timings are printed as JSON.
+  --profiler=<type>     Profile the command with cProfile (cpu) or tracemalloc (mem). Top hotspots are printed to
+                        stderr and full reports are saved to the current directory: pstats and collapsed stacks
+                        (flamegraph input) for cpu, top allocation sites with tracebacks for mem.
 
 Commands:
     bp, blueprint       validate colony blueprints
     sb, sandbox         start sandbox, end sandbox and get its status
     configure           set, list and remove connection profiles to colony
+    shell               run colony commands interactively in a single session
+    agent               start, stop and get status of the background agent which runs colony commands
+    batch               run many colony commands from a file in a single process
 """
+import atexit
 import logging
 import sys
+from urllib.parse import urlparse
 
 import pkg_resources
 from colorama import init
 from docopt import DocoptExit, docopt
 
-from colony.commands import bp, configure, sb
+from colony.client import ColonyClient
+from colony.commands import agent, batch, bp, configure, sb, shell
+from colony.commands.base import BaseCommand
+from colony.exceptions import CassetteError
 from colony.models.connection import ColonyConnection
 from colony.parsers.global_input_parser import GlobalInputParser
+from colony.services import metrics
+from colony.services.agent import AgentClient
+from colony.services.cassette import REPLAY_MODE
+from colony.services.circuit_breaker import get_circuit_breaker
 from colony.services.connection import ColonyConnectionProvider
+from colony.services.hedging import HedgePolicy
+from colony.services.profiler import CommandProfiler
+from colony.services.rate_limiter import RateLimiter
+from colony.services.timings import span, timings
 from colony.services.version import VersionCheckService
+from colony.services.waiter import Waiter
+from colony.session import ColonySession
+from colony.session import registry as sessions
+from colony.utils import BlueprintRepo
+from colony.view.writers import TABLE_OUTPUT
 
 logger = logging.getLogger(__name__)
 
@@ -39,14 +69,24 @@ commands_table = {
     "sb": sb.SandboxesCommand,
     "sandbox": sb.SandboxesCommand,
     "configure": configure.ConfigureCommand,
+    "shell": shell.ShellCommand,
+    "agent": agent.AgentCommand,
+    "batch": batch.BatchCommand,
 }
+# commands which are never forwarded to the agent: the ones reading stdin and the agent management itself
+LOCAL_COMMANDS = ("configure", "shell", "agent", "batch")
+# long running subcommands which would hold the agent while they wait: sandbox start may wait for the sandbox to be
+# ready and watch runs until interrupted
+LOCAL_SUBCOMMANDS = {"sb": ("start", "watch"), "sandbox": ("start", "watch")}
+# commands which are run without arguments rather than showing their usage then
+NO_ARGS_COMMANDS = ("shell", "batch")
 
 
 class BootstrapHelper:
     @staticmethod
     def is_help_message_requested(input_parser: GlobalInputParser) -> bool:
         if not input_parser.command_args:
-            return True
+            return input_parser.command not in NO_ARGS_COMMANDS
 
         return "--help" in input_parser.command_args or "-h" in input_parser.command_args
 
@@ -72,6 +112,20 @@ class BootstrapHelper:
     def is_config_mode(input_parser: GlobalInputParser) -> bool:
         return input_parser.command == "configure"
 
+    @staticmethod
+    def can_use_agent(input_parser: GlobalInputParser) -> bool:
+        # options which need the command to run in the CLI process: timings and profiles are collected there
+        subcommand = input_parser.command_args[0] if input_parser.command_args else None
+        return not (
+            input_parser.command in LOCAL_COMMANDS
+            or subcommand in LOCAL_SUBCOMMANDS.get(input_parser.command, ())
+            or input_parser.timings
+            or input_parser.profiler
+            or input_parser.get_trace_file_path()
+            or input_parser.get_metrics_file_path()
+            or input_parser.get_cassette_path()
+        )
+
     @staticmethod
     def should_get_connection_params(input_parser: GlobalInputParser) -> bool:
         return not BootstrapHelper.is_help_message_requested(input_parser) and not BootstrapHelper.is_config_mode(
@@ -80,14 +134,37 @@ class BootstrapHelper:
 
 
 def main():
-    # Colorama init for colored output
-    init()
     version = pkg_resources.get_distribution("colony-cli").version
     args = docopt(__doc__, options_first=True, version=version)
     input_parser = GlobalInputParser(args)
 
+    if BootstrapHelper.can_use_agent(input_parser):
+        exit_code = AgentClient().run(sys.argv[1:])
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    if input_parser.timings:
+        timings.enable()
+        atexit.register(write_timings, input_parser.output)
+
+    trace_file = input_parser.get_trace_file_path()
+    if trace_file:
+        timings.enable()
+        atexit.register(write_trace, trace_file)
+
+    metrics_file = input_parser.get_metrics_file_path()
+    if metrics_file:
+        atexit.register(write_metrics, metrics_file)
+
+    # Colorama init for colored output. Not needed for machine readable output
+    if input_parser.output == TABLE_OUTPUT:
+        init()
+    else:
+        BaseCommand.machine_output = True
+
     # Check for new version
-    VersionCheckService(version).check_for_new_version_safely()
+    with span("check version"):
+        VersionCheckService(version).check_for_new_version_safely()
 
     level = logging.DEBUG if input_parser.debug else logging.WARNING
     logging.basicConfig(format="%(levelname)s - %(message)s", level=level)
@@ -96,17 +173,117 @@ def main():
     BootstrapHelper.validate_command(input_parser.command)
 
     # Take auth parameters
-    conn = BootstrapHelper.get_connection_params(input_parser)
+    with span("get connection"):
+        conn = BootstrapHelper.get_connection_params(input_parser)
 
     argv = [input_parser.command] + input_parser.command_args
 
     command_class = commands_table[input_parser.command]
-    command = command_class(argv, conn)
-    result = command.execute()
+    with span(" ".join(argv[:2])):
+        command = command_class(argv, conn, input_parser.output)
+        if input_parser.get_cassette_path() and command.client:
+            use_cassette(command.client.session, input_parser)
+        if command.client:
+            configure_client(command.client, conn, input_parser)
+        try:
+            result = run_command(command, input_parser.profiler)
+        finally:
+            sessions.close()
 
     exit(result)
 
 
+def use_cassette(session: ColonySession, input_parser: GlobalInputParser) -> None:
+    mode = input_parser.get_cassette_mode()
+    latency_scale = input_parser.get_cassette_latency_scale()
+    try:
+        session.use_cassette(input_parser.get_cassette_path(), mode, latency_scale)
+    except CassetteError as e:
+        logger.error(str(e))
+        exit(False)
+
+    if mode == REPLAY_MODE:
+        # sandbox status polling is replayed at the same pace as the requests
+        Waiter.poll_interval *= latency_scale
+
+
+def configure_client(client: ColonyClient, conn: ColonyConnection, input_parser: GlobalInputParser) -> None:
+    """Applies request rate limit, hedging and circuit breaker settings of the environment to the client"""
+    # the budget is shared by all colony processes of the host using the account and space
+    rate_limit = input_parser.get_rate_limit()
+    client.rate_limiter = RateLimiter(rate_limit, conn.account, conn.space) if rate_limit else None
+    client.hedging = HedgePolicy() if input_parser.is_hedging_enabled() else None
+    # processes using the same state file stop and resume requests to the host together
+    client.circuit_breaker = get_circuit_breaker(urlparse(client.base_url).netloc, input_parser.get_circuit_file_path())
+
+
+# clients of the agent process by connection. Their pooled sessions keep connections open between commands
+_agent_clients = {}
+
+
+def run_agent_command(argv: list) -> bool:
+    """Runs the command sent by the CLI in the agent process"""
+    version = pkg_resources.get_distribution("colony-cli").version
+    args = docopt(__doc__, argv=argv, options_first=True, version=version)
+    input_parser = GlobalInputParser(args)
+
+    logging.getLogger().setLevel(logging.DEBUG if input_parser.debug else logging.WARNING)
+    BootstrapHelper.validate_command(input_parser.command)
+    BlueprintRepo.keep_open()
+
+    conn = BootstrapHelper.get_connection_params(input_parser)
+    client = None
+    if conn:
+        key = (conn.account, conn.space, conn.token)
+        if key not in _agent_clients:
+            _agent_clients[key] = ColonyClient(space=conn.space, token=conn.token, account=conn.account)
+        client = _agent_clients[key]
+        configure_client(client, conn, input_parser)
+
+    argv = [input_parser.command] + input_parser.command_args
+    command = commands_table[input_parser.command](argv, conn, input_parser.output, client=client)
+    return command.execute()
+
+
+def run_command(command: BaseCommand, profiler_type: str = None) -> bool:
+    if not profiler_type:
+        return command.execute()
+
+    profiler = CommandProfiler(profiler_type)
+    try:
+        with profiler:
+            return command.execute()
+    finally:
+        try:
+            for path in profiler.write_reports(sys.stderr):
+                sys.stderr.write(f"Profile report is saved to {path}\n")
+        except OSError as e:
+            logger.warning(f"Unable to save profile report. Details: {e}")
+
+
+def write_timings(output_format: str) -> None:
+    if output_format == TABLE_OUTPUT:
+        timings.write_summary(sys.stderr)
+        metrics.registry.write_summary(sys.stderr)
+    else:
+        timings.write_json(sys.stderr, {"requests": metrics.registry.snapshot()})
+
+
+def write_trace(trace_file: str) -> None:
+    try:
+        with open(trace_file, "w") as stream:
+            timings.write_chrome_trace(stream)
+    except OSError as e:
+        logger.warning(f"Unable to write trace to {trace_file}. Details: {e}")
+
+
+def write_metrics(metrics_file: str) -> None:
+    try:
+        metrics.registry.save_prometheus_textfile(metrics_file)
+    except OSError as e:
+        logger.warning(f"Unable to write metrics to {metrics_file}. Details: {e}")
+
+
 def exit(run_result) -> None:
     if not run_result:
         sys.exit(1)
@@ -1,37 +1,106 @@
+import atexit
+import fnmatch
+import hashlib
 import logging
 import os
+import threading
+from typing import Iterable
 
-import yaml
-from git import InvalidGitRepositoryError, Repo
+from git import Git, InvalidGitRepositoryError, Repo
+from git.refs.symbolic import SymbolicReference
 
 from colony.exceptions import BadBlueprintRepo
+from colony.services.blueprint_index import BlobMetadataCache, BlueprintIndex, extract_metadata, load_yaml
+from colony.services.timings import GIT, span, timed, timings
 
 logging.getLogger("git").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
 
+class TracedGit(Git):
+    """Git command wrapper which puts every git process run into a span of the CLI run timings"""
+
+    def execute(self, command, *args, **kwargs):
+        if not timings.enabled:
+            return super().execute(command, *args, **kwargs)
+
+        git_args = [str(arg) for arg in command[1:]] if isinstance(command, (list, tuple)) else [str(command)]
+        with span(f"git {git_args[0]}" if git_args else "git", GIT, command=" ".join(git_args)):
+            return super().execute(command, *args, **kwargs)
+
+
 class BlueprintRepo(Repo):
+    GitCommandWrapperType = TracedGit
     bp_file_extensions = [".yaml", ".yml"]
     bp_dir = "blueprints"
+    apps_dir = "applications"
+    services_dir = "services"
     _active_branch = ""
     _temp_branch = ""
+    _index = None
+    _blob_cache = None
+    # repos by path, reused by commands run in the interactive shell. None when repos are not kept open
+    _open_repos = None
+    # repos opened by the command running in the thread, their caches are saved when the command ends
+    _command_repos = threading.local()
 
     def __init__(self, path: str):
-        try:
-            super().__init__(path, search_parent_directories=True)
-        except InvalidGitRepositoryError:
-            raise BadBlueprintRepo("Not a git folder")
-        if self.bare:
-            raise BadBlueprintRepo("Cannot get folder tree structure. Repo is bare")
-
-        if not self.remotes:
-            raise BadBlueprintRepo("Local repository not connected to the remote space repository")
-
-        self.blueprints = self._fetch_blueprints_list()
+        with span("open repo"):
+            try:
+                super().__init__(path, search_parent_directories=True)
+            except InvalidGitRepositoryError:
+                raise BadBlueprintRepo("Not a git folder")
+            if self.bare:
+                raise BadBlueprintRepo("Cannot get folder tree structure. Repo is bare")
+
+            if not self.remotes:
+                raise BadBlueprintRepo("Local repository not connected to the remote space repository")
+
+            self.blueprints = self._fetch_blueprints_list()
+
+    @classmethod
+    def keep_open(cls) -> None:
+        """Makes open() reuse repos instead of opening them again for every command"""
+        if cls._open_repos is None:
+            cls._open_repos = {}
+
+    @classmethod
+    def get_open_repo(cls, path: str) -> "BlueprintRepo":
+        return (cls._open_repos or {}).get(os.path.abspath(path))
+
+    @classmethod
+    def open(cls, path: str) -> "BlueprintRepo":
+        """Opens the repo of the path or returns the repo kept open with the list of blueprints refreshed"""
+        repo = cls.get_open_repo(path)
+        if repo is None:
+            repo = cls(path)
+            if cls._open_repos is not None:
+                cls._open_repos[os.path.abspath(path)] = repo
+        else:
+            repo._active_branch = ""
+            repo._temp_branch = ""
+            repo.blueprints = repo._fetch_blueprints_list()
+
+        opened = getattr(cls._command_repos, "repos", [])
+        if repo not in opened:
+            cls._command_repos.repos = opened + [repo]
+        return repo
+
+    @classmethod
+    def save_command_caches(cls) -> None:
+        """Saves metadata parsed by the command running in this thread in the repos it has opened"""
+        repos = getattr(cls._command_repos, "repos", [])
+        cls._command_repos.repos = []
+        for repo in repos:
+            repo.save_caches()
 
     def repo_has_blueprint(self, blueprint_name) -> bool:
         """Check if repo contains provided blueprint"""
-        return blueprint_name in list(self.blueprints.keys())
+        return blueprint_name in self.blueprints
+
+    def find_blueprints(self, pattern: str = "*") -> list:
+        """Returns sorted names of repo blueprints matching glob pattern"""
+        return sorted(fnmatch.filter(self.blueprints.keys(), pattern))
 
     def is_repo_detached(self):
         return self.head.is_detached
@@ -51,62 +120,159 @@ class BlueprintRepo(Repo):
             if local_branch.name == remote.remote_head:
                 return local_branch.commit.__eq__(remote.commit)
 
-    # (TODO:ddovbii): must be moved to separated class (BlueprintYamlHandler or smth)
-    def get_blueprint_artifacts(self, blueprint_name: str) -> dict:
-        yaml_obj = self.get_blueprint_yaml(blueprint_name)
-        artifacts = yaml_obj.get("artifacts", None)
+    def get_remote_revision(self, branch: str = None, commit: str = None) -> str:
+        """Returns git revision of the blueprints which are used in a remote branch or commit, or None if neither
+        is specified"""
+        if commit:
+            return commit
+        if branch:
+            return f"{self.remote().name}/{branch}"
+        return None
+
+    def get_blueprint_metadata(self, blueprint_name: str, revision: str = None) -> dict:
+        """Returns metadata of the blueprint (clouds, applications, services, inputs, artifacts, k8s and tf flags).
+
+        Without revision metadata of the working tree file is taken from the blueprint index, parsing the blueprint
+        file only if it has changed since it was indexed. Otherwise the blueprint file is read from git objects of the
+        revision and parsed metadata is cached by the blob SHA.
+        """
+        if revision:
+            return self._get_blueprint_metadata_at(blueprint_name, revision)
 
-        if not artifacts:
-            return {}
+        if not self.repo_has_blueprint(blueprint_name):
+            raise BadBlueprintRepo(f"Blueprint Git repo does not contain blueprint {blueprint_name}")
+        return self._index.get_metadata(blueprint_name)
 
-        else:
-            res = {}
-            for art in artifacts:
-                for name, path in art.items():
-                    if path:
-                        res[name] = path
-            return res
-
-    # (TODO:ddovbii): must be moved to separated class (BlueprintYamlHandler or smth)
-    def get_blueprint_default_inputs(self, blueprint_name):
-        yaml_obj = self.get_blueprint_yaml(blueprint_name)
-        inputs = yaml_obj.get("inputs", None)
-        if not inputs:
-            return {}
-        else:
-            res = {}
-            for inp in inputs:
-                for input_name, specs in inp.items():
-                    if specs is not None:
-                        if not isinstance(specs, dict):
-                            res[input_name] = specs
-                        else:
-                            res[input_name] = specs.get("default_value", None)
-            return res
+    def load_blueprints_metadata(self, blueprint_names: Iterable[str] = None, max_workers: int = None) -> dict:
+        """Returns metadata of many (all by default) working tree blueprints at once parsing changed blueprint files
+        in parallel processes"""
+        return self._index.load_metadata(blueprint_names, max_workers)
+
+    def save_caches(self) -> None:
+        """Saves blueprint metadata parsed since the repo has been opened"""
+        self._index.save()
+        if self._blob_cache is not None:
+            self._blob_cache.save()
+
+    def get_blueprint_artifacts(self, blueprint_name: str, revision: str = None) -> dict:
+        return dict(self.get_blueprint_metadata(blueprint_name, revision)["artifacts"])
+
+    def get_blueprint_default_inputs(self, blueprint_name: str, revision: str = None) -> dict:
+        return dict(self.get_blueprint_metadata(blueprint_name, revision)["default_inputs"])
+
+    def get_blueprint_references(self, blueprint_name: str) -> dict:
+        """Returns names of applications and services used by the blueprint"""
+        metadata = self.get_blueprint_metadata(blueprint_name)
+        return {self.apps_dir: list(metadata["applications"]), self.services_dir: list(metadata["services"])}
+
+    def get_blueprint_referenced_files(self, blueprint_name: str) -> list:
+        """Returns sorted paths (relative to the repo root) of the blueprint file and files of its applications
+        and services"""
+        work_dir = self.working_dir
+        files = {os.path.relpath(self.blueprints[blueprint_name], work_dir)}
+
+        try:
+            references = self.get_blueprint_references(blueprint_name)
+        except Exception as e:
+            logger.debug(f"Unable to get references of blueprint {blueprint_name}. Details: {e}")
+            references = {}
+
+        for folder, names in references.items():
+            for name in names:
+                for current_path, _, file_names in os.walk(os.path.join(work_dir, folder, name)):
+                    files.update(os.path.relpath(os.path.join(current_path, f), work_dir) for f in file_names)
+
+        return sorted(files)
+
+    def get_blueprint_content_hash(self, blueprint_name: str) -> str:
+        """Hash of the working tree content of the blueprint file and all files it references"""
+        digest = hashlib.sha256()
+        for path in self.get_blueprint_referenced_files(blueprint_name):
+            digest.update(path.encode())
+            with open(os.path.join(self.working_dir, path), "rb") as f:
+                for chunk in iter(lambda: f.read(65536), b""):
+                    digest.update(chunk)
+            digest.update(b"\0")
+
+        return digest.hexdigest()
+
+    def get_changed_files(self, base: str = "HEAD") -> list:
+        """Returns sorted paths (relative to the repo root, "/" separated) of files which differ in the working tree
+        from the point where the current branch forked from base, including untracked files"""
+        merge_base = self.merge_base(base, "HEAD")
+        if not merge_base:
+            raise BadBlueprintRepo(f"Current branch has no common history with '{base}'")
+
+        changed = set(self.git.diff("--name-only", merge_base[0].hexsha).splitlines())
+        changed.update(self.untracked_files)
+        return sorted(changed)
 
     def get_blueprint_yaml(self, blueprint_name: str) -> dict:
         if not self.repo_has_blueprint(blueprint_name):
             raise BadBlueprintRepo(f"Blueprint Git repo does not contain blueprint {blueprint_name}")
 
         with open(self.blueprints[blueprint_name]) as bp_file:
-            yaml_obj = yaml.full_load(bp_file)
+            yaml_obj = load_yaml(bp_file)
 
         return yaml_obj
 
+    def _get_blueprint_metadata_at(self, blueprint_name: str, revision: str) -> dict:
+        if self._blob_cache is None:
+            self._blob_cache = BlobMetadataCache(os.path.join(self.git_dir, "colony", "blobs.json"))
+
+        blob_sha = self._get_blueprint_blob(blueprint_name, revision)
+        metadata = self._blob_cache.get(blob_sha)
+        if metadata is None:
+            logger.debug(f"Parsing blueprint '{blueprint_name}' from {revision} (blob {blob_sha})")
+            # object data is read through a git cat-file process which is kept running by the repo
+            _, _, _, data = self.git.get_object_data(blob_sha)
+            metadata = extract_metadata(load_yaml(data))
+            self._blob_cache.set(blob_sha, metadata)
+
+        return metadata
+
+    def _get_blueprint_blob(self, blueprint_name: str, revision: str) -> str:
+        candidates = [f"{self.bp_dir}/{blueprint_name}{ext}" for ext in self.bp_file_extensions]
+        if self.repo_has_blueprint(blueprint_name):
+            local_path = os.path.relpath(self.blueprints[blueprint_name], self.working_dir).replace(os.sep, "/")
+            candidates.insert(0, local_path)
+
+        for path in candidates:
+            try:
+                blob_sha, object_type, _ = self.git.get_object_header(f"{revision}:{path}")
+            except ValueError:
+                continue
+            # cat-file output is returned as bytes
+            if object_type == b"blob":
+                return blob_sha.decode()
+
+        raise BadBlueprintRepo(f"Blueprint {blueprint_name} is not found in {revision}")
+
+    @timed("discover blueprints")
     def _fetch_blueprints_list(self) -> dict:
-        bps = {}
         work_dir = self.working_dir
-        bp_dir = os.path.join(work_dir, self.bp_dir)
-
-        if not os.path.exists(bp_dir):
+        if not os.path.exists(os.path.join(work_dir, self.bp_dir)):
             raise BadBlueprintRepo("Repo doesn't have 'blueprints' dir")
 
-        for bp_file in os.listdir(bp_dir):
-            blueprint, extension = os.path.splitext(bp_file)
-            if extension in self.bp_file_extensions:
-                bps[blueprint] = os.path.abspath(os.path.join(bp_dir, bp_file))
-
-        return bps
+        try:
+            # resolved from the ref files, loading the commit object would start a git process
+            head = SymbolicReference.dereference_recursive(self, "HEAD")
+        except ValueError:
+            # repo without commits
+            head = None
+
+        if self._index is not None:
+            # a repo kept open keeps metadata parsed by earlier commands
+            return self._index.reload(head)
+
+        self._index = BlueprintIndex(
+            os.path.join(self.git_dir, "colony", "blueprints.json"),
+            os.path.abspath(work_dir),
+            self.bp_dir,
+            self.bp_file_extensions,
+            head,
+        )
+        return self._index.load()
 
     def _get_remote_branches_names(self):
         if self.remotes:
@@ -135,6 +301,10 @@ class BlueprintRepo(Repo):
         return not (self.is_dirty() or self.untracked_files or not self.is_current_branch_synced())
 
 
+# saves what repos opened outside of commands have parsed
+atexit.register(BlueprintRepo.save_command_caches)
+
+
 def parse_comma_separated_string(params_string: str = None) -> dict:
     res = {}
 
@@ -154,3 +324,13 @@ def parse_comma_separated_string(params_string: str = None) -> dict:
         res[key] = val
 
     return res
+
+
+def parse_where_conditions(conditions_string: str = None) -> dict:
+    """Parses 'key1=val1|val2, key2=val3' into {key1: {val1, val2}, key2: {val3}}"""
+    res = {}
+
+    for key, values in parse_comma_separated_string(conditions_string).items():
+        res[key] = {val.strip() for val in values.split("|")}
+
+    return res
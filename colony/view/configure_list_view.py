@@ -1,6 +1,5 @@
 from collections import OrderedDict
-
-import tabulate
+from typing import Iterator
 
 from colony.constants import ColonyConfigKeys
 from colony.view.view_helper import mask_token
@@ -14,6 +13,8 @@ class ConfigureListView:
         if not self.config:
             return "Config file is empty. Use 'colony configure set' to configure Colony CLI."
 
+        import tabulate
+
         result_table = []
         for profile in self.config.keys():
             item = OrderedDict()
@@ -24,3 +25,14 @@ class ConfigureListView:
             result_table.append(item)
 
         return tabulate.tabulate(result_table, headers="keys")
+
+    def records(self) -> Iterator[dict]:
+        for profile, settings in (self.config or {}).items():
+            yield OrderedDict(
+                [
+                    ("profile", profile),
+                    ("account", settings.get(ColonyConfigKeys.ACCOUNT, None)),
+                    ("space", settings.get(ColonyConfigKeys.SPACE, None)),
+                    ("token", mask_token(settings.get(ColonyConfigKeys.TOKEN, None))),
+                ]
+            )
@@ -0,0 +1,55 @@
+import itertools
+from typing import List, TextIO
+
+from colony.models.sandbox_table import SandboxTable
+
+
+class SandboxListView:
+    """Writes sandbox table as a plain text table in a single pass.
+
+    Column widths are computed from a bounded sample of leading rows, so the output starts immediately regardless of
+    the table size. Values which are longer than the sampled width just shift the rest of the line.
+    """
+
+    SAMPLE_SIZE = 100
+    SEPARATOR = "  "
+    # same as tabulate's minimal header padding so output looks like the rest of the tables
+    HEADER_PADDING = 2
+    DEFAULT_COLUMNS = [SandboxTable.ID, SandboxTable.NAME, SandboxTable.BLUEPRINT, SandboxTable.STATUS]
+
+    def __init__(self, table: SandboxTable, columns: List[str] = None):
+        self.table = table
+        self.columns = columns or self.DEFAULT_COLUMNS
+
+    def write(self, stream: TextIO) -> None:
+        if not len(self.table):
+            return
+
+        headers = [SandboxTable.COLUMNS[col] for col in self.columns]
+        rows = self.table.rows(self.columns)
+        sample = list(itertools.islice(rows, self.SAMPLE_SIZE))
+
+        widths = [len(header) + self.HEADER_PADDING for header in headers]
+        for row in sample:
+            widths = [max(width, len(value)) for width, value in zip(widths, row)]
+
+        self._write_line(stream, headers, widths)
+        self._write_line(stream, ["-" * width for width in widths], widths)
+        for row in itertools.chain(sample, rows):
+            self._write_line(stream, row, widths)
+
+    def write_counts(self, stream: TextIO, column: str) -> None:
+        headers = [SandboxTable.COLUMNS[column], "Count"]
+        counts = self.table.count_by(column)
+        widths = [len(header) + self.HEADER_PADDING for header in headers]
+        widths[0] = max([widths[0]] + [len(value) for value in counts])
+
+        self._write_line(stream, [headers[0], headers[1].rjust(widths[1])], widths)
+        self._write_line(stream, ["-" * width for width in widths], widths)
+        for value, count in counts.items():
+            self._write_line(stream, [value, str(count).rjust(widths[1])], widths)
+
+    def _write_line(self, stream: TextIO, values, widths: List[int]) -> None:
+        line = self.SEPARATOR.join(value.ljust(width) for value, width in zip(values, widths))
+        stream.write(line.rstrip())
+        stream.write("\n")
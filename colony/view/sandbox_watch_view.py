@@ -0,0 +1,100 @@
+import datetime
+from typing import Iterable, Iterator, List, TextIO
+
+from colony.models.sandbox_table import SandboxTable
+from colony.services.watcher import ADDED, REMOVED, WATCH_COLUMNS, SandboxChange
+from colony.view.sandbox_list_view import SandboxListView
+
+REMOVED_STATUS = "Removed"
+
+
+def change_records(changes_stream: Iterable[List[SandboxChange]]) -> Iterator[dict]:
+    """Turns a stream of snapshot differences into flat event records"""
+    for changes in changes_stream:
+        timestamp = datetime.datetime.now().isoformat(timespec="seconds")
+        for change in changes:
+            record = {"time": timestamp, "event": change.kind}
+            record.update(change.row)
+            if change.kind == REMOVED:
+                record[SandboxTable.STATUS] = REMOVED_STATUS
+            record["previous_status"] = change.previous[SandboxTable.STATUS] if change.previous else ""
+            yield record
+
+
+class SandboxEventLogView:
+    """Append-only log of sandbox changes, used when output is not a terminal"""
+
+    def __init__(self, stream: TextIO):
+        self.stream = stream
+
+    def follow(self, changes_stream: Iterable[List[SandboxChange]]) -> None:
+        for record in change_records(changes_stream):
+            status = record[SandboxTable.STATUS]
+            if record["previous_status"] and record["previous_status"] != status:
+                status = f"{record['previous_status']} -> {status}"
+
+            line = "  ".join(
+                [
+                    record["time"],
+                    record["event"].ljust(7),
+                    record[SandboxTable.ID],
+                    record[SandboxTable.NAME],
+                    status,
+                    record[SandboxTable.PROGRESS],
+                ]
+            )
+            self.stream.write(line.rstrip())
+            self.stream.write("\n")
+            self.stream.flush()
+
+
+class LiveSandboxWatchView(SandboxListView):
+    """Keeps a sandbox table on a terminal up to date redrawing only the rows which have changed"""
+
+    def __init__(self, stream: TextIO):
+        super(LiveSandboxWatchView, self).__init__(SandboxTable(), WATCH_COLUMNS)
+        self.stream = stream
+        self._widths = None
+        self._row_lines = {}
+        self._line_count = 0
+
+    def follow(self, changes_stream: Iterable[List[SandboxChange]]) -> None:
+        for changes in changes_stream:
+            if self._widths is None:
+                if not changes:
+                    continue
+                self._write_header([change.row for change in changes[: self.SAMPLE_SIZE]])
+
+            for change in changes:
+                self.apply(change)
+            self.stream.flush()
+
+    def apply(self, change: SandboxChange) -> None:
+        row = dict(change.row)
+        if change.kind == REMOVED:
+            row[SandboxTable.STATUS] = REMOVED_STATUS
+        values = [row[col] for col in self.columns]
+
+        if change.kind == ADDED and change.sandbox_id not in self._row_lines:
+            self._row_lines[change.sandbox_id] = self._line_count
+            self._write_line(self.stream, values, self._widths)
+            self._line_count += 1
+            return
+
+        # move cursor up to the row line, rewrite it and get back to the bottom of the table
+        offset = self._line_count - self._row_lines[change.sandbox_id]
+        self.stream.write(f"\x1b[{offset}A\r\x1b[2K")
+        self._write_line(self.stream, values, self._widths)
+        if offset > 1:
+            self.stream.write(f"\x1b[{offset - 1}B")
+        self.stream.write("\r")
+
+    def _write_header(self, sample: List[dict]) -> None:
+        headers = [SandboxTable.COLUMNS[col] for col in self.columns]
+        self._widths = [len(header) + self.HEADER_PADDING for header in headers]
+        for row in sample:
+            self._widths = [max(width, len(row[col])) for width, col in zip(self._widths, self.columns)]
+
+        self._write_line(self.stream, headers, self._widths)
+        self._write_line(self.stream, ["-" * width for width in self._widths], self._widths)
+        self._line_count = 2
@@ -0,0 +1,107 @@
+import csv
+import json
+import sys
+from typing import Iterable, TextIO
+
+TABLE_OUTPUT = "table"
+JSON_OUTPUT = "json"
+NDJSON_OUTPUT = "ndjson"
+CSV_OUTPUT = "csv"
+
+
+class OutputWriter(object):
+    """Base class for writers of command results.
+
+    Commands pass their results as plain dicts: a single result with write_record or a sequence of results with
+    write_records. Machine readable writers emit every record as soon as it is produced.
+    """
+
+    is_machine_readable = True
+
+    def __init__(self, stream: TextIO = None):
+        self._stream = stream
+
+    @property
+    def stream(self) -> TextIO:
+        # resolved on every access so redirected/captured stdout is respected
+        return self._stream or sys.stdout
+
+    def write_record(self, record: dict) -> None:
+        self.write_records([record])
+
+    def write_records(self, records: Iterable[dict]) -> None:
+        raise NotImplementedError
+
+
+class TableWriter(OutputWriter):
+    is_machine_readable = False
+
+    def write_records(self, records: Iterable[dict]) -> None:
+        # imported here so machine readable modes never pay for it
+        import tabulate
+
+        records = list(records)
+        if records:
+            self.stream.write(tabulate.tabulate(records, headers="keys"))
+            self.stream.write("\n")
+
+
+class JsonWriter(OutputWriter):
+    def write_record(self, record: dict) -> None:
+        self.stream.write(json.dumps(record, indent=2, default=str))
+        self.stream.write("\n")
+
+    def write_records(self, records: Iterable[dict]) -> None:
+        stream = self.stream
+        empty = True
+        stream.write("[")
+        for record in records:
+            stream.write("\n  " if empty else ",\n  ")
+            stream.write(json.dumps(record, default=str))
+            stream.flush()
+            empty = False
+        stream.write("]\n" if empty else "\n]\n")
+
+
+class NdjsonWriter(OutputWriter):
+    def write_records(self, records: Iterable[dict]) -> None:
+        stream = self.stream
+        for record in records:
+            stream.write(json.dumps(record, default=str))
+            stream.write("\n")
+            stream.flush()
+
+
+class CsvWriter(OutputWriter):
+    def write_records(self, records: Iterable[dict]) -> None:
+        stream = self.stream
+        writer = None
+        for record in records:
+            if writer is None:
+                # header is taken from the first record
+                writer = csv.DictWriter(stream, fieldnames=list(record.keys()), extrasaction="ignore")
+                writer.writeheader()
+            writer.writerow({key: self._format_value(value) for key, value in record.items()})
+            stream.flush()
+
+    @staticmethod
+    def _format_value(value):
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, default=str)
+        return value
+
+
+OUTPUT_WRITERS = {
+    TABLE_OUTPUT: TableWriter,
+    JSON_OUTPUT: JsonWriter,
+    NDJSON_OUTPUT: NdjsonWriter,
+    CSV_OUTPUT: CsvWriter,
+}
+
+
+def get_writer(output_format: str = None, stream: TextIO = None) -> OutputWriter:
+    output_format = output_format or TABLE_OUTPUT
+    if output_format not in OUTPUT_WRITERS:
+        raise ValueError(f"Output format must be in [{', '.join(OUTPUT_WRITERS)}]")
+
+    return OUTPUT_WRITERS[output_format](stream)
@@ -0,0 +1,89 @@
+"""Compares parsing of all repo blueprints one by one with the bulk loader of the blueprint index.
+
+Run it from the repo root:
+
+    python -m tests.benchmarks.bench_blueprint_loading [count ...]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import yaml
+
+from colony.services.blueprint_index import BlueprintIndex, extract_metadata
+
+DEFAULT_COUNTS = [100, 1000, 5000]
+
+BLUEPRINT_TEMPLATE = """
+spec_version: 1
+kind: blueprint
+metadata:
+  description: Generated blueprint number {number}
+clouds:
+  - AWS: eu-west-1
+artifacts:
+{artifacts}
+inputs:
+{inputs}
+applications:
+{applications}
+services:
+  - queue:
+      inputs:
+        - SIZE: small
+"""
+
+
+def generate_blueprints(path: str, count: int) -> None:
+    bp_dir = os.path.join(path, "blueprints")
+    os.makedirs(bp_dir)
+    for number in range(count):
+        apps = [f"app-{number}-{i}" for i in range(10)]
+        content = BLUEPRINT_TEMPLATE.format(
+            number=number,
+            artifacts="\n".join(f"  - {app}: artifacts/{app}.tar.gz" for app in apps),
+            inputs="\n".join(
+                f"  - INPUT_{i}:\n      display_style: normal\n      default_value: {i}" for i in range(20)
+            ),
+            applications="\n".join(
+                f"  - {app}:\n      instances: 1\n      input_values:\n        - PORT: 80\n        - HOST: {app}"
+                for app in apps
+            ),
+        )
+        with open(os.path.join(bp_dir, f"bp-{number}.yaml"), "w") as bp_file:
+            bp_file.write(content)
+
+
+def parse_serially(path: str) -> float:
+    start = time.perf_counter()
+    bp_dir = os.path.join(path, "blueprints")
+    for file_name in os.listdir(bp_dir):
+        with open(os.path.join(bp_dir, file_name)) as bp_file:
+            extract_metadata(yaml.full_load(bp_file))
+    return time.perf_counter() - start
+
+
+def parse_in_bulk(path: str, max_workers: int = None) -> float:
+    index = BlueprintIndex(os.path.join(path, "index.json"), path, "blueprints", [".yaml", ".yml"])
+    index.load()
+    start = time.perf_counter()
+    index.load_metadata(max_workers=max_workers)
+    return time.perf_counter() - start
+
+
+def main(counts: list) -> None:
+    print(f"{'blueprints':>10}  {'serial':>10}  {'bulk 1 cpu':>10}  {f'bulk {os.cpu_count()} cpu':>10}")
+    for count in counts:
+        with tempfile.TemporaryDirectory() as path:
+            generate_blueprints(path, count)
+            serial = parse_serially(path)
+            single = parse_in_bulk(path, max_workers=1)
+            os.remove(os.path.join(path, "index.json"))
+            bulk = parse_in_bulk(path)
+        print(f"{count:>10}  {serial:>9.2f}s  {single:>9.2f}s  {bulk:>9.2f}s")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_COUNTS)
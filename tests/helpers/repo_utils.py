@@ -37,3 +37,23 @@ def add_untracked(repo):
 def readonly_handler(func, path, execinfo):
     os.chmod(path, stat.S_IWRITE)
     func(path)
+
+
+def create_blueprint_repo(path: str, files: dict) -> Repo:
+    """Creates repo with a remote and commits provided files (relative path -> content) to it"""
+    repo = Repo.init(path)
+    repo.create_remote("origin", "https://github.com/user/repo.git")
+    repo.config_writer().set_value("user", "name", "test").release()
+    repo.config_writer().set_value("user", "email", "test@test.io").release()
+    write_repo_files(path, files)
+    repo.git.add(".")
+    repo.git.commit("-m", "Initial commit")
+    return repo
+
+
+def write_repo_files(path: str, files: dict) -> None:
+    for file_path, content in files.items():
+        full_path = os.path.join(path, file_path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, "w") as f:
+            f.write(content)
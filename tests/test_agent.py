@@ -0,0 +1,117 @@
+import io
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from docopt import DocoptExit
+
+from colony.parsers.command_input_parsers import AgentStartInputParser
+from colony.services import cancellation
+from colony.services.agent import AgentClient, AgentServer, _encode
+
+finished_commands = []
+
+
+def fake_handler(argv: list) -> bool:
+    if argv == ["usage"]:
+        raise DocoptExit("usage: colony test")
+    if argv == ["poll"]:
+        # polls without any output until cancelled, like waiting for a sandbox
+        for _ in range(500):
+            time.sleep(0.01)
+            if cancellation.is_cancelled():
+                break
+        finished_commands.append(cancellation.is_cancelled())
+        print("too late")
+    print(f"cwd {os.getcwd()} space {os.environ.get('COLONY_SPACE')}")
+    return argv != ["fail"]
+
+
+class TestAgent(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmp_dir.name, "agent.sock")
+        self.server = AgentServer(self.socket_path, fake_handler, idle_timeout=60)
+        # check for stop requests often, so that tests do not wait for the agent to exit
+        self.server.timeout = 0.05
+        self.thread = threading.Thread(target=self.server.serve_until_idle)
+        self.thread.start()
+        self.client = AgentClient(self.socket_path)
+
+    def tearDown(self):
+        self.server.stopping = True
+        self.thread.join()
+        self.tmp_dir.cleanup()
+
+    def run_in_agent(self, argv: list) -> tuple:
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        exit_code = self.client.run(argv, stdout, stderr)
+        return exit_code, stdout.getvalue(), stderr.getvalue()
+
+    @patch.dict(os.environ, {"COLONY_SPACE": "dev"})
+    def test_run_command(self):
+        # act
+        exit_code, stdout, _ = self.run_in_agent(["sb", "list"])
+
+        # assert
+        self.assertEqual(exit_code, 0)
+        self.assertEqual(stdout, f"cwd {os.getcwd()} space dev\n")
+        self.assertEqual(self.client.ping()["commands"], 1)
+
+    def test_run_failed_command(self):
+        self.assertEqual(self.run_in_agent(["fail"])[0], 1)
+
+        exit_code, _, stderr = self.run_in_agent(["usage"])
+        self.assertEqual(exit_code, 1)
+        self.assertEqual(stderr, "usage: colony test\n")
+
+    def test_busy_agent(self):
+        with self.server.command_lock:
+            self.assertIsNone(self.client.run(["sb", "list"]))
+            self.assertTrue(self.client.ping()["busy"])
+
+    def test_command_is_cancelled_when_cli_disconnects(self):
+        # arrange
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.connect(self.socket_path)
+        conn.sendall(_encode({"type": "run", "argv": ["poll"]}))
+        deadline = time.time() + 2
+        while not self.server.command_lock.locked() and time.time() < deadline:
+            time.sleep(0.01)
+
+        # act
+        conn.close()
+        while self.server.command_lock.locked() and time.time() < deadline:
+            time.sleep(0.01)
+
+        # assert
+        self.assertFalse(self.server.command_lock.locked())
+        self.assertEqual(finished_commands, [True])
+        self.assertEqual(self.run_in_agent(["sb", "list"])[0], 0)
+        self.assertFalse(cancellation.is_cancelled())
+
+    def test_stop(self):
+        self.assertTrue(self.client.stop())
+        self.thread.join()
+
+        self.assertFalse(os.path.exists(self.socket_path))
+        self.assertIsNone(self.client.ping())
+        self.assertIsNone(self.client.run(["sb", "list"]))
+
+
+class TestAgentStartInputParser(unittest.TestCase):
+    def test_idle_timeout(self):
+        self.assertEqual(AgentStartInputParser({"--idle-timeout": None}).idle_timeout, 30)
+        self.assertEqual(AgentStartInputParser({"--idle-timeout": "5"}).idle_timeout, 5)
+
+        with self.assertRaises(DocoptExit):
+            AgentStartInputParser({"--idle-timeout": "0"}).idle_timeout
+
+
+if __name__ == "__main__":
+    unittest.main()
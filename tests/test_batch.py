@@ -0,0 +1,161 @@
+import sys
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from docopt import DocoptExit
+
+from colony.commands.base import BaseCommand
+from colony.parsers.command_input_parsers import BatchInputParser
+from colony.services.batch import BatchRunner, parse_batch
+
+
+class EchoCommand(BaseCommand):
+    """
+    usage:
+        colony echo <text> [--fail]
+    """
+
+    RESOURCE_MANAGER = Mock
+    # commands wait on the barrier to prove they run at the same time
+    barrier = None
+
+    def get_actions_table(self) -> dict:
+        return {"echo": self.do_echo}
+
+    def do_echo(self) -> bool:
+        if self.barrier:
+            self.barrier.wait(timeout=5)
+        text = self.args["<text>"]
+        self.message(f"echoing {text}")
+        if self.args["--fail"]:
+            return self.die(f"{text} failed")
+        return self.result({"text": text})
+
+
+class TestParseBatch(unittest.TestCase):
+    def test_lines(self):
+        entries = parse_batch("# release\ncolony sb start web --inputs 'A=1, B=2'\n\nsb status abc\n")
+
+        self.assertEqual(
+            [entry.argv for entry in entries], [["sb", "start", "web", "--inputs", "A=1, B=2"], ["sb", "status", "abc"]]
+        )
+        self.assertEqual([entry.id for entry in entries], ["1", "2"])
+
+    def test_plan(self):
+        plan = """
+commands:
+  - id: start
+    command: sb start web
+  - command: [sb, status, abc]
+    after: start
+"""
+        entries = parse_batch(plan)
+
+        self.assertEqual(entries[0].id, "start")
+        self.assertEqual(entries[1].argv, ["sb", "status", "abc"])
+        self.assertEqual(entries[1].after, ["start"])
+
+    def test_json_plan(self):
+        entries = parse_batch('["sb list", {"command": "sb end abc", "id": "end"}]')
+        self.assertEqual([entry.id for entry in entries], ["1", "end"])
+
+    def test_line_which_looks_like_yaml(self):
+        entries = parse_batch('sb start demo --inputs "a=1, b: 2"\n')
+        self.assertEqual(entries[0].argv, ["sb", "start", "demo", "--inputs", "a=1, b: 2"])
+
+    def test_invalid_plan(self):
+        with self.assertRaises(ValueError):
+            parse_batch('[{"command": "sb end abc", "after": "start"}, {"command": "sb start web", "id": "start"}]')
+        with self.assertRaises(ValueError):
+            parse_batch('[{"command": ""}]')
+
+
+class TestBatchRunner(unittest.TestCase):
+    def setUp(self):
+        EchoCommand.barrier = None
+        self.commands = {"echo": EchoCommand}
+
+    def run_batch(self, text: str, parallel: int = 1, fail_fast: bool = False) -> list:
+        runner = BatchRunner(self.commands, Mock(), Mock(), parallel=parallel, fail_fast=fail_fast)
+        return list(runner.run(parse_batch(text)))
+
+    def test_run_sequentially(self):
+        stdout = sys.stdout
+
+        # act
+        records = self.run_batch("echo one\necho two --fail\necho three\nunknown")
+
+        # assert
+        self.assertEqual([record["index"] for record in records], [1, 2, 3, 4])
+        self.assertEqual([record["ok"] for record in records], [True, False, True, False])
+        self.assertEqual(records[0]["records"], [{"text": "one"}])
+        self.assertEqual(records[1]["messages"], "echoing two\ntwo failed")
+        self.assertIs(sys.stdout, stdout)
+
+    def test_wrong_usage(self):
+        records = self.run_batch("echo")
+        self.assertFalse(records[0]["ok"])
+        self.assertIn("usage:", records[0]["messages"])
+
+    def test_dependent_command_is_skipped(self):
+        plan = '[{"id": "a", "command": "echo a --fail"}, {"command": "echo b", "after": "a"}, "echo c"]'
+
+        records = self.run_batch(plan)
+
+        self.assertTrue(records[1]["skipped"])
+        self.assertTrue(records[2]["ok"])
+
+    def test_fail_fast(self):
+        records = self.run_batch("echo a --fail\necho b", fail_fast=True)
+        self.assertTrue(records[1]["skipped"])
+
+    def test_run_in_parallel(self):
+        EchoCommand.barrier = threading.Barrier(3)
+
+        records = self.run_batch("echo one\necho two\necho three", parallel=3)
+
+        self.assertTrue(all(record["ok"] for record in records))
+        self.assertEqual(sorted(record["records"][0]["text"] for record in records), ["one", "three", "two"])
+        self.assertTrue(all(record["messages"] == f"echoing {record['records'][0]['text']}" for record in records))
+
+    def test_repo_commands_run_one_at_a_time(self):
+        # arrange
+        running = []
+        concurrency = []
+        lock = threading.Lock()
+
+        def execute(argv, output):
+            with lock:
+                running.append(argv[1])
+                concurrency.append((running.count("start"), len(running)))
+            time.sleep(0.05)
+            with lock:
+                running.remove(argv[1])
+            return 0
+
+        # act
+        with patch.object(BatchRunner, "_execute", side_effect=execute):
+            records = self.run_batch("sb start web\nsb start api\nsb status abc", parallel=3)
+
+        # assert
+        self.assertTrue(all(record["ok"] for record in records))
+        self.assertEqual(max(starts for starts, _ in concurrency), 1)
+        # commands which only call the API still run alongside
+        self.assertEqual(max(total for _, total in concurrency), 2)
+
+
+class TestBatchInputParser(unittest.TestCase):
+    def test_parse(self):
+        parser = BatchInputParser({"<file>": "-", "--parallel": "4", "--fail-fast": True})
+        self.assertIsNone(parser.file)
+        self.assertEqual(parser.parallel, 4)
+        self.assertTrue(parser.fail_fast)
+
+        with self.assertRaises(DocoptExit):
+            BatchInputParser({"--parallel": "0"}).parallel
+
+
+if __name__ == "__main__":
+    unittest.main()
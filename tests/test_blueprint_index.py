@@ -0,0 +1,224 @@
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import yaml
+
+from colony.branch.branch_utils import is_k8s_blueprint, is_tf_blueprint
+from colony.exceptions import BadBlueprintRepo
+from colony.services.blueprint_index import BlueprintIndex, extract_metadata
+from colony.utils import BlueprintRepo
+from tests.helpers.repo_utils import create_blueprint_repo, write_repo_files
+
+K8S_BLUEPRINT = """
+clouds:
+  - cluster/namespace
+inputs:
+  - PORT: 8080
+  - DB_PASS:
+      display_style: masked
+      default_value: secret
+  - USER
+artifacts:
+  - web-app: artifacts/web.tar.gz
+  - api:
+applications:
+  - web-app:
+  - api:
+"""
+
+
+class TestExtractMetadata(unittest.TestCase):
+    def test_extract_metadata(self):
+        metadata = extract_metadata(yaml.safe_load(K8S_BLUEPRINT))
+
+        self.assertEqual(metadata["clouds"], ["cluster/namespace"])
+        self.assertTrue(metadata["is_k8s"])
+        self.assertFalse(metadata["is_tf"])
+        self.assertEqual(metadata["inputs"], ["PORT", "DB_PASS", "USER"])
+        self.assertEqual(metadata["default_inputs"], {"PORT": 8080, "DB_PASS": "secret"})
+        self.assertEqual(metadata["artifacts"], {"web-app": "artifacts/web.tar.gz"})
+        self.assertEqual(metadata["applications"], ["web-app", "api"])
+
+    def test_extract_metadata_not_a_mapping(self):
+        self.assertEqual(extract_metadata(None)["clouds"], [])
+
+
+class TestBlueprintIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = self.temp_dir.name
+        create_blueprint_repo(
+            self.path,
+            {
+                "blueprints/k8s.yaml": K8S_BLUEPRINT,
+                "blueprints/team/tf.yml": "clouds:\n  - aws\nservices:\n  - queue\n",
+                "blueprints/README.md": "not a blueprint",
+            },
+        )
+        self.age_dirs()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def age_dirs(self):
+        # freshly modified directories are not trusted by the index
+        old = time.time() - 60
+        for current_path, _, _ in os.walk(os.path.join(self.path, "blueprints")):
+            os.utime(current_path, (old, old))
+
+    def open_repo(self) -> BlueprintRepo:
+        repo = BlueprintRepo(self.path)
+        self.addCleanup(repo.close)
+        return repo
+
+    def test_nested_blueprints(self):
+        repo = self.open_repo()
+
+        self.assertEqual(sorted(repo.blueprints), ["k8s", "tf"])
+        self.assertEqual(repo.blueprints["tf"], os.path.join(os.path.abspath(self.path), "blueprints/team/tf.yml"))
+        self.assertTrue(os.path.exists(os.path.join(repo.git_dir, "colony", "blueprints.json")))
+
+    def test_unchanged_dirs_are_not_rescanned(self):
+        self.open_repo()
+
+        with patch("colony.services.blueprint_index.os.walk") as walk:
+            repo = self.open_repo()
+
+        walk.assert_not_called()
+        self.assertEqual(sorted(repo.blueprints), ["k8s", "tf"])
+
+    def test_new_blueprint_is_discovered(self):
+        self.open_repo()
+
+        write_repo_files(self.path, {"blueprints/team/new.yaml": "clouds:\n  - aws\n"})
+
+        self.assertIn("new", self.open_repo().blueprints)
+
+    def test_metadata_is_not_parsed_again(self):
+        first_repo = self.open_repo()
+        with patch.object(BlueprintIndex, "save") as save:
+            first_repo.get_blueprint_metadata("k8s")
+            first_repo.get_blueprint_metadata("tf")
+        save.assert_not_called()
+        first_repo.save_caches()
+
+        repo = self.open_repo()
+        with patch("colony.services.blueprint_index.load_yaml") as load_yaml:
+            self.assertTrue(is_k8s_blueprint("k8s", repo))
+            self.assertFalse(is_tf_blueprint("k8s", repo))
+            self.assertEqual(repo.get_blueprint_default_inputs("k8s"), {"PORT": 8080, "DB_PASS": "secret"})
+
+        load_yaml.assert_not_called()
+
+    def test_repo_kept_open_keeps_parsed_metadata(self):
+        # arrange
+        with patch.object(BlueprintRepo, "_open_repos", {}):
+            repo = BlueprintRepo.open(self.path)
+            self.addCleanup(repo.close)
+            repo.get_blueprint_metadata("k8s")
+
+            # act
+            with patch("colony.services.blueprint_index.load_yaml") as load_yaml:
+                reopened = BlueprintRepo.open(self.path)
+                reopened.get_blueprint_metadata("k8s")
+
+        # assert
+        self.assertIs(reopened, repo)
+        load_yaml.assert_not_called()
+
+    def test_caches_of_command_repos_are_saved(self):
+        with patch.object(BlueprintRepo, "_open_repos", None):
+            first_repo = BlueprintRepo.open(self.path)
+        self.addCleanup(first_repo.close)
+        first_repo.get_blueprint_metadata("k8s")
+
+        BlueprintRepo.save_command_caches()
+
+        with patch("colony.services.blueprint_index.load_yaml") as load_yaml:
+            self.open_repo().get_blueprint_metadata("k8s")
+        load_yaml.assert_not_called()
+
+    def test_metadata_is_updated_with_file(self):
+        repo = self.open_repo()
+        self.assertTrue(is_tf_blueprint("tf", repo))
+
+        write_repo_files(self.path, {"blueprints/team/tf.yml": "clouds:\n  - aws\nservices: []\ninputs:\n  - A: 1\n"})
+
+        repo = self.open_repo()
+        self.assertFalse(is_tf_blueprint("tf", repo))
+        self.assertEqual(repo.get_blueprint_default_inputs("tf"), {"A": 1})
+
+    def test_load_metadata(self):
+        write_repo_files(self.path, {"blueprints/broken.yaml": "clouds: [aws"})
+        repo = self.open_repo()
+
+        metadata = repo.load_blueprints_metadata(max_workers=1)
+
+        self.assertEqual(sorted(metadata), ["k8s", "tf"])
+        self.assertTrue(metadata["tf"]["is_tf"])
+
+    @patch("colony.services.blueprint_index.PARALLEL_PARSE_THRESHOLD", 1)
+    def test_load_metadata_in_processes(self):
+        repo = self.open_repo()
+
+        metadata = repo.load_blueprints_metadata(max_workers=2)
+
+        self.assertEqual(metadata["k8s"], extract_metadata(yaml.safe_load(K8S_BLUEPRINT)))
+        with patch("colony.services.blueprint_index.load_yaml") as load_yaml:
+            self.assertEqual(self.open_repo().load_blueprints_metadata(), metadata)
+        load_yaml.assert_not_called()
+
+
+class TestBlueprintRevisionMetadata(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = self.temp_dir.name
+        git_repo = create_blueprint_repo(self.path, {"blueprints/bp.yaml": "clouds:\n  - aws\ninputs:\n  - A: 1\n"})
+        self.first_commit = git_repo.head.commit.hexsha
+        write_repo_files(self.path, {"blueprints/bp.yaml": "clouds:\n  - aws\ninputs:\n  - A: 2\n"})
+        git_repo.git.commit("-am", "Change default")
+        git_repo.close()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def open_repo(self) -> BlueprintRepo:
+        repo = BlueprintRepo(self.path)
+        self.addCleanup(repo.close)
+        return repo
+
+    def test_get_remote_revision(self):
+        repo = self.open_repo()
+
+        self.assertEqual(repo.get_remote_revision("dev", "abc123"), "abc123")
+        self.assertEqual(repo.get_remote_revision("dev"), "origin/dev")
+        self.assertIsNone(repo.get_remote_revision())
+
+    def test_metadata_of_revision(self):
+        repo = self.open_repo()
+
+        self.assertEqual(repo.get_blueprint_default_inputs("bp", self.first_commit), {"A": 1})
+        self.assertEqual(repo.get_blueprint_default_inputs("bp", "HEAD"), {"A": 2})
+        self.assertEqual(repo.get_blueprint_default_inputs("bp"), {"A": 2})
+
+    def test_metadata_of_revision_is_cached_by_blob(self):
+        first_repo = self.open_repo()
+        first_repo.get_blueprint_metadata("bp", self.first_commit)
+        first_repo.save_caches()
+
+        repo = self.open_repo()
+        with patch("colony.utils.load_yaml") as load_yaml:
+            self.assertEqual(repo.get_blueprint_default_inputs("bp", self.first_commit), {"A": 1})
+
+        load_yaml.assert_not_called()
+
+    def test_missing_blueprint_in_revision(self):
+        with self.assertRaises(BadBlueprintRepo):
+            self.open_repo().get_blueprint_metadata("other", self.first_commit)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from requests import Response
+
+from colony.client import ColonyClient
+from colony.exceptions import CassetteError
+from colony.sandboxes import SandboxesManager
+from colony.services.cassette import RECORD_MODE, REPLAY_MODE, SCRUBBED_VALUE
+from colony.services.waiter import Waiter
+from colony.session import ColonySession
+
+CASSETTE_FIXTURE = "tests/fixtures/sandbox_cassette.json"
+
+
+def make_response(status: int, body: dict) -> Response:
+    response = Response()
+    response.status_code = status
+    response.reason = "OK"
+    response.headers["Content-Type"] = "application/json"
+    response.headers["Set-Cookie"] = "session=secret"
+    response._content = json.dumps(body).encode("utf-8")
+    return response
+
+
+class TestCassette(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cassette_path = os.path.join(self.tmp_dir.name, "cassette.json")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_record_scrubs_credentials(self, send_mock):
+        # arrange
+        send_mock.return_value = make_response(200, {"access_token": "secret-token", "space": "dev"})
+        session = ColonySession()
+        session.use_cassette(self.cassette_path, RECORD_MODE)
+
+        # act
+        token = ColonyClient.login("acc", "user@example.com", "secret-password", session, "https://acc.colony.com/api/")
+        session.close()
+
+        # assert
+        self.assertEqual(token, "secret-token")
+        with open(self.cassette_path) as cassette_file:
+            content = cassette_file.read()
+        for secret in ("secret-token", "secret-password", "session=secret"):
+            self.assertNotIn(secret, content)
+
+        interaction = json.loads(content)["interactions"][0]
+        self.assertEqual(interaction["request"]["path"], "/api/accounts/acc/login")
+        self.assertEqual(interaction["request"]["body"]["json"]["password"], SCRUBBED_VALUE)
+        self.assertEqual(interaction["response"]["body"]["json"], {"access_token": SCRUBBED_VALUE, "space": "dev"})
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_replay_recorded_session(self, send_mock):
+        send_mock.return_value = make_response(200, {"id": "abc", "name": "demo", "blueprint_name": "web"})
+        recording_session = ColonySession()
+        recording_session.use_cassette(self.cassette_path, RECORD_MODE)
+        SandboxesManager(ColonyClient(space="dev", session=recording_session)).get("abc")
+        recording_session.close()
+
+        session = ColonySession()
+        session.use_cassette(self.cassette_path, REPLAY_MODE, latency_scale=0)
+        sandbox = SandboxesManager(ColonyClient(account="other", space="dev", session=session)).get("abc")
+
+        self.assertEqual(send_mock.call_count, 1)
+        self.assertEqual(sandbox.name, "demo")
+
+    @patch("requests.adapters.HTTPAdapter.send")
+    def test_record_writes_file_once_on_close(self, send_mock):
+        # arrange
+        send_mock.return_value = make_response(200, {"id": "abc", "name": "demo", "blueprint_name": "web"})
+        session = ColonySession()
+        session.use_cassette(self.cassette_path, RECORD_MODE)
+        manager = SandboxesManager(ColonyClient(space="dev", session=session))
+
+        # act
+        with patch("colony.services.cassette.json.dump", wraps=json.dump) as dump_mock:
+            for _ in range(3):
+                manager.get("abc")
+            recorded_before_close = os.path.exists(self.cassette_path)
+            session.close()
+
+        # assert
+        self.assertFalse(recorded_before_close)
+        dump_mock.assert_called_once()
+        with open(self.cassette_path) as cassette_file:
+            self.assertEqual(len(json.load(cassette_file)["interactions"]), 3)
+
+    def test_replay_unknown_request(self):
+        session = ColonySession()
+        session.use_cassette(CASSETTE_FIXTURE, REPLAY_MODE, latency_scale=0)
+        client = ColonyClient(space="dev", session=session)
+
+        with self.assertRaises(CassetteError):
+            client.request("spaces/dev/sandbox/unknown")
+
+    def test_replay_missing_cassette(self):
+        with self.assertRaises(CassetteError):
+            ColonySession().use_cassette(self.cassette_path, REPLAY_MODE)
+
+    @patch.object(Waiter, "poll_interval", 0)
+    def test_replay_sandbox_wait_loop(self):
+        # arrange
+        session = ColonySession()
+        cassette = session.use_cassette(CASSETTE_FIXTURE, REPLAY_MODE, latency_scale=0)
+        manager = SandboxesManager(ColonyClient(space="dev", session=session))
+        context_branch = Mock(temp_branch_exists=False)
+
+        # act
+        timed_out = Waiter.wait_for_sandbox_to_launch(manager, "abc", 1, context_branch, wait=True)
+
+        # assert
+        self.assertFalse(timed_out)
+        self.assertEqual(cassette._served[("GET", "/api/spaces/dev/sandbox/abc")], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
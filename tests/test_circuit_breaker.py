@@ -0,0 +1,154 @@
+import os
+import stat
+import tempfile
+import unittest
+from unittest.mock import Mock, patch
+
+from requests.exceptions import ConnectionError
+
+from colony.client import ColonyClient
+from colony.exceptions import CircuitOpenError
+from colony.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from colony.services.waiter import Waiter
+
+
+@patch("colony.services.circuit_breaker.time.time")
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.tmp_dir.name, "circuits.json")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def make_breaker(self, path: str = None) -> CircuitBreaker:
+        return CircuitBreaker("acc.cloudshellcolony.com", path, failure_threshold=3, reset_timeout=30)
+
+    def open_circuit(self, breaker: CircuitBreaker) -> None:
+        for _ in range(3):
+            breaker.before_request()
+            breaker.record_failure()
+
+    def test_opens_after_consecutive_failures(self, time_mock):
+        time_mock.return_value = 1000
+        breaker = self.make_breaker()
+
+        breaker.record_failure()
+        breaker.record_success()
+        self.open_circuit(breaker)
+
+        self.assertEqual(breaker.state, OPEN)
+        time_mock.return_value = 1010
+        with self.assertRaises(CircuitOpenError) as context:
+            breaker.before_request()
+        self.assertEqual(context.exception.retry_after, 20)
+
+    def test_single_probe_closes_circuit(self, time_mock):
+        # arrange
+        time_mock.return_value = 1000
+        breaker = self.make_breaker()
+        self.open_circuit(breaker)
+
+        # act
+        time_mock.return_value = 1031
+        breaker.before_request()
+        with self.assertRaises(CircuitOpenError):
+            breaker.before_request()
+        self.assertEqual(breaker.state, HALF_OPEN)
+        breaker.record_success()
+
+        # assert
+        self.assertEqual(breaker.state, CLOSED)
+        time_mock.return_value = 1100
+        breaker.before_request()
+
+    def test_probe_failure_opens_circuit(self, time_mock):
+        time_mock.return_value = 1000
+        breaker = self.make_breaker()
+        self.open_circuit(breaker)
+
+        time_mock.return_value = 1031
+        breaker.before_request()
+        breaker.record_failure()
+
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_traffic_is_restored_gradually(self, time_mock):
+        # arrange
+        time_mock.return_value = 1000
+        breaker = self.make_breaker()
+        self.open_circuit(breaker)
+        time_mock.return_value = 1031
+        breaker.before_request()
+        breaker.record_success()
+
+        with patch("colony.services.circuit_breaker.random.random", return_value=0.5):
+            # a quarter of the recovery period has passed, so a quarter of requests is let through
+            time_mock.return_value = 1046
+            with self.assertRaises(CircuitOpenError):
+                breaker.before_request()
+
+            time_mock.return_value = 1070
+            breaker.before_request()
+
+        # a failure during recovery opens the circuit at once
+        breaker.record_failure()
+        self.assertEqual(breaker.state, OPEN)
+
+    def test_state_is_shared_through_file(self, time_mock):
+        time_mock.return_value = 1000
+
+        self.open_circuit(self.make_breaker(self.state_path))
+
+        self.assertEqual(self.make_breaker(self.state_path).state, OPEN)
+        self.assertEqual(CircuitBreaker("other.cloudshellcolony.com", self.state_path).state, CLOSED)
+        self.assertEqual(stat.S_IMODE(os.stat(self.state_path).st_mode), 0o600)
+
+
+class TestClientCircuitBreaker(unittest.TestCase):
+    def test_requests_fail_fast_when_circuit_is_open(self):
+        # arrange
+        session = Mock()
+        session.request.side_effect = ConnectionError()
+        breaker = CircuitBreaker("cloudshellcolony.com", failure_threshold=2)
+        client = ColonyClient(space="dev", session=session, circuit_breaker=breaker)
+
+        # act
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                client.request("spaces/dev/sandbox/abc")
+
+        # assert
+        with self.assertRaises(CircuitOpenError):
+            client.request("spaces/dev/sandbox/abc")
+        self.assertEqual(session.request.call_count, 2)
+
+    def test_server_errors_open_circuit(self):
+        session = Mock()
+        session.request.return_value = Mock(status_code=503, content=b"{}")
+        session.request.return_value.json.return_value = {"errors": []}
+        breaker = CircuitBreaker("cloudshellcolony.com", failure_threshold=1)
+        client = ColonyClient(space="dev", session=session, circuit_breaker=breaker)
+
+        with self.assertRaises(Exception):
+            client.request("spaces/dev/sandbox/abc")
+
+        self.assertEqual(breaker.state, OPEN)
+
+    @patch.object(Waiter, "poll_interval", 0)
+    def test_waiter_keeps_waiting_while_circuit_is_open(self):
+        manager = Mock()
+        manager.get.side_effect = [
+            Mock(sandbox_status="Launching"),
+            CircuitOpenError("Colony API is unavailable", retry_after=0),
+            Mock(sandbox_status="Active"),
+        ]
+
+        timed_out = Waiter.wait_for_sandbox_to_launch(manager, "abc", 1, Mock(temp_branch_exists=False), wait=True)
+
+        self.assertFalse(timed_out)
+        self.assertEqual(manager.get.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,39 @@
+import ast
+import threading
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import Mock, patch
 
-from colony.client import ColonyClient
+from requests import Response
+from requests.adapters import BaseAdapter
+from requests.exceptions import ConnectionError
+
+from colony.client import ColonyClient, get_path_template
+from colony.services.metrics import NO_RESPONSE, MetricsRegistry
+from colony.session import ColonySession, SessionRegistry
+
+
+class EchoHeadersAdapter(BaseAdapter):
+    """Adapter which answers every request with the headers it was sent with"""
+
+    def __init__(self):
+        super(EchoHeadersAdapter, self).__init__()
+        self.threads = set()
+
+    def send(self, request, **kwargs) -> Response:
+        self.threads.add(threading.get_ident())
+        # let other threads run between preparing the request and getting its response
+        time.sleep(0.001)
+        response = Response()
+        response.status_code = 200
+        response.request = request
+        response._content = b"{}"
+        response.headers["X-Sent-Headers"] = repr(dict(request.headers))
+        return response
+
+    def close(self) -> None:
+        pass
 
 
 class TestClient(unittest.TestCase):
@@ -21,6 +54,122 @@ class TestClient(unittest.TestCase):
     def test_if_account_provided_client_base_url_includes_it(self):
         self.assertEqual(self.client_with_account.base_url, "https://my_account.cloudshellcolony.com/api/")
 
+    def test_get_path_template(self):
+        self.assertEqual(
+            get_path_template("https://acc.cloudshellcolony.com/api/spaces/dev/sandbox/abc"),
+            "spaces/{space}/sandbox/{sandbox_id}",
+        )
+        self.assertEqual(
+            get_path_template("https://cloudshellcolony.com/api/spaces/dev/validations/blueprints"),
+            "spaces/{space}/validations/blueprints",
+        )
+
+    def test_request_is_recorded_in_metrics(self):
+        # arrange
+        registry = MetricsRegistry()
+        session = Mock()
+        session.request.return_value = Mock(status_code=200, content=b"{}", request=Mock(body=b'{"a": 1}'))
+        client = ColonyClient(space="dev", session=session, metrics_registry=registry)
+
+        # act
+        client.request("spaces/dev/sandbox/abc")
+        client.request("spaces/dev/sandbox/abc")
+
+        # assert
+        metrics = registry.get("GET", "spaces/{space}/sandbox/{sandbox_id}")
+        self.assertEqual(metrics.requests, 2)
+        self.assertEqual(metrics.statuses, {"200": 2})
+        self.assertEqual(metrics.request_bytes, 16)
+        self.assertEqual(metrics.response_bytes, 4)
+
+    def test_failed_request_is_recorded_in_metrics(self):
+        registry = MetricsRegistry()
+        session = Mock()
+        session.request.side_effect = ConnectionError()
+        client = ColonyClient(space="dev", session=session, metrics_registry=registry)
+
+        with self.assertRaises(ConnectionError):
+            client.request("spaces/dev/sandbox", method="POST")
+
+        self.assertEqual(registry.get("POST", "spaces/{space}/sandbox").statuses, {NO_RESPONSE: 1})
+
+    def test_request_headers_do_not_change_session(self):
+        session = Mock(headers={"Accept": "application/json"})
+        session.request.return_value = Mock(status_code=200, content=b"{}")
+        client = ColonyClient(space="dev", session=session)
+
+        client.request("spaces/dev/sandbox", method="POST", headers={"X-Request": "1"})
+
+        self.assertEqual(
+            session.request.call_args[1]["headers"], {"Content-Type": "application/json", "X-Request": "1"}
+        )
+        self.assertEqual(session.headers, {"Accept": "application/json"})
+
+    def test_shared_client_is_thread_safe(self):
+        # arrange
+        adapter = EchoHeadersAdapter()
+        session = ColonySession()
+        session.mount("https://", adapter)
+        registry = MetricsRegistry()
+        client = ColonyClient(space="dev", token="token", session=session, metrics_registry=registry)
+        session_headers = dict(session.headers)
+
+        def send(i: int) -> dict:
+            if i % 2:
+                response = client.request("spaces/dev/sandbox", method="POST", headers={"X-Request": str(i)})
+            else:
+                response = client.request(f"spaces/dev/sandbox/{i}", headers={"X-Request": str(i)})
+            return ast.literal_eval(response.headers["X-Sent-Headers"])
+
+        # act
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            sent_headers = list(executor.map(send, range(400)))
+
+        # assert
+        for i, headers in enumerate(sent_headers):
+            self.assertEqual(headers["X-Request"], str(i))
+            self.assertEqual(headers["Authorization"], "Bearer token")
+            self.assertEqual(headers.get("Content-Type") == "application/json", bool(i % 2))
+        self.assertGreater(len(adapter.threads), 1)
+        self.assertEqual(dict(session.headers), session_headers)
+        self.assertEqual(registry.get("POST", "spaces/{space}/sandbox").requests, 200)
+        self.assertEqual(registry.get("GET", "spaces/{space}/sandbox/{sandbox_id}").requests, 200)
+
+    @patch("colony.session.registry", new_callable=SessionRegistry)
+    def test_clients_share_pooled_session_of_host(self, registry):
+        with ColonyClient(account="acc", token="a") as first, ColonyClient(account="acc", token="b") as second:
+            other = ColonyClient(account="other")
+            self.assertIs(first.session, second.session)
+            self.assertIsNot(first.session, other.session)
+            session = first.session
+
+        # closing clients leaves the pooled session open for other clients of the host
+        self.assertIsNone(first.session)
+        self.assertIs(ColonyClient(account="acc").session, session)
+        with patch.object(session, "close") as close_mock:
+            registry.close()
+        close_mock.assert_called_once()
+
+    def test_client_closes_given_session(self):
+        session = Mock()
+
+        with ColonyClient(space="dev", session=session) as client:
+            pass
+
+        session.close.assert_called_once()
+        with self.assertRaises(ValueError):
+            client.request("spaces/dev/sandbox")
+
+    def test_token_is_sent_with_each_request(self):
+        session = Mock(headers={})
+        session.request.return_value = Mock(status_code=200, content=b"{}")
+        client = ColonyClient(space="dev", token="token", session=session)
+
+        client.request("spaces/dev/sandbox")
+
+        self.assertEqual(session.request.call_args[1]["headers"], {"Authorization": "Bearer token"})
+        self.assertEqual(session.headers, {})
+
 
 if __name__ == "__main__":
     unittest.main()
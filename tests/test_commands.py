@@ -1,3 +1,6 @@
+import io
+import json
+import threading
 import unittest
 from unittest import mock
 from unittest.mock import Mock, patch
@@ -9,6 +12,7 @@ from colony.commands.bp import BlueprintsCommand
 from colony.commands.configure import ConfigureCommand
 from colony.commands.sb import SandboxesCommand
 from colony.exceptions import ConfigFileMissingError
+from colony.models.sandbox_table import SandboxTable
 
 
 class TestBaseCommand(unittest.TestCase):
@@ -36,11 +40,55 @@ class TestBaseCommand(unittest.TestCase):
     def test_execute_raises_error(self):
         self.assertRaises(DocoptExit, self.command.execute)
 
+    def test_output_mode_applies_to_running_command_only(self):
+        # arrange
+        seen = []
+
+        class ModeCommand(BaseCommand):
+            """
+            usage: colony mode
+            """
+
+            def get_actions_table(self) -> dict:
+                return {"mode": self.do_mode}
+
+            def do_mode(self) -> bool:
+                if self.output.is_machine_readable:
+                    # a table command runs in another thread while this one is running
+                    thread = threading.Thread(target=ModeCommand(["mode"]).execute)
+                    thread.start()
+                    thread.join()
+                seen.append(BaseCommand.is_machine_output())
+                return True
+
+        # act
+        ModeCommand(["mode"], output_format="json").execute()
+        ModeCommand(["mode"]).execute()
+
+        # assert
+        self.assertEqual(seen, [False, True, False])
+        self.assertFalse(BaseCommand.is_machine_output())
+
+    @patch("colony.commands.base.BlueprintRepo.save_command_caches")
+    def test_execute_saves_repo_caches(self, save_mock):
+        class FailingCommand(BaseCommand):
+            """
+            usage: colony fail
+            """
+
+            def get_actions_table(self) -> dict:
+                return {"fail": Mock(side_effect=ValueError("failed"))}
+
+        with self.assertRaises(ValueError):
+            FailingCommand(["fail"]).execute()
+
+        save_mock.assert_called_once()
+
 
 class TestBlueprintCommand(unittest.TestCase):
     def test_base_help_usage_line(self):
         expected_usage = """usage:
-        colony (bp | blueprint) validate <name> [options]
+        colony (bp | blueprint) validate (<name> | --all | --changed [<base>]) [options]
         colony (bp | blueprint) [--help]"""
 
         with self.assertRaises(DocoptExit) as ctx:
@@ -60,6 +108,119 @@ class TestBlueprintCommand(unittest.TestCase):
         command = BlueprintsCommand(command_args=args)
         self.assertRaises(DocoptExit, command.do_validate)
 
+    @patch("colony.commands.bp.BlueprintLinter")
+    @patch("colony.commands.bp.ValidationCache")
+    @patch("colony.commands.bp.ContextBranch")
+    @patch("colony.commands.bp.get_and_check_folder_based_repo")
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_do_validate_all(self, stdout, get_repo, context_branch, cache, linter):
+        # arrange
+        linter.return_value.lint.return_value = []
+        cache.return_value.is_valid.return_value = False
+        get_repo.return_value.find_blueprints.return_value = ["bp1", "bp2"]
+        context_branch.return_value.__enter__.return_value.validation_branch = "temp-branch"
+        command = BlueprintsCommand("bp validate --all".split(), output_format="ndjson")
+        command.manager = Mock()
+        command.manager.validate.side_effect = [Mock(errors=[]), Mock(errors=[{"name": "err", "message": "msg"}])]
+
+        # act
+        result = command.do_validate()
+
+        # assert
+        self.assertFalse(result)
+        # a single context branch is shared by all validations
+        context_branch.assert_called_once()
+        records = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual([(r["blueprint"], r["valid"]) for r in records], [("bp1", True), ("bp2", False)])
+
+    @patch("colony.commands.bp.BlueprintLinter")
+    @patch("colony.commands.bp.ValidationCache")
+    @patch("colony.commands.bp.ContextBranch")
+    @patch("colony.commands.bp.get_and_check_folder_based_repo")
+    def test_do_validate_cached(self, get_repo, context_branch, cache, linter):
+        # arrange
+        linter.return_value.lint.return_value = []
+        cache.return_value.is_valid.return_value = True
+        command = BlueprintsCommand("bp validate test".split())
+        command.manager = Mock()
+
+        # act
+        result = command.do_validate()
+
+        # assert
+        self.assertTrue(result)
+        context_branch.assert_not_called()
+        command.manager.validate.assert_not_called()
+
+    @patch("colony.commands.bp.BlueprintLinter")
+    @patch("colony.commands.bp.ValidationCache")
+    @patch("colony.commands.bp.ContextBranch")
+    @patch("colony.commands.bp.get_and_check_folder_based_repo")
+    def test_do_validate_no_cache(self, get_repo, context_branch, cache, linter):
+        # arrange
+        linter.return_value.lint.return_value = []
+        cache.return_value.is_valid.return_value = True
+        context_branch.return_value.__enter__.return_value.validation_branch = "temp-branch"
+        command = BlueprintsCommand("bp validate test --no-cache".split())
+        command.manager = Mock()
+        command.manager.validate.return_value = Mock(errors=[])
+
+        # act
+        result = command.do_validate()
+
+        # assert
+        self.assertTrue(result)
+        command.manager.validate.assert_called_once()
+        cache.return_value.update.assert_called_once_with(cache.return_value.make_key.return_value, "test", True)
+
+    @patch("colony.commands.bp.ContextBranch")
+    @patch("colony.commands.bp.get_and_check_folder_based_repo")
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_do_validate_all_lint_errors(self, stdout, get_repo, context_branch):
+        # arrange
+        get_repo.return_value.find_blueprints.return_value = ["bp1", "bp2"]
+        get_repo.return_value.get_blueprint_yaml.side_effect = [{"clouds": None}, {"clouds": None}]
+        command = BlueprintsCommand("bp validate --all".split(), output_format="ndjson")
+        command.manager = Mock()
+
+        # act
+        with patch("colony.commands.bp.ValidationCache"):
+            result = command.do_validate()
+
+        # assert
+        self.assertFalse(result)
+        # blueprints failed offline checks are never pushed
+        context_branch.assert_not_called()
+        command.manager.validate.assert_not_called()
+        records = [json.loads(line) for line in stdout.getvalue().splitlines()]
+        self.assertEqual([r["errors"][0]["name"] for r in records], ["Missing clouds", "Missing clouds"])
+
+    @patch("colony.commands.bp.BlueprintImpactIndex")
+    @patch("colony.commands.bp.get_and_check_folder_based_repo")
+    def test_do_validate_changed_nothing_affected(self, get_repo, impact_index):
+        # arrange
+        get_repo.return_value.get_changed_files.return_value = ["README.md"]
+        impact_index.return_value.get_affected_blueprints.return_value = []
+        command = BlueprintsCommand("bp validate --changed main".split())
+        command.manager = Mock()
+
+        # act
+        result = command.do_validate()
+
+        # assert
+        self.assertTrue(result)
+        get_repo.return_value.get_changed_files.assert_called_once_with("main")
+        impact_index.return_value.get_affected_blueprints.assert_called_once_with(["README.md"])
+        command.manager.validate.assert_not_called()
+
+    @patch("colony.commands.bp.get_and_check_folder_based_repo")
+    def test_do_validate_glob_without_matches(self, get_repo):
+        get_repo.return_value.find_blueprints.return_value = []
+        command = BlueprintsCommand(["bp", "validate", "promo-*"])
+
+        self.assertFalse(command.do_validate())
+        get_repo.return_value.find_blueprints.assert_called_once_with("promo-*")
+
 
 class TestSandboxCommand(unittest.TestCase):
     def test_base_help_usage_line(self):
@@ -67,7 +228,10 @@ class TestSandboxCommand(unittest.TestCase):
         colony (sb | sandbox) start <blueprint_name> [options]
         colony (sb | sandbox) status <sandbox_id>
         colony (sb | sandbox) end <sandbox_id>
-        colony (sb | sandbox) list [--filter={all|my|auto}] [--show-ended] [--count=<N>]
+        colony (sb | sandbox) list [--filter={all|my|auto}] [--show-ended] [--count=<N>] [--sort=<column>]
+                                   [--group-by=<column>] [--where=<conditions>]
+        colony (sb | sandbox) watch [--filter={all|my|auto}] [--show-ended] [--count=<N>] [--where=<conditions>]
+                                    [--interval=<seconds>] [--timeout=<minutes>]
         colony (sb | sandbox) [--help]"""
 
         with self.assertRaises(DocoptExit) as ctx:
@@ -78,10 +242,78 @@ class TestSandboxCommand(unittest.TestCase):
     def test_actions_table(self):
         args = "sb start test".split()
         command = SandboxesCommand(command_args=args)
-        expected_actions = ["start", "end", "status", "list"]
+        expected_actions = ["start", "end", "status", "list", "watch"]
         for action in command.get_actions_table():
             self.assertIn(action, expected_actions)
 
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_status_json_output(self, stdout):
+        # arrange
+        command = SandboxesCommand("sb status sb1".split(), output_format="json")
+        command.manager = Mock()
+        command.manager.get.return_value = Mock(sandbox_status="Active")
+
+        # act
+        result = command.do_status()
+
+        # assert
+        self.assertTrue(result)
+        self.assertEqual(json.loads(stdout.getvalue()), {"id": "sb1", "status": "Active"})
+
+    def make_list_command(self, args: list) -> SandboxesCommand:
+        command = SandboxesCommand(args, output_format="json")
+        command.manager = Mock()
+        command.manager.list_table.return_value = SandboxTable.from_json(
+            [
+                {
+                    "id": sandbox_id,
+                    "name": sandbox_id,
+                    "blueprint_name": "bp",
+                    "sandbox_status": "Launching",
+                    "launching_progress": {"creating_infrastructure": {"status": status, "total": 0}},
+                }
+                for sandbox_id, status in (("sb1", "Pending"), ("sb2", "Done"), ("sb3", "Done"))
+            ]
+        )
+        return command
+
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_list_json_output_contains_progress(self, stdout):
+        result = self.make_list_command(["sb", "list", "--sort=-progress"]).do_list()
+
+        self.assertTrue(result)
+        records = json.loads(stdout.getvalue())
+        self.assertEqual(list(records[0]), ["id", "name", "blueprint", "status", "owner", "progress"])
+        self.assertEqual(
+            [record["progress"] for record in records], ["infrastructure Pending"] + ["infrastructure Done"] * 2
+        )
+
+    @patch("sys.stdout", new_callable=io.StringIO)
+    def test_list_group_by_progress(self, stdout):
+        result = self.make_list_command(
+            ["sb", "list", "--group-by=progress", "--where=progress=infrastructure Done"]
+        ).do_list()
+
+        self.assertTrue(result)
+        self.assertEqual(json.loads(stdout.getvalue()), [{"progress": "infrastructure Done", "count": 2}])
+
+    @patch("colony.commands.sb.ContextBranch")
+    @patch("colony.commands.sb.get_and_check_folder_based_repo")
+    def test_start_lint_errors(self, get_repo, context_branch):
+        # arrange
+        get_repo.return_value.get_blueprint_yaml.return_value = {"clouds": ["aws"], "services": ["db"]}
+        get_repo.return_value.working_dir = "/not/existing/dir"
+        command = SandboxesCommand("sb start test".split())
+        command.manager = Mock()
+
+        # act
+        result = command.do_start()
+
+        # assert
+        self.assertFalse(result)
+        context_branch.assert_not_called()
+        command.manager.start.assert_not_called()
+
     def validate_command_input(self, input_line: str, func: str) -> None:
         args = input_line.split()
         try:
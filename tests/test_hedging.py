@@ -0,0 +1,113 @@
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+
+from requests.exceptions import ConnectionError
+
+from colony.client import ColonyClient
+from colony.services.hedging import MIN_SAMPLES, HedgeBudget, HedgePolicy
+from colony.services.metrics import Histogram, MetricsRegistry
+
+
+class SlowFirstRequest(object):
+    """Sends requests where the first one is slow and the rest are fast"""
+
+    def __init__(self, slow_for: float = 0.5, first_error: Exception = None):
+        self.slow_for = slow_for
+        self.first_error = first_error
+        self.responses = []
+        self._lock = threading.Lock()
+
+    def __call__(self, **request_args):
+        with self._lock:
+            response = Mock(status_code=200, content=b"{}", attempt=len(self.responses))
+            self.responses.append(response)
+        if response.attempt == 0:
+            time.sleep(self.slow_for)
+            if self.first_error:
+                raise self.first_error
+        return response
+
+
+class TestHedgePolicy(unittest.TestCase):
+    def make_policy(self, **kwargs) -> HedgePolicy:
+        return HedgePolicy(default_delay=0.05, hedge_budget=HedgeBudget(**kwargs))
+
+    def test_fast_request_is_not_hedged(self):
+        send_request = Mock(return_value=Mock(status_code=200))
+
+        response, hedged = self.make_policy().send(send_request)
+
+        self.assertFalse(hedged)
+        self.assertIs(response, send_request.return_value)
+        send_request.assert_called_once()
+
+    def test_slow_request_is_hedged(self):
+        # arrange
+        send_request = SlowFirstRequest(slow_for=0.2)
+
+        # act
+        response, hedged = self.make_policy().send(send_request)
+
+        # assert
+        self.assertTrue(hedged)
+        self.assertEqual(response.attempt, 1)
+        time.sleep(0.3)
+        send_request.responses[0].close.assert_called_once()
+        response.close.assert_not_called()
+
+    def test_hedged_request_is_used_when_first_fails(self):
+        send_request = SlowFirstRequest(slow_for=0.1, first_error=ConnectionError())
+
+        response, hedged = self.make_policy().send(send_request)
+
+        self.assertTrue(hedged)
+        self.assertEqual(response.attempt, 1)
+
+    def test_budget_caps_hedged_requests(self):
+        policy = self.make_policy(ratio=0, burst=1)
+
+        results = [policy.send(SlowFirstRequest(slow_for=0.1)) for _ in range(3)]
+
+        self.assertEqual([hedged for _, hedged in results], [True, False, False])
+        self.assertEqual([response.attempt for response, _ in results], [1, 0, 0])
+
+    def test_hedged_request_takes_rate_limit_token(self):
+        policy = self.make_policy(ratio=0, burst=1)
+        rate_limiter = Mock()
+        rate_limiter.try_acquire.side_effect = [False, True]
+
+        results = [policy.send(SlowFirstRequest(slow_for=0.1), rate_limiter=rate_limiter) for _ in range(2)]
+
+        # the hedge refused by the rate limiter has not used up the budget
+        self.assertEqual([hedged for _, hedged in results], [False, True])
+        self.assertEqual(rate_limiter.try_acquire.call_count, 2)
+
+    def test_delay_follows_endpoint_latency(self):
+        policy = HedgePolicy(default_delay=1.0)
+        latency = Histogram()
+        for i in range(MIN_SAMPLES):
+            latency.observe(0.01 if i % 2 else 0.2)
+
+        self.assertEqual(policy.get_delay(None), 1.0)
+        self.assertEqual(policy.get_delay(latency), 0.2)
+
+    def test_client_hedges_gets_only(self):
+        # arrange
+        session = Mock()
+        session.request.side_effect = SlowFirstRequest(slow_for=0.2)
+        registry = MetricsRegistry()
+        client = ColonyClient(space="dev", session=session, metrics_registry=registry, hedging=self.make_policy())
+
+        # act
+        client.request("spaces/dev/sandbox/abc")
+        client.request("spaces/dev/sandbox", method="POST")
+
+        # assert
+        self.assertEqual(session.request.call_count, 3)
+        self.assertEqual(registry.get("GET", "spaces/{space}/sandbox/{sandbox_id}").requests, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import tempfile
+import unittest
+
+from colony.services.impact import BlueprintImpactIndex
+from colony.utils import BlueprintRepo
+from tests.helpers.repo_utils import create_blueprint_repo
+
+WEB_BLUEPRINT = """
+clouds:
+  - AWS: eu-west-1
+artifacts:
+  - web-app: artifacts/web.tar.gz
+applications:
+  - web-app:
+      instances: 1
+services:
+  - queue:
+"""
+
+API_BLUEPRINT = """
+clouds:
+  - AWS: eu-west-1
+applications:
+  - api
+services:
+  - queue:
+"""
+
+
+class TestBlueprintImpactIndex(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        create_blueprint_repo(
+            self.temp_dir.name,
+            {
+                "blueprints/web.yaml": WEB_BLUEPRINT,
+                "blueprints/api.yaml": API_BLUEPRINT,
+                "blueprints/broken.yaml": "clouds: [aws",
+                "applications/web-app/web-app.yaml": "kind: application",
+                "applications/api/api.yaml": "kind: application",
+                "services/queue/queue.yaml": "kind: service",
+            },
+        )
+        self.repo = BlueprintRepo(self.temp_dir.name)
+        self.index = BlueprintImpactIndex(self.repo)
+
+    def tearDown(self):
+        self.repo.close()
+        self.temp_dir.cleanup()
+
+    def test_references(self):
+        self.assertEqual(
+            self.index.references["web"],
+            {
+                "file": "blueprints/web.yaml",
+                "applications": ["web-app"],
+                "services": ["queue"],
+                "artifacts": {"web-app": "artifacts/web.tar.gz"},
+            },
+        )
+        self.assertEqual(self.index.references["broken"]["file"], "blueprints/broken.yaml")
+
+    def test_blueprint_file_change(self):
+        self.assertEqual(self.index.get_affected_blueprints(["blueprints/broken.yaml"]), ["broken"])
+
+    def test_application_file_change(self):
+        self.assertEqual(self.index.get_affected_blueprints(["applications/api/scripts/init.sh"]), ["api"])
+
+    def test_shared_service_change(self):
+        self.assertEqual(self.index.get_affected_blueprints(["services/queue/queue.yaml"]), ["api", "web"])
+
+    def test_unrelated_change(self):
+        self.assertEqual(self.index.get_affected_blueprints(["README.md", "applications/api.yaml"]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
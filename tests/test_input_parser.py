@@ -3,6 +3,8 @@ import unittest
 from unittest import mock
 from unittest.mock import Mock
 
+from docopt import DocoptExit
+
 from colony.parsers.global_input_parser import GlobalInputParser
 
 
@@ -158,6 +160,47 @@ class TestGlobalInputParser(unittest.TestCase):
         # assert
         self.assertIsNone(debug)
 
+    def test_get_output_default(self):
+        # arrange
+        args = {}
+        input_parser = GlobalInputParser(args)
+
+        # act
+        output = input_parser.output
+
+        # assert
+        self.assertEqual(output, "table")
+
+    @mock.patch.dict(os.environ, {"COLONY_OUTPUT": "ndjson"})
+    def test_get_output_from_env_var(self):
+        # arrange
+        args = {}
+        input_parser = GlobalInputParser(args)
+
+        # act
+        output = input_parser.output
+
+        # assert
+        self.assertEqual(output, "ndjson")
+
+    def test_get_output_wrong_value(self):
+        # arrange
+        args = {"--output": "xml"}
+        input_parser = GlobalInputParser(args)
+
+        # act & assert
+        with self.assertRaises(DocoptExit):
+            _ = input_parser.output
+
+    def test_get_profiler_wrong_value(self):
+        # arrange
+        args = {"--profiler": "io"}
+        input_parser = GlobalInputParser(args)
+
+        # act & assert
+        with self.assertRaises(DocoptExit):
+            _ = input_parser.profiler
+
     def test_get_command_from_args(self):
         # arrange
         command_mock = Mock()
@@ -0,0 +1,88 @@
+import tempfile
+import unittest
+
+from colony.services.linter import BlueprintLinter
+from colony.utils import BlueprintRepo
+from tests.helpers.repo_utils import create_blueprint_repo, write_repo_files
+
+VALID_BLUEPRINT = """
+clouds:
+  - AWS: eu-west-1
+inputs:
+  - PORT: 8080
+  - DB_PASS:
+      display_style: masked
+  - USER
+artifacts:
+  - web-app: artifacts/web.tar.gz
+applications:
+  - web-app:
+      instances: 1
+services:
+  - queue:
+      inputs:
+        - SIZE: small
+"""
+
+
+class TestBlueprintLinter(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = self.temp_dir.name
+        create_blueprint_repo(
+            self.path,
+            {
+                "blueprints/bp.yaml": VALID_BLUEPRINT,
+                "applications/web-app/web-app.yaml": "kind: application",
+                "services/queue/queue.yaml": "kind: service",
+            },
+        )
+        self.repo = BlueprintRepo(self.path)
+        self.linter = BlueprintLinter(self.repo)
+
+    def tearDown(self):
+        self.repo.close()
+        self.temp_dir.cleanup()
+
+    def lint(self, content: str) -> list:
+        write_repo_files(self.path, {"blueprints/bp.yaml": content})
+        return self.linter.lint("bp")
+
+    def test_valid_blueprint(self):
+        self.assertEqual(self.linter.lint("bp"), [])
+
+    def test_invalid_yaml(self):
+        errors = self.lint("clouds: [aws")
+        self.assertEqual([err["name"] for err in errors], ["Invalid YAML"])
+
+    def test_not_a_mapping(self):
+        errors = self.lint("- aws")
+        self.assertEqual([err["name"] for err in errors], ["Invalid blueprint structure"])
+
+    def test_section_is_not_a_list(self):
+        errors = self.lint("clouds:\n  - aws\napplications:\n  web-app: {}\n")
+        self.assertEqual(errors, [{"name": "Invalid blueprint structure", "message": "'applications' must be a list"}])
+
+    def test_missing_clouds(self):
+        errors = self.lint("applications:\n  - web-app\n")
+        self.assertEqual([err["name"] for err in errors], ["Missing clouds"])
+
+    def test_invalid_cloud(self):
+        errors = self.lint("clouds:\n  - aws: eu-west-1\n    gcp: us-east1\n")
+        self.assertEqual([err["name"] for err in errors], ["Invalid cloud"])
+
+    def test_duplicate_inputs(self):
+        errors = self.lint("clouds:\n  - aws\ninputs:\n  - PORT\n  - PORT: 80\n")
+        self.assertEqual(errors, [{"name": "Duplicate input", "message": "Input 'PORT' is declared more than once"}])
+
+    def test_artifact_without_application(self):
+        errors = self.lint("clouds:\n  - aws\nartifacts:\n  - web-app: path\n")
+        self.assertEqual([err["name"] for err in errors], ["Unknown artifact"])
+
+    def test_missing_application_and_service_folders(self):
+        errors = self.lint("clouds:\n  - aws\napplications:\n  - api\nservices:\n  - cache: {}\n")
+        self.assertEqual([err["name"] for err in errors], ["Unknown application", "Unknown service"])
+
+
+if __name__ == "__main__":
+    unittest.main()
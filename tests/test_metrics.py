@@ -0,0 +1,102 @@
+import io
+import os
+import tempfile
+import unittest
+
+from colony.services.metrics import NO_RESPONSE, Histogram, MetricsRegistry
+
+
+class TestHistogram(unittest.TestCase):
+    def test_observe(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.counts, [1, 2, 1])
+        self.assertEqual(histogram.cumulative_counts(), [1, 3, 4])
+        self.assertEqual(histogram.count, 4)
+        self.assertEqual(histogram.max, 3.0)
+        self.assertAlmostEqual(histogram.sum, 4.25)
+
+    def test_quantile(self):
+        histogram = Histogram(buckets=(0.1, 1.0))
+        self.assertEqual(histogram.quantile(0.5), 0.0)
+
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.quantile(0.5), 1.0)
+        self.assertEqual(histogram.quantile(0.95), 3.0)
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.registry.record("GET", "spaces/{space}/sandbox/{sandbox_id}", 200, 0.2, response_bytes=100)
+        self.registry.record("GET", "spaces/{space}/sandbox/{sandbox_id}", 200, 0.4, response_bytes=50, retries=1)
+        self.registry.record("GET", "spaces/{space}/sandbox/{sandbox_id}", 404, 0.1, response_bytes=10)
+        self.registry.record("POST", "spaces/{space}/sandbox", NO_RESPONSE, 5.0, request_bytes=30)
+
+    def test_record(self):
+        metrics = self.registry.get("GET", "spaces/{space}/sandbox/{sandbox_id}")
+
+        self.assertEqual(metrics.requests, 3)
+        self.assertEqual(metrics.errors, 1)
+        self.assertEqual(metrics.statuses, {"200": 2, "404": 1})
+        self.assertEqual(metrics.retries, 1)
+        self.assertEqual(metrics.response_bytes, 160)
+        self.assertEqual(self.registry.get("POST", "spaces/{space}/sandbox").errors, 1)
+
+    def test_snapshot(self):
+        snapshot = self.registry.snapshot()
+
+        self.assertEqual(list(snapshot), ["GET spaces/{space}/sandbox/{sandbox_id}", "POST spaces/{space}/sandbox"])
+        self.assertEqual(snapshot["POST spaces/{space}/sandbox"]["request_bytes"], 30)
+        self.assertEqual(snapshot["POST spaces/{space}/sandbox"]["latency_buckets"]["+Inf"], 1)
+
+    def test_reset(self):
+        self.registry.reset()
+        self.assertEqual(self.registry.snapshot(), {})
+
+    def test_write_summary(self):
+        stream = io.StringIO()
+
+        self.registry.write_summary(stream)
+
+        lines = stream.getvalue().splitlines()
+        self.assertTrue(lines[0].strip().startswith("Requests:"))
+        self.assertEqual(lines[1].split()[:4], ["GET", "spaces/{space}/sandbox/{sandbox_id}", "3", "1"])
+        self.assertEqual(len(lines), 3)
+
+    def test_write_prometheus(self):
+        stream = io.StringIO()
+
+        self.registry.write_prometheus(stream)
+
+        lines = stream.getvalue().splitlines()
+        self.assertIn(
+            'colony_http_requests_total{method="GET",endpoint="spaces/{space}/sandbox/{sandbox_id}",status="404"} 1',
+            lines,
+        )
+        self.assertIn(
+            'colony_http_request_duration_seconds_bucket{method="GET",endpoint="spaces/{space}/sandbox/{sandbox_id}",'
+            'le="0.25"} 2',
+            lines,
+        )
+        self.assertIn('colony_http_retries_total{method="POST",endpoint="spaces/{space}/sandbox"} 0', lines)
+        self.assertIn("# TYPE colony_http_response_bytes_total counter", lines)
+
+    def test_save_prometheus_textfile(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "colony.prom")
+
+            self.registry.save_prometheus_textfile(path)
+
+            self.assertEqual(os.listdir(tmp_dir), ["colony.prom"])
+            with open(path) as textfile:
+                self.assertIn("colony_http_requests_total", textfile.read())
+
+
+if __name__ == "__main__":
+    unittest.main()
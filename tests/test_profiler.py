@@ -0,0 +1,71 @@
+import io
+import os
+import pstats
+import tempfile
+import unittest
+
+from colony.services.profiler import CommandProfiler, collapse_stacks
+
+
+def build_list(size: int) -> list:
+    return [str(i) * 10 for i in range(size)]
+
+
+class TestCommandProfiler(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.stream = io.StringIO()
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_wrong_mode(self):
+        with self.assertRaises(ValueError):
+            CommandProfiler("io")
+
+    def test_cpu_profile(self):
+        profiler = CommandProfiler("cpu", self.temp_dir.name, top=5)
+        with profiler:
+            build_list(10000)
+
+        paths = profiler.write_reports(self.stream)
+
+        self.assertEqual([os.path.splitext(path)[1] for path in paths], [".pstats", ".folded"])
+        self.assertIn("build_list", self.stream.getvalue())
+        pstats.Stats(paths[0])
+        with open(paths[1]) as folded:
+            self.assertTrue(any("build_list (test_profiler.py" in line for line in folded))
+
+    def test_memory_profile(self):
+        profiler = CommandProfiler("mem", self.temp_dir.name, top=3)
+        with profiler:
+            data = build_list(10000)
+
+        paths = profiler.write_reports(self.stream)
+
+        self.assertEqual(len(data), 10000)
+        self.assertTrue(paths[0].endswith(".txt"))
+        self.assertIn("test_profiler.py", self.stream.getvalue())
+
+
+class TestCollapseStacks(unittest.TestCase):
+    def test_collapse_stacks(self):
+        main = ("main.py", 1, "main")
+        parse = ("yaml.py", 10, "parse")
+        render = ("view.py", 20, "render")
+        stats = {
+            main: (1, 1, 0.1, 1.0, {}),
+            parse: (2, 2, 0.4, 0.6, {main: (2, 2, 0.4, 0.6), render: (1, 1, 0.1, 0.15)}),
+            render: (1, 1, 0.2, 0.3, {main: (1, 1, 0.2, 0.3)}),
+        }
+
+        stacks = collapse_stacks(stats)
+
+        self.assertEqual(stacks["main (main.py:1)"], 100000)
+        self.assertEqual(stacks["main (main.py:1);parse (yaml.py:10)"], 400000)
+        self.assertEqual(stacks["main (main.py:1);render (view.py:20)"], 200000)
+        self.assertIn("main (main.py:1);render (view.py:20);parse (yaml.py:10)", stacks)
+
+
+if __name__ == "__main__":
+    unittest.main()
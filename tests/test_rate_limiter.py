@@ -0,0 +1,97 @@
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from docopt import DocoptExit
+
+from colony.client import ColonyClient
+from colony.parsers.global_input_parser import GlobalInputParser
+from colony.services.rate_limiter import RateLimiter
+
+
+def reserve_tokens(path: str, count: int) -> tuple:
+    """Returns the time the process started reserving and the latest time when one of its requests may be sent"""
+    limiter = RateLimiter(100, "acc", "dev", burst=1, path=path)
+    start = time.time()
+    delays = [limiter.reserve() for _ in range(count)]
+    return start, time.time() + delays[-1]
+
+
+class TestRateLimiter(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def make_limiter(self, space: str = "dev") -> RateLimiter:
+        return RateLimiter(10, "acc", space, burst=2, path=self.tmp_dir.name)
+
+    def test_requests_wait_in_turn_after_burst(self):
+        limiter = self.make_limiter()
+
+        delays = [limiter.reserve() for _ in range(4)]
+
+        self.assertEqual(delays[:2], [0, 0])
+        self.assertAlmostEqual(delays[2], 0.1, delta=0.02)
+        self.assertAlmostEqual(delays[3], 0.2, delta=0.02)
+
+    def test_try_acquire_does_not_queue(self):
+        limiter = self.make_limiter()
+
+        acquired = [limiter.try_acquire() for _ in range(3)]
+
+        self.assertEqual(acquired, [True, True, False])
+        # the refused request has not taken a token which the next one would wait for
+        self.assertAlmostEqual(limiter.reserve(), 0.1, delta=0.02)
+
+    def test_bucket_is_shared_by_account_and_space(self):
+        self.make_limiter().reserve()
+        self.make_limiter().reserve()
+
+        self.assertGreater(self.make_limiter().reserve(), 0)
+        self.assertEqual(self.make_limiter(space="prod").reserve(), 0)
+
+    def test_bucket_is_shared_by_processes(self):
+        with multiprocessing.Pool(4) as pool:
+            results = pool.starmap(reserve_tokens, [(self.tmp_dir.name, 5)] * 4)
+
+        # with a bucket of one token the 20 requests of all processes are sent 10ms apart
+        first_start = min(start for start, _ in results)
+        last_send = max(send_time for _, send_time in results)
+        self.assertGreater(last_send - first_start, 0.185)
+        self.assertEqual(len(os.listdir(self.tmp_dir.name)), 1)
+
+    @patch("colony.services.rate_limiter.span")
+    @patch("colony.services.rate_limiter.time.sleep")
+    def test_acquire_records_wait(self, sleep_mock, span_mock):
+        limiter = self.make_limiter()
+
+        waits = [limiter.acquire() for _ in range(3)]
+
+        sleep_mock.assert_called_once_with(waits[2])
+        span_mock.assert_called_once()
+        self.assertEqual(span_mock.call_args[0][0], "rate limit wait")
+
+    def test_client_waits_for_limiter(self):
+        session = Mock()
+        session.request.return_value = Mock(status_code=200, content=b"{}")
+        limiter = Mock()
+        client = ColonyClient(space="dev", session=session, rate_limiter=limiter)
+
+        client.request("spaces")
+
+        limiter.acquire.assert_called_once()
+
+    def test_get_rate_limit(self):
+        with patch.dict(os.environ, {"COLONY_RATE_LIMIT": "2.5"}):
+            self.assertEqual(GlobalInputParser.get_rate_limit(), 2.5)
+        with patch.dict(os.environ, {"COLONY_RATE_LIMIT": "fast"}), self.assertRaises(DocoptExit):
+            GlobalInputParser.get_rate_limit()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import io
+import unittest
+from unittest.mock import MagicMock, Mock, patch
+
+from docopt import DocoptExit
+
+from colony.commands.sb import SandboxesCommand
+from colony.models.connection import ColonyConnection
+from colony.services.repl import ColonyRepl, collect_identifiers, get_options, get_subcommands
+
+
+class TestColonyRepl(unittest.TestCase):
+    def setUp(self):
+        self.connection = ColonyConnection(space="dev", token="token", account="acc")
+        self.client = MagicMock()
+        self.command_class = Mock()
+        self.stdout = io.StringIO()
+        with patch("colony.services.repl.BlueprintRepo"):
+            self.repl = ColonyRepl(
+                {"sb": SandboxesCommand, "test": self.command_class},
+                self.connection,
+                self.client,
+                history_path=None,
+            )
+        self.repl.stdout = self.stdout
+
+    def test_commands_share_client(self):
+        # act
+        self.repl.onecmd("test run 'quoted arg'")
+        self.repl.onecmd("test run")
+
+        # assert
+        self.assertEqual(self.command_class.call_count, 2)
+        self.command_class.assert_called_with(["test", "run"], self.connection, None, client=self.client)
+        self.assertEqual(self.command_class.call_args_list[0][0][0], ["test", "run", "quoted arg"])
+
+    def test_wrong_usage_does_not_stop_shell(self):
+        self.command_class.return_value.execute.side_effect = DocoptExit("usage: colony test")
+
+        stop = self.repl.onecmd("test")
+
+        self.assertFalse(stop)
+        self.assertIn("usage: colony test", self.stdout.getvalue())
+
+    def test_exit(self):
+        self.assertTrue(self.repl.onecmd("exit"))
+        self.assertTrue(self.repl.onecmd("EOF"))
+        self.assertFalse(self.repl.onecmd(""))
+
+    def test_complete_command_names(self):
+        self.assertEqual(self.repl.completenames("s"), ["sb"])
+
+    @patch("colony.services.repl.BlueprintRepo")
+    def test_complete_arguments(self, repo_class_mock):
+        # arrange
+        repo_class_mock.get_open_repo.return_value = Mock(blueprints={"web-app": "", "other": ""})
+        response = Mock(headers={"Content-Type": "application/json"})
+        response.json.return_value = [{"id": "wd5k3", "blueprint_name": "web-db", "sandbox_status": "Active"}]
+        self.repl._collect_completions(response)
+
+        # act & assert
+        self.assertEqual(self.repl.completedefault("st", "sb st", 3, 5), ["start", "status"])
+        self.assertEqual(self.repl.completedefault("w", "sb status w", 10, 11), ["wd5k3", "web-app", "web-db"])
+        self.assertIn("--wait_active", self.repl.completedefault("--w", "sb start bp --w", 12, 15))
+
+    def test_collect_identifiers(self):
+        sandbox_ids = set()
+        blueprint_names = set()
+
+        collect_identifiers(
+            [{"id": "sb1", "blueprint_name": "bp1", "sandbox_status": "Active"}, {"id": "x", "blueprint_name": "bp2"}],
+            sandbox_ids,
+            blueprint_names,
+        )
+
+        self.assertEqual(sandbox_ids, {"sb1"})
+        self.assertEqual(blueprint_names, {"bp1", "bp2"})
+
+    def test_get_subcommands_and_options(self):
+        self.assertTrue({"start", "status", "end", "list", "watch"} <= get_subcommands(SandboxesCommand))
+        self.assertIn("--show-ended", get_options(SandboxesCommand))
+
+
+if __name__ == "__main__":
+    unittest.main()
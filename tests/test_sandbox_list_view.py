@@ -0,0 +1,57 @@
+import io
+import unittest
+
+from colony.models.sandbox_table import SandboxTable
+from colony.view.sandbox_list_view import SandboxListView
+
+
+class TestSandboxListView(unittest.TestCase):
+    def setUp(self) -> None:
+        self.table = SandboxTable.from_json(
+            [
+                {"id": "sb1", "name": "first", "blueprint_name": "bp", "sandbox_status": "Active"},
+                {"id": "sb2", "name": "second", "blueprint_name": "bp", "sandbox_status": "Launching"},
+            ]
+        )
+
+    def test_write_empty_table(self):
+        stream = io.StringIO()
+        SandboxListView(SandboxTable()).write(stream)
+        self.assertEqual(stream.getvalue(), "")
+
+    def test_write(self):
+        expected_result = """Sandbox ID    Sandbox Name    Blueprint Name    Status
+------------  --------------  ----------------  ---------
+sb1           first           bp                Active
+sb2           second          bp                Launching
+"""
+        stream = io.StringIO()
+        SandboxListView(self.table).write(stream)
+        self.assertEqual(stream.getvalue(), expected_result)
+
+    def test_write_widths_from_sample(self):
+        table = SandboxTable.from_json(
+            [
+                {"id": "sb1", "name": "short", "blueprint_name": "bp"},
+                {"id": "sb2", "name": "much-longer-name", "blueprint_name": "bp"},
+            ]
+        )
+        view = SandboxListView(table, columns=[SandboxTable.NAME, SandboxTable.ID])
+        view.SAMPLE_SIZE = 1
+        stream = io.StringIO()
+        view.write(stream)
+        self.assertEqual(stream.getvalue().splitlines()[-1], "much-longer-name  sb2")
+
+    def test_write_counts(self):
+        expected_result = """Status       Count
+---------  -------
+Active           1
+Launching        1
+"""
+        stream = io.StringIO()
+        SandboxListView(self.table).write_counts(stream, SandboxTable.STATUS)
+        self.assertEqual(stream.getvalue(), expected_result)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+from colony.models.sandbox_table import SandboxTable
+
+
+def sandbox_json(sandbox_id, blueprint, status, owner="john@example.com"):
+    return {
+        "id": sandbox_id,
+        "name": f"{blueprint}-{sandbox_id}",
+        "blueprint_name": blueprint,
+        "sandbox_status": status,
+        "owner": {"email": owner},
+    }
+
+
+class TestSandboxTable(unittest.TestCase):
+    def setUp(self) -> None:
+        self.table = SandboxTable.from_json(
+            [
+                sandbox_json("sb1", "bp-b", "Active"),
+                sandbox_json("sb2", "bp-a", "Ended", "jane@example.com"),
+                sandbox_json("sb3", "bp-a", "Launching"),
+                sandbox_json("sb4", "bp-c", "Active", "jane@example.com"),
+            ]
+        )
+
+    def test_from_json_keeps_rows(self):
+        self.assertEqual(len(self.table), 4)
+        self.assertEqual(self.table.column(SandboxTable.ID), ["sb1", "sb2", "sb3", "sb4"])
+        self.assertEqual(self.table.column(SandboxTable.OWNER)[1], "jane@example.com")
+
+    def test_from_json_missing_keys(self):
+        with self.assertRaises(NotImplementedError):
+            SandboxTable.from_json([{"id": "sb1"}])
+
+    def test_filter(self):
+        result = self.table.filter(SandboxTable.STATUS, ["Active"])
+        self.assertEqual(result.column(SandboxTable.ID), ["sb1", "sb4"])
+        # original table is not affected
+        self.assertEqual(len(self.table), 4)
+
+    def test_filter_exclude(self):
+        result = self.table.filter(SandboxTable.STATUS, ["Ended"], exclude=True)
+        self.assertEqual(result.column(SandboxTable.ID), ["sb1", "sb3", "sb4"])
+
+    def test_where_combines_conditions(self):
+        result = self.table.where({"status": {"Active", "Ended"}, "owner": {"jane@example.com"}})
+        self.assertEqual(result.column(SandboxTable.ID), ["sb2", "sb4"])
+
+    def test_sort_categorical(self):
+        result = self.table.sort(SandboxTable.BLUEPRINT)
+        self.assertEqual(result.column(SandboxTable.BLUEPRINT), ["bp-a", "bp-a", "bp-b", "bp-c"])
+
+    def test_sort_descending(self):
+        result = self.table.sort(SandboxTable.ID, descending=True)
+        self.assertEqual(result.column(SandboxTable.ID), ["sb4", "sb3", "sb2", "sb1"])
+
+    def test_count_by(self):
+        counts = self.table.filter(SandboxTable.STATUS, ["Ended"], exclude=True).count_by(SandboxTable.STATUS)
+        self.assertEqual(dict(counts), {"Active": 2, "Launching": 1})
+
+    def test_group_by(self):
+        groups = self.table.group_by(SandboxTable.OWNER)
+        self.assertEqual(list(groups), ["john@example.com", "jane@example.com"])
+        self.assertEqual(groups["jane@example.com"].column(SandboxTable.ID), ["sb2", "sb4"])
+
+    def test_unknown_column(self):
+        with self.assertRaises(ValueError):
+            self.table.sort("unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import io
+import unittest
+
+from colony.services.watcher import ADDED, CHANGED, SandboxChange
+from colony.view.sandbox_watch_view import LiveSandboxWatchView, SandboxEventLogView, change_records
+
+
+def row(sandbox_id, status, progress=""):
+    return {"id": sandbox_id, "name": "name", "blueprint": "bp", "status": status, "progress": progress}
+
+
+class TestSandboxWatchViews(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stream = io.StringIO()
+        self.changes = [
+            [SandboxChange(ADDED, "sb1", row("sb1", "Launching"), None)],
+            [SandboxChange(CHANGED, "sb1", row("sb1", "Active"), row("sb1", "Launching"))],
+        ]
+
+    def test_change_records(self):
+        records = list(change_records(self.changes))
+        self.assertEqual([r["event"] for r in records], ["added", "changed"])
+        self.assertEqual(records[1]["previous_status"], "Launching")
+
+    def test_event_log(self):
+        SandboxEventLogView(self.stream).follow(self.changes)
+        lines = self.stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertTrue(lines[1].endswith("changed  sb1  name  Launching -> Active"))
+
+    def test_live_view_redraws_changed_row_only(self):
+        LiveSandboxWatchView(self.stream).follow(self.changes)
+        output = self.stream.getvalue()
+        header, separator, first_row, redraw = output.split("\n", 3)
+
+        self.assertTrue(first_row.startswith("sb1"))
+        # cursor goes one line up, the row is rewritten and the cursor returns to the bottom
+        self.assertTrue(redraw.startswith("\x1b[1A\r\x1b[2Ksb1"))
+        self.assertIn("Active", redraw)
+        self.assertNotIn("Sandbox ID", redraw)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -12,7 +12,7 @@ class MainShellTest(unittest.TestCase):
     def setUp(self) -> None:
         self.main_doc = shell.__doc__
         self.base_usage = """Usage: colony [--space=<space>] [--token=<token>] [--account=<account>] [--profile=<profile>] [--help] [--debug]
-              <command> [<args>...]"""
+              [--output=<format>] [--timings] [--profiler=<type>] <command> [<args>...]"""
 
     def test_show_base_usage_line(self):
         with self.assertRaises(DocoptExit) as ctx:
@@ -38,6 +38,24 @@ class MainShellTest(unittest.TestCase):
         input_parser = GlobalInputParser(args)
         self.assertFalse(shell.BootstrapHelper.is_help_message_requested(input_parser))
 
+    def test_help_not_needed_for_commands_without_args(self):
+        for command in ("shell", "batch"):
+            args = docopt(doc=self.main_doc, options_first=True, argv=[command])
+            input_parser = GlobalInputParser(args)
+            self.assertFalse(shell.BootstrapHelper.is_help_message_requested(input_parser))
+
+    @patch.dict("os.environ", {}, clear=True)
+    def test_can_use_agent(self):
+        def parse(argv):
+            return GlobalInputParser(docopt(doc=self.main_doc, options_first=True, argv=argv))
+
+        self.assertTrue(BootstrapHelper.can_use_agent(parse(["sb", "list"])))
+        self.assertFalse(BootstrapHelper.can_use_agent(parse(["configure", "set"])))
+        self.assertFalse(BootstrapHelper.can_use_agent(parse(["sb", "watch"])))
+        self.assertFalse(BootstrapHelper.can_use_agent(parse(["sandbox", "start", "demo", "--wait_active"])))
+        self.assertTrue(BootstrapHelper.can_use_agent(parse(["sb", "status", "abc"])))
+        self.assertFalse(BootstrapHelper.can_use_agent(parse(["--timings", "sb", "list"])))
+
     @patch("colony.shell.BootstrapHelper.should_get_connection_params")
     def test_get_connection_params_no_need_for_connection(self, should_get_connection_params_mock):
         # arrange
@@ -0,0 +1,101 @@
+import threading
+import time
+import unittest
+from unittest.mock import Mock
+
+from colony.sandboxes import SandboxesManager
+from colony.services.singleflight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_are_collapsed(self):
+        # arrange
+        group = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(timeout=5)
+            return {"status": "Active"}
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(group.do("key", fetch))) for _ in range(5)]
+
+        # act
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        # assert
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [{"status": "Active"}] * 5)
+        self.assertEqual(len({id(result) for result in results}), 5)
+
+    def test_result_is_not_kept_without_ttl(self):
+        group = SingleFlight()
+        func = Mock(return_value=1)
+
+        group.do("key", func)
+        group.do("key", func)
+
+        self.assertEqual(func.call_count, 2)
+
+    def test_result_is_kept_for_ttl(self):
+        group = SingleFlight(ttl=60)
+        func = Mock(return_value=1)
+
+        group.do("key", func)
+        group.do("key", func)
+        group.do("other", func)
+        self.assertEqual(func.call_count, 2)
+
+        group.forget()
+        group.do("key", func)
+        self.assertEqual(func.call_count, 3)
+
+    def test_ttl_of_call(self):
+        group = SingleFlight()
+        func = Mock(side_effect=[1, 2, 3])
+
+        self.assertEqual(group.do("key", func, ttl=60), 1)
+        self.assertEqual(group.do("key", func, ttl=60), 1)
+        self.assertEqual(group.do("key", func), 2)
+
+    def test_error_is_raised_to_waiters_and_not_kept(self):
+        group = SingleFlight(ttl=60)
+        func = Mock(side_effect=[ValueError("failed"), 1])
+
+        with self.assertRaises(ValueError):
+            group.do("key", func)
+        self.assertEqual(group.do("key", func), 1)
+
+    def test_manager_gets_are_keyed_by_url_and_token(self):
+        # arrange
+        client = Mock(base_url="https://cloudshellcolony.com/api/", space="dev", token="token")
+        client.request.return_value.json.return_value = {"id": "abc", "name": "demo", "blueprint_name": "web"}
+        other_client = Mock(base_url="https://cloudshellcolony.com/api/", space="dev", token="other")
+        other_client.request.return_value.json.return_value = {"id": "abc", "name": "demo", "blueprint_name": "web"}
+        SandboxesManager.singleflight = SingleFlight()
+
+        # act
+        try:
+            SandboxesManager(client, response_ttl=60).get("abc")
+            SandboxesManager(client, response_ttl=60).get("abc")
+            SandboxesManager(client, response_ttl=60).get("xyz")
+            SandboxesManager(other_client, response_ttl=60).get("abc")
+            # managers without the ttl never get a recent response
+            SandboxesManager(other_client).get("abc")
+        finally:
+            del SandboxesManager.singleflight
+
+        # assert
+        self.assertEqual(client.request.call_count, 2)
+        self.assertEqual(other_client.request.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import io
+import json
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from colony.services.timings import GIT, HTTP, PHASE, Timings
+from colony.utils import BlueprintRepo
+from tests.helpers.repo_utils import create_blueprint_repo
+
+
+class TestTimings(unittest.TestCase):
+    def setUp(self):
+        self.timings = Timings()
+        self.timings.enable()
+
+    def test_disabled(self):
+        timings = Timings()
+
+        with timings.span("phase") as span:
+            self.assertIsNone(span)
+
+        self.assertEqual(timings.roots, [])
+
+    def test_nested_spans(self):
+        with self.timings.span("command"):
+            with self.timings.span("git push"):
+                pass
+            with self.timings.span("http request", method="GET") as span:
+                span.attributes["status"] = 200
+
+        records = self.timings.to_records()
+
+        self.assertEqual([r["name"] for r in records], ["command"])
+        children = records[0]["children"]
+        self.assertEqual([c["name"] for c in children], ["git push", "http request"])
+        self.assertEqual(children[1]["attributes"], {"method": "GET", "status": 200})
+
+    def test_failed_span(self):
+        with self.assertRaises(ValueError):
+            with self.timings.span("phase"):
+                raise ValueError()
+
+        self.assertEqual(self.timings.roots[0].attributes, {"error": "ValueError"})
+
+    def test_span_of_worker_thread(self):
+        def work():
+            with self.timings.span("validate"):
+                pass
+
+        with self.timings.span("command"):
+            worker = threading.Thread(target=work)
+            worker.start()
+            worker.join()
+
+        self.assertEqual([c.name for c in self.timings.roots[0].children], ["validate"])
+
+    def test_write_summary_groups_siblings(self):
+        with self.timings.span("wait for sandbox"):
+            for _ in range(3):
+                with self.timings.span("sleep"):
+                    pass
+        stream = io.StringIO()
+
+        self.timings.write_summary(stream)
+
+        lines = stream.getvalue().splitlines()
+        self.assertEqual(lines[0], "Timings:")
+        self.assertTrue(lines[1].strip().startswith("wait for sandbox"))
+        self.assertTrue(lines[2].strip().startswith("sleep (x3)"))
+        self.assertEqual(len(lines), 3)
+
+    def test_write_json(self):
+        with self.timings.span("command"):
+            pass
+        stream = io.StringIO()
+
+        self.timings.write_json(stream, {"requests": {}})
+
+        self.assertEqual(json.loads(stream.getvalue())["timings"][0]["name"], "command")
+        self.assertEqual(json.loads(stream.getvalue())["requests"], {})
+
+    def test_write_chrome_trace(self):
+        with self.timings.span("sb start"):
+            with self.timings.span("GET spaces/{space}/sandbox/{sandbox_id}", HTTP, status=200):
+                pass
+        stream = io.StringIO()
+
+        self.timings.write_chrome_trace(stream)
+
+        events = json.loads(stream.getvalue())["traceEvents"]
+        complete = [e for e in events if e["ph"] == "X"]
+        self.assertEqual([(e["name"], e["cat"]) for e in complete], [("sb start", PHASE), (complete[1]["name"], HTTP)])
+        self.assertEqual(complete[1]["args"], {"status": 200})
+        self.assertLessEqual(complete[0]["ts"], complete[1]["ts"])
+        self.assertGreaterEqual(complete[0]["dur"], complete[1]["dur"])
+
+    @patch("colony.utils.timings", new_callable=Timings)
+    def test_git_commands_are_traced(self, traced_timings):
+        traced_timings.enable()
+        with tempfile.TemporaryDirectory() as path:
+            create_blueprint_repo(path, {"blueprints/bp.yaml": "clouds: []"}).close()
+            repo = BlueprintRepo(path)
+            with patch("colony.utils.span", traced_timings.span):
+                repo.git.status("--short")
+            repo.close()
+
+        git_spans = [s for s in traced_timings.roots if s.category == GIT]
+        self.assertEqual([(s.name, s.attributes["command"]) for s in git_spans], [("git status", "status --short")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+import base64
+import json
+import os
+import stat
+import tempfile
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from colony.client import ColonyClient
+from colony.services.token_cache import TokenCache, get_token_expiry, is_token_expiring
+
+
+def make_token(expires_in: int, name: str = "user") -> str:
+    def encode(data: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+
+    return f"{encode({'alg': 'HS256'})}.{encode({'sub': name, 'exp': int(time.time()) + expires_in})}.signature"
+
+
+class TestTokenCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.tmp_dir.name, "colony", "tokens.json")
+        self.cache = TokenCache(self.cache_path)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_get_token_expiry(self):
+        token = make_token(3600)
+        self.assertAlmostEqual(get_token_expiry(token), time.time() + 3600, delta=5)
+        self.assertIsNone(get_token_expiry("opaque-token"))
+        self.assertFalse(is_token_expiring("opaque-token"))
+        self.assertTrue(is_token_expiring(make_token(60)))
+
+    def test_set_and_get(self):
+        token = make_token(3600)
+
+        self.cache.set("acc", "User@example.com", token)
+
+        self.assertEqual(TokenCache(self.cache_path).get("acc", "user@example.com"), token)
+        self.assertIsNone(self.cache.get("other", "user@example.com"))
+        self.assertEqual(stat.S_IMODE(os.stat(self.cache_path).st_mode), 0o600)
+        with open(self.cache_path) as cache_file:
+            self.assertNotIn("example.com", cache_file.read())
+
+    def test_expiring_token_is_not_returned(self):
+        self.cache.set("acc", "user@example.com", make_token(60))
+        self.assertIsNone(self.cache.get("acc", "user@example.com"))
+
+    def test_remove(self):
+        self.cache.set("acc", "user@example.com", make_token(3600))
+        self.cache.remove("acc", "user@example.com")
+        self.assertIsNone(self.cache.get("acc", "user@example.com"))
+
+
+class TestClientLogin(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = TokenCache(os.path.join(self.tmp_dir.name, "tokens.json"))
+        self.session = Mock()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def make_client(self) -> ColonyClient:
+        return ColonyClient(
+            account="acc", email="user@example.com", password="pass", session=self.session, token_cache=self.cache
+        )
+
+    def get_sent_tokens(self) -> list:
+        return [call[1]["headers"]["Authorization"][len("Bearer ") :] for call in self.session.request.call_args_list]
+
+    @patch.object(ColonyClient, "login")
+    def test_cached_token_is_used(self, login_mock):
+        login_mock.return_value = make_token(3600)
+        self.session.request.return_value = Mock(status_code=200, content=b"{}")
+
+        self.make_client()
+        client = self.make_client()
+        client.request("spaces")
+
+        login_mock.assert_called_once()
+        self.assertEqual(self.get_sent_tokens(), [login_mock.return_value])
+
+    @patch.object(ColonyClient, "login")
+    def test_expiring_token_is_refreshed_before_request(self, login_mock):
+        # arrange
+        expiring_token, new_token = make_token(60), make_token(3600)
+        login_mock.side_effect = [expiring_token, new_token]
+        self.session.request.return_value = Mock(status_code=200, content=b"{}")
+        client = self.make_client()
+
+        # act
+        client.request("spaces")
+
+        # assert
+        self.assertEqual(login_mock.call_count, 2)
+        self.assertEqual(self.get_sent_tokens(), [new_token])
+        self.assertEqual(self.cache.get("acc", "user@example.com"), new_token)
+
+    @patch.object(ColonyClient, "login")
+    def test_refused_request_is_sent_again_after_login(self, login_mock):
+        # arrange
+        revoked_token, new_token = make_token(3600, "revoked"), make_token(3600, "new")
+        login_mock.side_effect = [revoked_token, new_token]
+        self.session.request.side_effect = [
+            Mock(status_code=401, content=b"{}"),
+            Mock(status_code=200, content=b"{}"),
+        ]
+        client = self.make_client()
+
+        # act
+        client.request("spaces")
+
+        # assert
+        self.assertEqual(self.get_sent_tokens(), [revoked_token, new_token])
+        self.assertEqual(client.token, new_token)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,20 @@
+import os
+import tempfile
 import unittest
+from unittest.mock import patch
 
 from colony import utils
+from tests.helpers.repo_utils import create_blueprint_repo, write_repo_files
+
+BLUEPRINT_YAML = """
+clouds:
+  - AWS: eu-west-1
+applications:
+  - web-app:
+      instances: 1
+services:
+  - queue:
+"""
 
 
 class TestParseParamString(unittest.TestCase):
@@ -32,3 +46,79 @@ class TestParseParamString(unittest.TestCase):
         line = "key1:val1, key2:val2"
         with self.assertRaises(ValueError):
             self.parse_fun(line)
+
+
+class TestParseWhereConditions(unittest.TestCase):
+    def test_multiple_values(self):
+        line = "status=Active|Launching, owner=me"
+        expected = {"status": {"Active", "Launching"}, "owner": {"me"}}
+        self.assertDictEqual(utils.parse_where_conditions(line), expected)
+
+    def test_return_empty_dict(self):
+        self.assertDictEqual(utils.parse_where_conditions(None), {})
+
+
+class TestBlueprintReferences(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = self.temp_dir.name
+        create_blueprint_repo(
+            self.path,
+            {
+                "blueprints/bp.yaml": BLUEPRINT_YAML,
+                "applications/web-app/web-app.yaml": "kind: application",
+                "applications/web-app/scripts/init.sh": "echo",
+                "applications/other-app/other-app.yaml": "kind: application",
+                "services/queue/queue.yaml": "kind: service",
+            },
+        )
+        self.repo = utils.BlueprintRepo(self.path)
+
+    def tearDown(self):
+        self.repo.close()
+        self.temp_dir.cleanup()
+
+    def test_get_blueprint_references(self):
+        references = self.repo.get_blueprint_references("bp")
+        self.assertEqual(references, {"applications": ["web-app"], "services": ["queue"]})
+
+    def test_get_blueprint_referenced_files(self):
+        expected = [
+            os.path.join("applications", "web-app", "scripts", "init.sh"),
+            os.path.join("applications", "web-app", "web-app.yaml"),
+            os.path.join("blueprints", "bp.yaml"),
+            os.path.join("services", "queue", "queue.yaml"),
+        ]
+        self.assertEqual(self.repo.get_blueprint_referenced_files("bp"), expected)
+
+    def test_content_hash_changes_with_referenced_files_only(self):
+        content_hash = self.repo.get_blueprint_content_hash("bp")
+
+        write_repo_files(self.path, {"applications/other-app/other-app.yaml": "changed"})
+        self.assertEqual(self.repo.get_blueprint_content_hash("bp"), content_hash)
+
+        write_repo_files(self.path, {"applications/web-app/scripts/init.sh": "changed"})
+        self.assertNotEqual(self.repo.get_blueprint_content_hash("bp"), content_hash)
+
+    def test_open_reuses_repo_kept_open(self):
+        self.assertIsNot(utils.BlueprintRepo.open(self.path), utils.BlueprintRepo.open(self.path))
+
+        with patch.object(utils.BlueprintRepo, "_open_repos", {}):
+            repo = utils.BlueprintRepo.open(self.path)
+            write_repo_files(self.path, {"blueprints/new-bp.yaml": BLUEPRINT_YAML})
+
+            self.assertIs(utils.BlueprintRepo.open(self.path), repo)
+            self.assertIn("new-bp", repo.blueprints)
+
+    def test_get_changed_files(self):
+        base = self.repo.head.commit.hexsha
+        write_repo_files(self.path, {"services/queue/queue.yaml": "changed"})
+        self.repo.git.commit("-am", "Change queue")
+
+        write_repo_files(self.path, {"applications/web-app/scripts/init.sh": "changed", "new.txt": "new"})
+
+        self.assertEqual(self.repo.get_changed_files(), ["applications/web-app/scripts/init.sh", "new.txt"])
+        self.assertEqual(
+            self.repo.get_changed_files(base),
+            ["applications/web-app/scripts/init.sh", "new.txt", "services/queue/queue.yaml"],
+        )
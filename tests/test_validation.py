@@ -0,0 +1,59 @@
+import unittest
+from unittest.mock import Mock
+
+from colony.services.validation import ValidationResult, merge_results, validate_blueprint, validate_blueprints
+
+
+class TestValidation(unittest.TestCase):
+    def setUp(self) -> None:
+        self.manager = Mock()
+
+    def test_validation_result(self):
+        result = ValidationResult("bp", [{"name": "err", "message": "msg", "code": "X"}])
+        self.assertFalse(result.valid)
+        self.assertEqual(
+            result.to_record(),
+            {"blueprint": "bp", "valid": False, "errors": [{"name": "err", "message": "msg"}], "cached": False},
+        )
+        self.assertTrue(ValidationResult("bp").valid)
+
+    def test_validate_blueprint_request_failure(self):
+        self.manager.validate.side_effect = Exception("boom")
+
+        result = validate_blueprint(self.manager, "bp")
+
+        self.assertFalse(result.valid)
+        self.assertEqual(result.errors[0]["message"], "boom")
+
+    def test_validate_blueprints_keeps_order(self):
+        def validate(blueprint, branch, commit):
+            errors = [{"name": "err", "message": blueprint}] if blueprint == "bp2" else []
+            return Mock(errors=errors)
+
+        self.manager.validate.side_effect = validate
+
+        results = list(validate_blueprints(self.manager, ["bp1", "bp2", "bp3"], branch="temp", max_workers=2))
+
+        self.assertEqual([r.blueprint for r in results], ["bp1", "bp2", "bp3"])
+        self.assertEqual([r.valid for r in results], [True, False, True])
+        self.manager.validate.assert_any_call(blueprint="bp1", branch="temp", commit=None)
+
+    def test_validate_blueprint_updates_cache(self):
+        cache = Mock()
+        self.manager.validate.return_value = Mock(errors=[])
+
+        validate_blueprint(self.manager, "bp", cache=cache, cache_key="key")
+
+        cache.update.assert_called_once_with("key", "bp", True)
+
+    def test_merge_results(self):
+        validated = iter([ValidationResult("bp2")])
+        known = {"bp1": ValidationResult("bp1", cached=True), "bp3": ValidationResult("bp3", cached=True)}
+
+        results = list(merge_results(["bp1", "bp2", "bp3"], known, validated))
+
+        self.assertEqual([(r.blueprint, r.cached) for r in results], [("bp1", True), ("bp2", False), ("bp3", True)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from colony.services.validation_cache import ValidationCache
+
+
+class TestValidationCache(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_path = os.path.join(self.temp_dir.name, "cache", "validations.json")
+        self.cache = ValidationCache("space", self.cache_path)
+        self.key = self.cache.make_key("bp", "content-hash")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+
+    def test_key_depends_on_space_and_content(self):
+        self.assertNotEqual(self.key, ValidationCache("other", self.cache_path).make_key("bp", "content-hash"))
+        self.assertNotEqual(self.key, self.cache.make_key("bp", "other-hash"))
+
+    def test_valid_result_persisted(self):
+        self.cache.update(self.key, "bp", True)
+        self.cache.save()
+
+        self.assertTrue(ValidationCache("space", self.cache_path).is_valid(self.key))
+
+    def test_invalid_result_drops_entry(self):
+        self.cache.update(self.key, "bp", True)
+        self.cache.update(self.key, "bp", False)
+
+        self.assertFalse(self.cache.is_valid(self.key))
+
+    def test_entry_expires(self):
+        cache = ValidationCache("space", self.cache_path, ttl=10)
+        with patch("colony.services.validation_cache.time.time", return_value=1000):
+            cache.update(self.key, "bp", True)
+        with patch("colony.services.validation_cache.time.time", return_value=1011):
+            self.assertFalse(cache.is_valid(self.key))
+
+    def test_save_keeps_entries_of_other_instances(self):
+        other_cache = ValidationCache("other", self.cache_path)
+        other_key = other_cache.make_key("bp", "content-hash")
+        self.cache.update(self.key, "bp", True)
+        self.cache.save()
+        # entries saved by another instance after the file has been read must be kept
+        other_cache.update(other_key, "bp", True)
+        other_cache.save()
+
+        self.cache.update(self.key, "bp", False)
+        self.cache.save()
+
+        self.assertFalse(ValidationCache("space", self.cache_path).is_valid(self.key))
+        self.assertTrue(ValidationCache("other", self.cache_path).is_valid(other_key))
+
+    def test_corrupted_file_ignored(self):
+        os.makedirs(os.path.dirname(self.cache_path))
+        with open(self.cache_path, "w") as f:
+            f.write("not a json")
+
+        self.assertFalse(self.cache.is_valid(self.key))
+
+
+if __name__ == "__main__":
+    unittest.main()
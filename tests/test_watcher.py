@@ -0,0 +1,80 @@
+import unittest
+from unittest.mock import Mock, patch
+
+from colony.models.sandbox_table import SandboxTable
+from colony.services import cancellation
+from colony.services.watcher import ADDED, CHANGED, REMOVED, SandboxWatcher, diff_snapshots
+
+
+def row(sandbox_id, status, progress=""):
+    return {"id": sandbox_id, "name": sandbox_id, "blueprint": "bp", "status": status, "progress": progress}
+
+
+class TestDiffSnapshots(unittest.TestCase):
+    def test_first_snapshot_is_added(self):
+        changes = diff_snapshots({}, {"sb1": row("sb1", "Launching")})
+        self.assertEqual([(c.kind, c.sandbox_id) for c in changes], [(ADDED, "sb1")])
+
+    def test_only_tracked_columns_are_compared(self):
+        previous = {"sb1": row("sb1", "Launching"), "sb2": row("sb2", "Active")}
+        current = {"sb1": row("sb1", "Launching", "infrastructure 1/1"), "sb2": dict(row("sb2", "Active"), name="x")}
+
+        changes = diff_snapshots(previous, current)
+
+        self.assertEqual([(c.kind, c.sandbox_id) for c in changes], [(CHANGED, "sb1")])
+        self.assertEqual(changes[0].previous, previous["sb1"])
+
+    def test_removed(self):
+        changes = diff_snapshots({"sb1": row("sb1", "Active")}, {})
+        self.assertEqual([(c.kind, c.sandbox_id) for c in changes], [(REMOVED, "sb1")])
+
+
+class TestSandboxWatcher(unittest.TestCase):
+    def setUp(self) -> None:
+        self.manager = Mock()
+        self.watcher = SandboxWatcher(self.manager, interval=2)
+
+    def test_next_interval_backs_off_and_resets(self):
+        self.assertEqual(self.watcher.next_interval(2, changed=False), 3)
+        self.assertEqual(self.watcher.next_interval(50, changed=False), SandboxWatcher.MAX_INTERVAL)
+        self.assertEqual(self.watcher.next_interval(30, changed=True), 2)
+
+    def test_fetch_snapshot_skips_ended(self):
+        self.manager.list_table.return_value = SandboxTable.from_json(
+            [
+                {"id": "sb1", "name": "a", "blueprint_name": "bp", "sandbox_status": "Ended"},
+                {"id": "sb2", "name": "b", "blueprint_name": "bp", "sandbox_status": "Active"},
+            ]
+        )
+        self.assertEqual(list(self.watcher.fetch_snapshot()), ["sb2"])
+
+    @patch("colony.services.watcher.time.sleep")
+    def test_changes_polls_with_adaptive_interval(self, sleep):
+        self.watcher.fetch_snapshot = Mock(
+            side_effect=[{"sb1": row("sb1", "Launching")}, {"sb1": row("sb1", "Launching")}, Exception("down")]
+        )
+        changes = self.watcher.changes()
+
+        self.assertEqual(len(next(changes)), 1)
+        self.assertEqual(next(changes), [])
+        # failed poll is reported as no changes
+        self.assertEqual(next(changes), [])
+        self.assertEqual([c.args[0] for c in sleep.call_args_list], [2, 3])
+
+    @patch("colony.services.watcher.time.sleep")
+    def test_changes_stops_on_timeout(self, sleep):
+        self.watcher.timeout = 0.01
+        self.watcher.fetch_snapshot = Mock(return_value={})
+        self.assertEqual(list(self.watcher.changes()), [[]])
+
+    @patch("colony.services.watcher.time.sleep")
+    def test_changes_stops_when_cancelled(self, sleep):
+        self.watcher.fetch_snapshot = Mock(return_value={})
+        sleep.side_effect = lambda interval: cancellation.cancel()
+        self.addCleanup(cancellation.reset)
+
+        self.assertEqual(list(self.watcher.changes()), [[]])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import io
+import json
+import unittest
+
+from colony.view.writers import CsvWriter, JsonWriter, NdjsonWriter, TableWriter, get_writer
+
+
+class TestWriters(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stream = io.StringIO()
+        self.records = [{"id": "sb1", "status": "Active"}, {"id": "sb2", "status": "Ended"}]
+
+    def test_get_writer_default(self):
+        self.assertIsInstance(get_writer(), TableWriter)
+        self.assertFalse(get_writer().is_machine_readable)
+
+    def test_get_writer_unknown_format(self):
+        with self.assertRaises(ValueError):
+            get_writer("xml")
+
+    def test_json_records(self):
+        JsonWriter(self.stream).write_records(iter(self.records))
+        self.assertEqual(json.loads(self.stream.getvalue()), self.records)
+
+    def test_json_empty_records(self):
+        JsonWriter(self.stream).write_records([])
+        self.assertEqual(json.loads(self.stream.getvalue()), [])
+
+    def test_json_single_record(self):
+        JsonWriter(self.stream).write_record(self.records[0])
+        self.assertEqual(json.loads(self.stream.getvalue()), self.records[0])
+
+    def test_ndjson_records(self):
+        NdjsonWriter(self.stream).write_records(self.records)
+        lines = self.stream.getvalue().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], self.records)
+
+    def test_ndjson_writes_incrementally(self):
+        writer = NdjsonWriter(self.stream)
+
+        def records():
+            yield self.records[0]
+            # first record must be already written before the next one is produced
+            self.assertEqual(len(self.stream.getvalue().splitlines()), 1)
+            yield self.records[1]
+
+        writer.write_records(records())
+        self.assertEqual(len(self.stream.getvalue().splitlines()), 2)
+
+    def test_csv_records(self):
+        CsvWriter(self.stream).write_records([{"name": "bp", "errors": [{"name": "e"}]}])
+        self.assertEqual(self.stream.getvalue().splitlines(), ["name,errors", 'bp,"[{""name"": ""e""}]"'])
+
+    def test_table_records(self):
+        TableWriter(self.stream).write_records(self.records)
+        self.assertEqual(self.stream.getvalue().splitlines()[0].split(), ["id", "status"])
+
+
+if __name__ == "__main__":
+    unittest.main()